@@ -1,10 +1,11 @@
 from fastapi import HTTPException, Depends, status, Request
 from fastapi.security import OAuth2AuthorizationCodeBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
 import os
+from services.keyring import get_keyring
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
@@ -12,9 +13,7 @@ oauth2_scheme = OAuth2AuthorizationCodeBearer(
     tokenUrl="https://oauth2.googleapis.com/token"
 )
 
-# JWT settings
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")
-ALGORITHM = "HS256"
+# JWT settings (signing keys and algorithm live in services.keyring)
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 class TokenData(BaseModel):
@@ -29,7 +28,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = get_keyring().sign(to_encode)
     return encoded_jwt
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
@@ -39,7 +38,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = get_keyring().verify(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+OAuth callback persistence benchmark
+Compares the previous sequential find/create-or-update/insert flow with
+the concurrent upsert + refresh-token insert, against an in-memory
+MongoDB stand-in that adds a fixed round-trip latency to every call
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bson import ObjectId
+from db.repositories import UserRepository, RefreshTokenRepository
+from services.auth_service import AuthService
+
+
+class LatencyCollection:
+    """Minimal collection stand-in that sleeps `rtt` seconds per call and counts round trips"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.round_trips = 0
+        self.docs: List[Dict[str, Any]] = []
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+
+    def _match(self, query: Dict[str, Any]):
+        return next((d for d in self.docs if all(d.get(k) == v for k, v in query.items())), None)
+
+    async def find_one(self, query, *args, **kwargs):
+        await self._round_trip()
+        return self._match(query)
+
+    async def insert_one(self, doc):
+        await self._round_trip()
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(doc)
+        return type("InsertOneResult", (), {"inserted_id": doc["_id"]})()
+
+    async def find_one_and_update(self, query, update, upsert=False, **kwargs):
+        await self._round_trip()
+        doc = self._match(query)
+        if doc is None:
+            if not upsert:
+                return None
+            doc = {**query, **update.get("$setOnInsert", {})}
+            self.docs.append(doc)
+        doc.update(update.get("$set", {}))
+        return doc
+
+
+class LatencyDatabase:
+    def __init__(self, rtt: float):
+        self.users = LatencyCollection(rtt)
+        self.refresh_tokens = LatencyCollection(rtt)
+
+    @property
+    def round_trips(self) -> int:
+        return self.users.round_trips + self.refresh_tokens.round_trips
+
+
+async def sequential_login(service: AuthService, user_info: Dict[str, str]):
+    """The previous flow: find, then create or update, then insert the refresh token"""
+    user = await service.user_repo.find_by_email(user_info["email"])
+    if not user:
+        await service.user_repo.create(user_info["email"], user_info["name"], user_info["picture"])
+    else:
+        await service.user_repo.update(email=user_info["email"], name=user_info["name"], picture=user_info["picture"])
+    return await service.create_tokens(user_info["email"])
+
+
+async def concurrent_login(service: AuthService, user_info: Dict[str, str]):
+    """The current flow used by AuthService.handle_google_callback"""
+    _, tokens = await asyncio.gather(
+        service.user_repo.upsert(user_info["email"], user_info["name"], user_info["picture"]),
+        service.create_tokens(user_info["email"]),
+    )
+    return tokens
+
+
+async def measure(flow, logins: int, rtt: float):
+    db = LatencyDatabase(rtt)
+    service = AuthService(UserRepository(db), RefreshTokenRepository(db))
+    start = time.perf_counter()
+    for i in range(logins):
+        # Every user logs in twice: once as a new user, once as a returning one
+        user_info = {"email": f"user{i // 2}@example.com", "name": "User", "picture": ""}
+        await flow(service, user_info)
+    elapsed = time.perf_counter() - start
+    return elapsed / logins * 1000, db.round_trips / logins
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OAuth callback round-trip benchmark')
+    parser.add_argument('--logins', type=int, default=200, help='Logins per flow')
+    parser.add_argument('--rtt-ms', type=float, default=2.0, help='Simulated MongoDB round-trip time')
+    args = parser.parse_args()
+
+    rtt = args.rtt_ms / 1000
+    for name, flow in [("sequential (before)", sequential_login), ("upsert + gather (after)", concurrent_login)]:
+        latency, round_trips = asyncio.run(measure(flow, args.logins, rtt))
+        print(f"{name:26s} {latency:7.2f} ms/login  {round_trips:.1f} round trips/login")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Diagram autosave benchmark
+Applies a drag-sized JSON Patch to a large diagram and compares the update
+sent to MongoDB with re-uploading the whole graph
+"""
+
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bson import BSON
+from db.json_patch import apply_patch, parse_patch
+from db.repositories import DiagramRepository
+
+
+def build_diagram(node_count: int) -> dict:
+    """A class diagram shaped like src/mock/mockData.js"""
+    nodes = [
+        {
+            'id': f'class-{i}',
+            'type': 'classNode',
+            'position': {'x': i % 100 * 200, 'y': i // 100 * 150},
+            'data': {
+                'label': f'Class{i}',
+                'stereotype': '',
+                'attributes': [f'+field{j}: String' for j in range(5)],
+                'methods': [f'+method{j}(): void' for j in range(3)],
+            },
+        }
+        for i in range(node_count)
+    ]
+    edges = [
+        {'id': f'edge-{i}', 'source': f'class-{i}', 'target': f'class-{i + 1}', 'type': 'association'}
+        for i in range(node_count - 1)
+    ]
+    return {'name': 'Benchmark', 'type': 'class', 'nodes': nodes, 'edges': edges}
+
+
+def drag_patch(node_count: int, moved: int) -> list:
+    """Position updates for a selection of nodes dragged together"""
+    return [
+        {'op': 'replace', 'path': f'/nodes/{index}/position', 'value': {'x': random.randint(0, 9999), 'y': 5}}
+        for index in random.sample(range(node_count), moved)
+    ]
+
+
+def measure(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diagram autosave benchmark')
+    parser.add_argument('--nodes', type=int, default=5000, help='Nodes in the diagram')
+    parser.add_argument('--moved', type=int, default=20, help='Nodes moved per autosave')
+    parser.add_argument('--rounds', type=int, default=200, help='Autosaves to time')
+    args = parser.parse_args()
+
+    diagram = build_diagram(args.nodes)
+    patch = drag_patch(args.nodes, args.moved)
+    operations = parse_patch(patch)
+
+    copy_on_write = measure(lambda: apply_patch(diagram, operations), args.rounds)
+    deep_copy = measure(lambda: apply_patch(copy.deepcopy(diagram), operations), max(1, args.rounds // 20))
+
+    patched = apply_patch(diagram, operations)
+    update = DiagramRepository._build_update(diagram, patched, operations)
+    full_bytes = len(BSON.encode({'$set': diagram}))
+    update_bytes = len(BSON.encode(update))
+
+    print(f"{args.nodes} nodes, {args.moved} moved per autosave")
+    print(f"patch request body:     {len(json.dumps(patch)):12,} bytes")
+    print(f"full graph upload:      {len(json.dumps(diagram)):12,} bytes")
+    print(f"apply (copy-on-write):  {copy_on_write * 1e3:12.3f} ms")
+    print(f"apply (deepcopy first): {deep_copy * 1e3:12.3f} ms")
+    print(f"MongoDB update:         {update_bytes:12,} bytes (whole document: {full_bytes:,})")
+
+
+if __name__ == '__main__':
+    main()
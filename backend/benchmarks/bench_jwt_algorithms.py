@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+JWT algorithm benchmark
+Compares sign/verify throughput of HS256 and ES256 through the key ring,
+against HS256 with the secret re-parsed on every call
+"""
+
+import sys
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from jose import jwt
+from services.keyring import KeyRing, DEFAULT_KID
+
+
+def rate(fn, items: list) -> float:
+    """Call fn on every item and return calls per second"""
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HS256 vs ES256 sign/verify benchmark')
+    parser.add_argument('--iterations', type=int, default=5000, help='Operations per run')
+    args = parser.parse_args()
+
+    expires = datetime.now(timezone.utc) + timedelta(minutes=30)
+    claims = [{"sub": f"user{i}@example.com", "exp": expires} for i in range(args.iterations)]
+
+    hs256 = KeyRing("HS256")
+    hs256.add_key(DEFAULT_KID, "your-secret-key")
+    es256 = KeyRing("ES256")
+    es256.generate_key()
+
+    tokens = [jwt.encode(c, "your-secret-key", algorithm="HS256") for c in claims]
+    print(f"{'HS256 (secret per call)':<26} sign {rate(lambda c: jwt.encode(c, 'your-secret-key', algorithm='HS256'), claims):>9,.0f}/s"
+          f"  verify {rate(lambda t: jwt.decode(t, 'your-secret-key', algorithms=['HS256']), tokens):>9,.0f}/s")
+
+    for name, keyring in (("HS256 (key ring)", hs256), ("ES256 (key ring)", es256)):
+        tokens = [keyring.sign(c) for c in claims]
+        print(f"{name:<26} sign {rate(keyring.sign, claims):>9,.0f}/s  verify {rate(keyring.verify, tokens):>9,.0f}/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+LoggingMiddleware benchmark
+Compares requests per second through the previous BaseHTTPMiddleware
+implementation and the pure-ASGI LoggingMiddleware
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from middleware.logging_middleware import LoggingMiddleware
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware-based implementation, kept for comparison"""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID", "N/A")
+        logging.getLogger(__name__).info(
+            f"[{request_id}] {request.method} {request.url.path} - "
+            f"Client: {request.client.host if request.client else 'unknown'}"
+        )
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logging.getLogger(__name__).info(
+            f"[{request_id}] {request.method} {request.url.path} - "
+            f"Status: {response.status_code} - Duration: {process_time:.3f}s"
+        )
+        response.headers["X-Process-Time"] = str(process_time)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+def build_app(middleware=None, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> float:
+    """Send `requests` GETs with bounded concurrency and return requests per second"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                response = await client.get("/ping")
+                response.raise_for_status()
+
+        await asyncio.gather(*(one() for _ in range(50)))
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+async def run(args) -> None:
+    variants = [
+        ("no middleware", build_app()),
+        ("BaseHTTPMiddleware (before)", build_app(BaseHTTPLoggingMiddleware)),
+        ("pure ASGI (after)", build_app(LoggingMiddleware)),
+        (f"pure ASGI, sample 1/{args.sample_rate}", build_app(LoggingMiddleware, sample_rate=args.sample_rate)),
+    ]
+    for name, app in variants:
+        rps = await measure(app, args.requests, args.concurrency)
+        print(f"{name:32s} {rps:10,.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LoggingMiddleware before/after benchmark')
+    parser.add_argument('--requests', type=int, default=5000, help='Requests per variant')
+    parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight')
+    parser.add_argument('--sample-rate', type=int, default=100, help='Sample rate for the sampled variant')
+    parser.add_argument('--log-level', default='INFO', help='Log level (WARNING shows the cost with INFO disabled)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level, stream=open(os.devnull, 'w'))
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
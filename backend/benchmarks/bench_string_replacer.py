@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+StringReplacer benchmark
+Rewrites a synthetic tree with the previous six-pass str.replace loop and
+with the single-pass replacer (atomic writes), serially and across a worker pool.
+The six-pass loop is also timed with atomic writes, separating the cost of the
+temp file and rename from the cost of the replacement itself
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.string_replacer import StringReplacer
+
+LINE = "const value = computeSomething(input, options); // ordinary source line\n"
+MENTIONS = "import ZenUML from 'zenuml'; // Zen UML, zen-uml, zen_uml, ZENUML\n"
+
+
+def build_tree(root: Path, files: int, lines: int, mention_every: int) -> None:
+    """Write `files` source files, every `mention_every`th one mentioning the old identifiers"""
+    per_dir = 500
+    for i in range(files):
+        directory = root / f"pkg{i // per_dir}"
+        if i % per_dir == 0:
+            directory.mkdir(parents=True)
+        body = LINE * lines
+        if i % mention_every == 0:
+            body = MENTIONS + body + MENTIONS
+        (directory / f"module{i}.js").write_text(body, encoding="utf-8")
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write through a temp file and os.replace, as StringReplacer does"""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def legacy_replace_all(root: Path, write: bool = True, atomic: bool = False) -> int:
+    """The previous implementation: decode every file and call str.replace once per identifier"""
+    changed = 0
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in StringReplacer.EXCLUDE_DIRS]
+        for name in files:
+            path = Path(directory) / name
+            try:
+                content = path.read_text(encoding="utf-8")
+            except (UnicodeDecodeError, PermissionError):
+                continue
+            original = content
+            for old, new in StringReplacer.REPLACEMENTS.items():
+                content = content.replace(old, new)
+            if content != original:
+                if atomic:
+                    atomic_write_text(path, content)
+                elif write:
+                    path.write_text(content, encoding="utf-8")
+                changed += 1
+    return changed
+
+
+def timed(label: str, template: Path, run) -> None:
+    """Copy the template tree, run one rewrite over it and print the timing"""
+    with tempfile.TemporaryDirectory() as scratch:
+        root = Path(scratch) / "tree"
+        shutil.copytree(template, root)
+        start = time.perf_counter()
+        changed = run(root)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.2f}s  {changed:,} files changed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='StringReplacer six-pass vs single-pass benchmark')
+    parser.add_argument('--files', type=int, default=50000, help='Files in the synthetic tree')
+    parser.add_argument('--lines', type=int, default=40, help='Lines per file')
+    parser.add_argument('--mention-every', type=int, default=10, help='One in N files mentions old identifiers')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes for the pooled run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        template = Path(scratch) / "template"
+        build_tree(template, args.files, args.lines, args.mention_every)
+        print(f"tree: {args.files:,} files x {args.lines} lines\n")
+
+        timed("six-pass, dry run", template, lambda root: legacy_replace_all(root, write=False))
+        timed("single-pass, dry run", template,
+              lambda root: len(StringReplacer(str(root), workers=1).replace_all()))
+        timed("six-pass, in-place writes", template, legacy_replace_all)
+        timed("six-pass, atomic writes", template, lambda root: legacy_replace_all(root, atomic=True))
+        timed("single-pass, 1 worker", template,
+              lambda root: len(StringReplacer(str(root), dry_run=False, workers=1).replace_all()))
+        timed(f"single-pass, {args.workers} workers", template,
+              lambda root: len(StringReplacer(str(root), dry_run=False, workers=args.workers).replace_all()))
+
+
+if __name__ == '__main__':
+    main()
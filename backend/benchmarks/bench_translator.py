@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Translator lookup benchmark
+Compares the previous per-call nested-dict walk with the compiled
+catalog over every key in locales/*/errors.json, and the cost of loading
+every locale's JSON against opening the compiled catalog
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from i18n.catalog import MessageCatalog, compile_catalog, load_locale_sources
+from i18n.translator import Translator
+
+LOCALES_DIR = Path(__file__).parent.parent / 'locales'
+
+
+def _get_nested_value(obj: Dict, key: str) -> Optional[str]:
+    """The previous lookup: split the dotted key and walk nested dicts"""
+    current = obj
+    for k in key.split('.'):
+        if isinstance(current, dict) and k in current:
+            current = current[k]
+        else:
+            return None
+    return current if isinstance(current, str) else None
+
+
+def legacy_get(translations: Dict, key: str, locale: str, **kwargs) -> str:
+    """The previous Translator.get fallback chain"""
+    for fallback_locale in [locale, 'en']:
+        if fallback_locale in translations:
+            text = _get_nested_value(translations[fallback_locale], key)
+            if text:
+                return text.format(**kwargs) if kwargs else text
+    return key
+
+
+def collect_lookups() -> list:
+    """Every (locale, dotted key) pair found in the errors catalogs"""
+    lookups = []
+    for path in sorted(LOCALES_DIR.glob('*/errors.json')):
+        with open(path, encoding='utf-8') as f:
+            errors = json.load(f)['errors']
+        lookups.extend((path.parent.name, f"errors.{code}") for code in errors)
+    return lookups
+
+
+def measure(fn, lookups: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for locale, key in lookups:
+            fn(key, locale)
+    return rounds * len(lookups) / (time.perf_counter() - start)
+
+
+def time_load(fn, loads: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loads):
+        fn()
+    return (time.perf_counter() - start) / loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Translator lookup benchmark')
+    parser.add_argument('--rounds', type=int, default=2000, help='Passes over all keys')
+    parser.add_argument('--loads', type=int, default=200, help='Catalog loads to time')
+    args = parser.parse_args()
+
+    translator = Translator()
+    lookups = collect_lookups()
+    translations = load_locale_sources(LOCALES_DIR)
+
+    legacy = measure(lambda key, locale: legacy_get(translations, key, locale), lookups, args.rounds)
+    current = measure(translator.get, lookups, args.rounds)
+    error_messages = measure(
+        lambda key, locale: translator.get_error_message(key[len('errors.'):], locale), lookups, args.rounds
+    )
+
+    print(f"{len(lookups)} keys across {len({locale for locale, _ in lookups})} locales")
+    print(f"nested walk (before):   {legacy:12,.0f} lookups/s")
+    print(f"flat catalog (after):   {current:12,.0f} lookups/s")
+    print(f"get_error_message:      {error_messages:12,.0f} lookups/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_path = Path(tmp) / 'messages.catalog'
+        compile_catalog(LOCALES_DIR, catalog_path, Translator.FALLBACK_LOCALE)
+        json_load = time_load(lambda: load_locale_sources(LOCALES_DIR), args.loads)
+        catalog_open = time_load(lambda: MessageCatalog.open(catalog_path), args.loads)
+
+    print(f"\nload all locale JSON:   {json_load * 1e6:12,.1f} us")
+    print(f"open compiled catalog:  {catalog_open * 1e6:12,.1f} us")
+
+
+if __name__ == '__main__':
+    main()
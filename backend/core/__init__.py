@@ -1,6 +1,16 @@
 """Core package"""
+from importlib import import_module
 from .config import get_google_auth_url, get_database_url, get_database_name, get_cors_origins
-from .dependencies import get_db, get_auth_service, get_current_user
+
+# db/ and services/ read their settings from core.config, and core.dependencies
+# imports them, so it is only loaded when one of its names is first used
+_LAZY_EXPORTS = {
+    "get_db": ".dependencies",
+    "get_auth_service": ".dependencies",
+    "get_current_user": ".dependencies",
+    "get_http_client": ".dependencies",
+    "create_http_client": ".http",
+}
 
 __all__ = [
     "get_google_auth_url",
@@ -10,4 +20,12 @@ __all__ = [
     "get_db",
     "get_auth_service",
     "get_current_user",
+    "get_http_client",
+    "create_http_client",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
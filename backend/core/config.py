@@ -2,6 +2,7 @@
 Configuration and utility functions
 """
 import os
+from typing import Optional
 from urllib.parse import urlencode
 
 
@@ -32,3 +33,128 @@ def get_cors_origins() -> list:
     """Get CORS allowed origins"""
     origins = os.environ.get('CORS_ORIGINS', '*')
     return origins.split(',') if origins != '*' else ['*']
+
+
+def get_token_purge_interval() -> float:
+    """Get seconds between purges of revoked refresh tokens"""
+    return float(os.environ.get('TOKEN_PURGE_INTERVAL_SECONDS', '300'))
+
+
+def is_status_batching_enabled() -> bool:
+    """Check whether single status check inserts are coalesced into batches"""
+    return os.environ.get('STATUS_BATCH_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+
+def get_status_batch_max_size() -> int:
+    """Get the number of queued status checks that forces a flush"""
+    return int(os.environ.get('STATUS_BATCH_MAX_SIZE', '500'))
+
+
+def get_status_batch_max_delay_ms() -> float:
+    """Get the longest a queued status check waits before a flush"""
+    return float(os.environ.get('STATUS_BATCH_MAX_DELAY_MS', '10'))
+
+
+def get_log_sample_rate() -> int:
+    """Get N for logging 1 in N successful requests"""
+    return int(os.environ.get('LOG_SAMPLE_RATE', '1'))
+
+
+def get_health_probe_ttl() -> float:
+    """Get how long a MongoDB readiness ping result is reused, in seconds"""
+    return float(os.environ.get('HEALTH_PROBE_TTL_SECONDS', '5'))
+
+
+def get_health_ping_timeout() -> float:
+    """Get the timeout for a MongoDB readiness ping, in seconds"""
+    return float(os.environ.get('HEALTH_PING_TIMEOUT_SECONDS', '2'))
+
+
+def get_user_cache_max_size() -> int:
+    """Get the number of user profiles kept in the in-process cache"""
+    return int(os.environ.get('USER_CACHE_MAX_SIZE', '10000'))
+
+
+def get_user_cache_ttl() -> float:
+    """Get how long a cached user profile is reused, in seconds"""
+    return float(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+
+
+def get_token_cache_max_size() -> int:
+    """Get the number of verified access tokens kept in the in-process cache"""
+    return int(os.environ.get('TOKEN_CACHE_MAX_SIZE', '50000'))
+
+
+def get_google_token_url() -> str:
+    """Get the Google OAuth token endpoint"""
+    return os.environ.get('GOOGLE_TOKEN_URL', 'https://oauth2.googleapis.com/token')
+
+
+def get_google_userinfo_url() -> str:
+    """Get the Google OAuth userinfo endpoint"""
+    return os.environ.get('GOOGLE_USERINFO_URL', 'https://www.googleapis.com/oauth2/v3/userinfo')
+
+
+def get_http_max_connections() -> int:
+    """Get the outbound HTTP connection pool size"""
+    return int(os.environ.get('HTTP_MAX_CONNECTIONS', '100'))
+
+
+def get_http_max_keepalive_connections() -> int:
+    """Get the number of idle outbound HTTP connections kept open"""
+    return int(os.environ.get('HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+
+
+def get_http_keepalive_expiry() -> float:
+    """Get how long an idle outbound HTTP connection is kept, in seconds"""
+    return float(os.environ.get('HTTP_KEEPALIVE_EXPIRY_SECONDS', '60'))
+
+
+def get_http_timeout() -> float:
+    """Get the outbound HTTP read, write and pool timeout, in seconds"""
+    return float(os.environ.get('HTTP_TIMEOUT_SECONDS', '10'))
+
+
+def get_http_connect_timeout() -> float:
+    """Get the outbound HTTP connect timeout, in seconds"""
+    return float(os.environ.get('HTTP_CONNECT_TIMEOUT_SECONDS', '5'))
+
+
+def get_jwt_algorithm() -> str:
+    """Get the JWT signing algorithm (HS256 or ES256)"""
+    return os.environ.get('JWT_ALGORITHM', 'HS256')
+
+
+def get_jwt_secret_key() -> str:
+    """Get the HMAC secret for HS256 tokens"""
+    return os.environ.get('JWT_SECRET_KEY', 'your-secret-key')
+
+
+def get_jwt_keys_dir() -> Optional[str]:
+    """Get the directory of <kid>.pem private keys for asymmetric algorithms"""
+    return os.environ.get('JWT_KEYS_DIR')
+
+
+def get_jwt_active_kid() -> Optional[str]:
+    """Get the kid of the key new tokens are signed with"""
+    return os.environ.get('JWT_ACTIVE_KID')
+
+
+def is_ephemeral_jwt_key_allowed() -> bool:
+    """Check whether an asymmetric key ring may fall back to a per-process generated key (development only)"""
+    return os.environ.get('JWT_ALLOW_EPHEMERAL_KEYS', 'false').lower() in ('1', 'true', 'yes')
+
+
+def get_validation_log_limit() -> int:
+    """Get the number of validation failures logged per client and path each window"""
+    return int(os.environ.get('VALIDATION_LOG_LIMIT', '5'))
+
+
+def get_validation_log_window() -> float:
+    """Get the validation failure log window, in seconds"""
+    return float(os.environ.get('VALIDATION_LOG_WINDOW_SECONDS', '60'))
+
+
+def get_i18n_catalog_path() -> Optional[str]:
+    """Get the compiled translation catalog path, if it is not the one in locales/"""
+    return os.environ.get('I18N_CATALOG_PATH')
@@ -1,10 +1,14 @@
 """
 Dependency injection for routes
 """
+import httpx
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from db.repositories import UserRepository, RefreshTokenRepository, StatusCheckRepository
+from db.repositories import UserRepository, RefreshTokenRepository, StatusCheckRepository, DiagramRepository
+from db.cache import get_user_profile_cache
+from db.batching import InsertBatcher
+from db.health import ReadinessProbe
 from services.auth_service import AuthService
 from models.schemas import TokenData, TokenType
 import logging
@@ -14,6 +18,15 @@ logger = logging.getLogger(__name__)
 # Global database instance (will be set in main app)
 _db_instance: AsyncIOMotorDatabase = None
 
+# Optional status check insert batcher (set in main app when enabled)
+_status_batcher: InsertBatcher = None
+
+# Shared outbound HTTP client (will be set in main app)
+_http_client: httpx.AsyncClient = None
+
+# MongoDB readiness probe (will be set in main app)
+_readiness_probe: ReadinessProbe = None
+
 security = HTTPBearer()
 
 
@@ -23,6 +36,24 @@ def set_db(db: AsyncIOMotorDatabase):
     _db_instance = db
 
 
+def set_status_batcher(batcher: InsertBatcher):
+    """Set the global status check insert batcher"""
+    global _status_batcher
+    _status_batcher = batcher
+
+
+def set_http_client(client: httpx.AsyncClient):
+    """Set the shared outbound HTTP client"""
+    global _http_client
+    _http_client = client
+
+
+def set_readiness_probe(probe: ReadinessProbe):
+    """Set the global MongoDB readiness probe"""
+    global _readiness_probe
+    _readiness_probe = probe
+
+
 def get_db() -> AsyncIOMotorDatabase:
     """Get database instance"""
     if _db_instance is None:
@@ -30,6 +61,20 @@ def get_db() -> AsyncIOMotorDatabase:
     return _db_instance
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared outbound HTTP client"""
+    if _http_client is None:
+        raise RuntimeError("HTTP client not initialized")
+    return _http_client
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    """Get the MongoDB readiness probe"""
+    if _readiness_probe is None:
+        raise RuntimeError("Readiness probe not initialized")
+    return _readiness_probe
+
+
 def get_user_repo(db: AsyncIOMotorDatabase = Depends(get_db)) -> UserRepository:
     """Get user repository"""
     return UserRepository(db)
@@ -42,19 +87,25 @@ def get_token_repo(db: AsyncIOMotorDatabase = Depends(get_db)) -> RefreshTokenRe
 
 def get_status_repo(db: AsyncIOMotorDatabase = Depends(get_db)) -> StatusCheckRepository:
     """Get status check repository"""
-    return StatusCheckRepository(db)
+    return StatusCheckRepository(db, batcher=_status_batcher)
+
+
+def get_diagram_repo(db: AsyncIOMotorDatabase = Depends(get_db)) -> DiagramRepository:
+    """Get diagram repository"""
+    return DiagramRepository(db)
 
 
 def get_auth_service(
     user_repo: UserRepository = Depends(get_user_repo),
-    token_repo: RefreshTokenRepository = Depends(get_token_repo)
+    token_repo: RefreshTokenRepository = Depends(get_token_repo),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ) -> AuthService:
     """Get authentication service"""
-    return AuthService(user_repo, token_repo)
+    return AuthService(user_repo, token_repo, http_client)
 
 
 async def get_current_user(
-    credentials: HTTPAuthCredentials = Depends(security),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service),
     user_repo: UserRepository = Depends(get_user_repo)
 ) -> TokenData:
@@ -83,16 +134,20 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    # Get user from database
-    user = await user_repo.find_by_email(token_data.email)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+    # Get user profile from cache, falling back to the database
+    profile_cache = get_user_profile_cache()
+    profile = profile_cache.get(token_data.email)
+    if profile is None:
+        user = await user_repo.find_by_email(token_data.email)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        profile = (user.get("name"), user.get("picture"))
+        profile_cache.set(token_data.email, profile)
     
     # Return user data
-    token_data.name = user.get("name")
-    token_data.picture = user.get("picture")
+    token_data.name, token_data.picture = profile
     
     return token_data
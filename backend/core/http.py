@@ -0,0 +1,28 @@
+"""
+Shared outbound HTTP client
+"""
+import httpx
+from .config import (
+    get_http_max_connections, get_http_max_keepalive_connections, get_http_keepalive_expiry,
+    get_http_timeout, get_http_connect_timeout
+)
+
+
+def create_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Create an app-lifetime, connection-pooled HTTP/2 client
+    
+    Pool and timeout settings come from core.config (HTTP_* variables).
+    Keyword arguments override the defaults (e.g. transport= in tests).
+    """
+    options = {
+        "http2": True,
+        "limits": httpx.Limits(
+            max_connections=get_http_max_connections(),
+            max_keepalive_connections=get_http_max_keepalive_connections(),
+            keepalive_expiry=get_http_keepalive_expiry(),
+        ),
+        "timeout": httpx.Timeout(get_http_timeout(), connect=get_http_connect_timeout()),
+    }
+    options.update(kwargs)
+    return httpx.AsyncClient(**options)
@@ -0,0 +1,104 @@
+"""
+Pre-serialized, precompressed JSON responses for content that only changes on deploy
+"""
+import gzip
+import hashlib
+import json
+import re
+from typing import Any, Dict
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Browser cache lifetime for static payloads, in seconds
+STATIC_PAYLOAD_MAX_AGE = 300
+
+# Preferred order when a client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+# qvalue grammar from RFC 9110 section 12.4.2
+QVALUE = re.compile(r"0(\.\d{0,3})?|1(\.0{0,3})?")
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into encoding -> q-value
+
+    Malformed q-values count as 0 (not acceptable).
+    """
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                value = value.strip()
+                q = float(value) if QVALUE.fullmatch(value) else 0.0
+        accepted[name] = q
+    return accepted
+
+
+class StaticPayload:
+    """
+    A JSON body serialized and compressed once, served with a strong ETag
+
+    Each encoding is its own representation, so each gets its own ETag.
+    """
+
+    def __init__(self, content: Any, max_age: int = STATIC_PAYLOAD_MAX_AGE):
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        self.variants: Dict[str, bytes] = {"identity": body, "gzip": gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+        self.etags: Dict[str, str] = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.variants
+        }
+        self.cache_control = f"public, max-age={max_age}"
+
+    def select_encoding(self, accept_encoding: str) -> str:
+        """Pick the best available encoding the client accepts"""
+        if not accept_encoding:
+            return "identity"
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*")
+        best, best_q = "identity", 0.0
+        for encoding in ENCODING_PREFERENCE:
+            if encoding not in self.variants:
+                continue
+            q = accepted.get(encoding, wildcard if wildcard is not None else (1.0 if encoding == "identity" else 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def not_modified(self, if_none_match: str, encoding: str) -> bool:
+        """Check If-None-Match against the served variant's ETag (weak comparison, per RFC 9110)"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return self.etags[encoding] in tags
+
+    def response(self, request: Request) -> Response:
+        """Build the response for a request, honouring If-None-Match and Accept-Encoding"""
+        encoding = self.select_encoding(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.etags[encoding],
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self.not_modified(request.headers.get("if-none-match", ""), encoding):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type="application/json", headers=headers)
@@ -1,8 +1,27 @@
 """Database package"""
-from .repositories import UserRepository, RefreshTokenRepository, StatusCheckRepository
+from .repositories import (
+    UserRepository, RefreshTokenRepository, StatusCheckRepository, DiagramRepository, VersionConflictError
+)
+from .json_patch import JsonPatchError, JsonPatchTestFailed, apply_patch, parse_patch
+from .cache import TTLCache, get_user_profile_cache
+from .indexes import ensure_indexes, audit_query_plans, IndexProvisioningError
+from .health import PoolMonitor, ReadinessProbe
 
 __all__ = [
     "UserRepository",
     "RefreshTokenRepository",
     "StatusCheckRepository",
+    "DiagramRepository",
+    "VersionConflictError",
+    "JsonPatchError",
+    "JsonPatchTestFailed",
+    "apply_patch",
+    "parse_patch",
+    "TTLCache",
+    "get_user_profile_cache",
+    "ensure_indexes",
+    "IndexProvisioningError",
+    "audit_query_plans",
+    "PoolMonitor",
+    "ReadinessProbe",
 ]
@@ -0,0 +1,77 @@
+"""
+Write coalescing for high-frequency single-document inserts
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class InsertBatcher:
+    """Merges concurrent insert() calls into one unordered insert_many per flush"""
+
+    def __init__(self, collection: AsyncIOMotorCollection, max_batch_size: int = 500, max_delay_ms: float = 10):
+        self.collection = collection
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def insert(self, document: Dict[str, Any]) -> Any:
+        """Queue a document and wait until its batch is written; returns the inserted _id"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        document.setdefault("_id", ObjectId())
+        self._pending.append((document, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+
+        return await future
+
+    def _start_flush(self) -> None:
+        """Hand the pending batch to a background flush task"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Write one batch and resolve each caller's future"""
+        documents = [document for document, _ in batch]
+        failed: Dict[int, Exception] = {}
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = BulkWriteError({"writeErrors": [error]})
+        except Exception as e:
+            logger.error(f"Error flushing {len(batch)} batched inserts: {e}")
+            failed = {index: e for index in range(len(batch))}
+
+        for index, (document, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result(document["_id"])
+
+    async def close(self) -> None:
+        """Flush anything still queued and wait for in-flight writes"""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -0,0 +1,163 @@
+"""
+MongoDB readiness probing and connection pool monitoring
+"""
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import monitoring
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection pool usage from driver events
+
+    Register with the client via event_listeners=[monitor]. Events arrive on
+    driver threads, so counters are guarded by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._max_pool_size: Dict[Any, int] = {}
+        self._open = defaultdict(int)
+        self._in_use = defaultdict(int)
+        self._waiting = defaultdict(int)
+        self.checkout_failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get totals across all server pools"""
+        with self._lock:
+            max_pool_size = sum(self._max_pool_size.values())
+            in_use = sum(self._in_use.values())
+            waiting = sum(self._waiting.values())
+            return {
+                "open": sum(self._open.values()),
+                "in_use": in_use,
+                "waiting": waiting,
+                "max_pool_size": max_pool_size,
+                "utilization": round(in_use / max_pool_size, 3) if max_pool_size else 0.0,
+                "checkout_failures": self.checkout_failures,
+            }
+
+    def is_saturated(self) -> bool:
+        """Check whether every connection is in use and requests are queueing"""
+        stats = self.stats()
+        return stats["max_pool_size"] > 0 and stats["in_use"] >= stats["max_pool_size"] and stats["waiting"] > 0
+
+    def pool_created(self, event):
+        with self._lock:
+            self._max_pool_size[event.address] = event.options.get("maxPoolSize", 100)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            for counters in (self._max_pool_size, self._open, self._in_use, self._waiting):
+                counters.pop(event.address, None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._open[event.address] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._open[event.address] = max(0, self._open[event.address] - 1)
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._waiting[event.address] += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._waiting[event.address] = max(0, self._waiting[event.address] - 1)
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self._waiting[event.address] = max(0, self._waiting[event.address] - 1)
+            self._in_use[event.address] += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._in_use[event.address] = max(0, self._in_use[event.address] - 1)
+
+
+class ReadinessProbe:
+    """
+    Rate-limited MongoDB ping
+
+    The ping result is cached for `ttl` seconds and concurrent probes share a
+    single in-flight ping, so load balancer probes never pile up on the database.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        pool_monitor: Optional[PoolMonitor] = None,
+        ttl: float = 5.0,
+        timeout: float = 2.0,
+    ):
+        self.db = db
+        self.pool_monitor = pool_monitor
+        self.ttl = ttl
+        self.timeout = timeout
+        self._last_ping: Optional[Dict[str, Any]] = None
+        self._last_ping_at = 0.0
+        self._in_flight: Optional[asyncio.Future] = None
+
+    async def check(self) -> Dict[str, Any]:
+        """
+        Get readiness, pinging MongoDB only when the cached result is stale
+
+        Returns:
+            dict: ready flag, last ping result and pool stats
+        """
+        mongo = await self._ping_cached()
+        pool = self.pool_monitor.stats() if self.pool_monitor else None
+        saturated = self.pool_monitor.is_saturated() if self.pool_monitor else False
+        return {
+            "ready": mongo["ok"] and not saturated,
+            "mongo": mongo,
+            "pool": pool,
+        }
+
+    async def _ping_cached(self) -> Dict[str, Any]:
+        """Return the cached ping result, or share one fresh ping among concurrent callers"""
+        if self._last_ping is not None and time.monotonic() - self._last_ping_at < self.ttl:
+            return self._last_ping
+        if self._in_flight is None:
+            self._in_flight = asyncio.ensure_future(self._ping())
+            self._in_flight.add_done_callback(self._store)
+        return await asyncio.shield(self._in_flight)
+
+    def _store(self, future: asyncio.Future) -> None:
+        """Cache a finished ping"""
+        self._in_flight = None
+        if not future.cancelled():
+            self._last_ping = future.result()
+            self._last_ping_at = time.monotonic()
+
+    async def _ping(self) -> Dict[str, Any]:
+        """Run one ping, never raising"""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.db.command("ping"), timeout=self.timeout)
+            result = {"ok": True}
+        except Exception as e:
+            logger.error(f"MongoDB readiness ping failed: {e}")
+            result = {"ok": False, "error": type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["checked_at"] = time.time()
+        return result
@@ -0,0 +1,161 @@
+"""
+Index provisioning and query-plan auditing for the repositories
+"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from bson import ObjectId
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Indexes backing every repository query, per collection
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "refresh_tokens": [
+        # Partial, so legacy documents still awaiting migrate_refresh_tokens (no token_hash) never collide
+        IndexModel(
+            [("token_hash", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"token_hash": {"$exists": True}},
+            name="token_hash_unique_partial",
+        ),
+        IndexModel([("email", ASCENDING), ("is_revoked", ASCENDING)], name="email_is_revoked"),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+        IndexModel(
+            [("is_revoked", ASCENDING)],
+            partialFilterExpression={"is_revoked": True},
+            name="revoked_partial",
+        ),
+    ],
+    "status_checks": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_id_desc"),
+    ],
+    "diagrams": [
+        IndexModel(
+            [("owner", ASCENDING), ("project_id", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+            name="owner_project_updated_id",
+        ),
+    ],
+}
+
+# Indexes that have been superseded and are dropped if still present
+LEGACY_INDEXES: Dict[str, List[str]] = {
+    "refresh_tokens": ["token_unique", "token_hash_unique"],
+    "status_checks": ["timestamp_desc"],
+    "diagrams": ["owner_project_updated"],
+}
+
+# Query shapes issued by the repositories: name -> (collection, filter, sort)
+REPOSITORY_QUERIES: Dict[str, tuple] = {
+    "UserRepository.find_by_email": ("users", {"email": "audit@example.com"}, None),
+    "UserRepository.update": ("users", {"email": "audit@example.com"}, None),
+    "UserRepository.upsert": ("users", {"email": "audit@example.com"}, None),
+    "RefreshTokenRepository.find_by_token": ("refresh_tokens", {"token_hash": "audit", "is_revoked": False}, None),
+    "RefreshTokenRepository.revoke": ("refresh_tokens", {"token_hash": "audit"}, None),
+    "RefreshTokenRepository.revoke_all_for_user": ("refresh_tokens", {"email": "audit@example.com"}, None),
+    "RefreshTokenRepository.purge_revoked": ("refresh_tokens", {"is_revoked": True}, None),
+    "StatusCheckRepository.find_all": ("status_checks", {}, [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    "StatusCheckRepository.find_page": (
+        "status_checks",
+        {"$or": [
+            {"timestamp": {"$lt": datetime(2024, 1, 1, tzinfo=timezone.utc)}},
+            {"timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc), "_id": {"$lt": ObjectId("0" * 24)}},
+        ]},
+        [("timestamp", DESCENDING), ("_id", DESCENDING)],
+    ),
+    "DiagramRepository.find_by_project": (
+        "diagrams",
+        {"owner": "audit@example.com", "project_id": "audit", "$or": [
+            {"updated_at": {"$lt": datetime(2024, 1, 1, tzinfo=timezone.utc)}},
+            {"updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc), "_id": {"$lt": ObjectId("0" * 24)}},
+        ]},
+        [("updated_at", DESCENDING), ("_id", DESCENDING)],
+    ),
+}
+
+
+class IndexProvisioningError(Exception):
+    """Indexes could not be created on one or more collections"""
+
+    def __init__(self, failures: Dict[str, Exception], created: Dict[str, List[str]]):
+        super().__init__("Failed to create indexes on " + ", ".join(
+            f"{collection_name} ({error})" for collection_name, error in failures.items()
+        ))
+        self.failures = failures
+        self.created = created
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """
+    Create all repository indexes (no-op for indexes that already exist)
+
+    A failing collection does not stop the others from being indexed.
+
+    Raises:
+        IndexProvisioningError: after every collection was attempted, if any failed
+    """
+    await drop_legacy_indexes(db)
+    
+    created = {}
+    failures = {}
+    for collection_name, indexes in INDEXES.items():
+        try:
+            created[collection_name] = await db[collection_name].create_indexes(indexes)
+        except Exception as e:
+            logger.error(f"Error creating indexes on {collection_name}: {e}")
+            failures[collection_name] = e
+    if failures:
+        raise IndexProvisioningError(failures, created)
+    return created
+
+
+async def drop_legacy_indexes(db: AsyncIOMotorDatabase) -> List[str]:
+    """Drop superseded indexes that would conflict with the current schema"""
+    dropped = []
+    for collection_name, names in LEGACY_INDEXES.items():
+        existing = await db[collection_name].index_information()
+        for name in names:
+            if name in existing:
+                await db[collection_name].drop_index(name)
+                logger.info(f"Dropped legacy index {collection_name}.{name}")
+                dropped.append(name)
+    return dropped
+
+
+def _plan_stages(plan: Any) -> Iterator[str]:
+    """Yield every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+async def audit_query_plans(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """
+    Run explain() on every repository query
+
+    Returns:
+        dict: Winning-plan stages for each query name
+    """
+    plans = {}
+    for name, (collection_name, query, sort) in REPOSITORY_QUERIES.items():
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        plans[name] = list(_plan_stages(explanation["queryPlanner"]["winningPlan"]))
+    return plans
+
+
+def find_collection_scans(plans: Dict[str, List[str]]) -> List[str]:
+    """Get the names of queries whose winning plan is a COLLSCAN"""
+    return [name for name, stages in plans.items() if "COLLSCAN" in stages]
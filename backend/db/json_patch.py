@@ -0,0 +1,242 @@
+"""
+RFC 6902 JSON Patch
+
+Patches are applied copy-on-write: each container along a changed path is
+shallow-copied at most once per patch, so the input document is never modified
+and untouched subtrees are shared rather than deep-copied. Applying a handful of
+operations to a large document costs roughly the size of the containers they
+pass through, not the size of the document.
+"""
+import copy
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+class JsonPatchError(ValueError):
+    """Malformed patch, or an operation that cannot be applied"""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """A test operation did not match the document"""
+
+
+class Operation(NamedTuple):
+    """One validated patch operation with its pointers already split"""
+    op: str
+    path: Tuple[str, ...]
+    from_: Optional[Tuple[str, ...]] = None
+    value: Any = None
+
+
+@lru_cache(maxsize=4096)
+def _split_pointer(pointer: str) -> Tuple[str, ...]:
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/"))
+
+
+def parse_pointer(pointer: Any) -> Tuple[str, ...]:
+    """Split an RFC 6901 JSON pointer into unescaped reference tokens"""
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"JSON pointer must be a string, got {type(pointer).__name__}")
+    return _split_pointer(pointer)
+
+
+def parse_operation(operation: Any) -> Operation:
+    """Validate one operation object"""
+    if not isinstance(operation, dict):
+        raise JsonPatchError("Operation must be an object")
+    op = operation.get("op")
+    if op not in OPERATIONS:
+        raise JsonPatchError(f"Unknown operation: {op!r}")
+    if "path" not in operation:
+        raise JsonPatchError(f"'{op}' requires 'path'")
+    path = parse_pointer(operation["path"])
+
+    if op in ("add", "replace", "test"):
+        if "value" not in operation:
+            raise JsonPatchError(f"'{op}' requires 'value'")
+        return Operation(op, path, value=operation["value"])
+    if op in ("move", "copy"):
+        if "from" not in operation:
+            raise JsonPatchError(f"'{op}' requires 'from'")
+        return Operation(op, path, from_=parse_pointer(operation["from"]))
+    return Operation(op, path)
+
+
+def parse_patch(patch: Any) -> List[Operation]:
+    """Validate a JSON Patch document"""
+    if not isinstance(patch, list):
+        raise JsonPatchError("Patch must be an array of operations")
+    operations = []
+    for index, operation in enumerate(patch):
+        try:
+            operations.append(parse_operation(operation))
+        except JsonPatchError as e:
+            raise type(e)(f"Operation {index}: {e}") from None
+    return operations
+
+
+def json_equal(a: Any, b: Any) -> bool:
+    """Compare JSON values per RFC 6902 (true is not 1, but 1 equals 1.0)"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(json_equal(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(json_equal, a, b))
+    return a == b
+
+
+def _array_index(array: list, token: str, allow_end: bool = False) -> int:
+    """Resolve an array reference token; "-" and len(array) are only valid when adding"""
+    if allow_end and token == "-":
+        return len(array)
+    if not (token.isascii() and token.isdigit()) or (len(token) > 1 and token[0] == "0"):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _format_pointer(tokens: Tuple[str, ...]) -> str:
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+class _Patcher:
+    """Applies operations to a document, copying containers before their first change"""
+
+    def __init__(self, document: Any):
+        self.root = document
+        # id -> container copied by this patch, safe to mutate (held so ids are never reused)
+        self._owned: Dict[int, Union[dict, list]] = {}
+
+    def _own(self, container: Union[dict, list]) -> Union[dict, list]:
+        if id(container) in self._owned:
+            return container
+        owned = container.copy()
+        self._owned[id(owned)] = owned
+        return owned
+
+    def _get(self, tokens: Tuple[str, ...]) -> Any:
+        """Read the value at a path"""
+        node = self.root
+        for token in tokens:
+            if isinstance(node, dict):
+                if token not in node:
+                    raise JsonPatchError(f"Path not found: {_format_pointer(tokens)}")
+                node = node[token]
+            elif isinstance(node, list):
+                node = node[_array_index(node, token)]
+            else:
+                raise JsonPatchError(f"Path not found: {_format_pointer(tokens)}")
+        return node
+
+    def _parent(self, tokens: Tuple[str, ...]) -> Union[dict, list]:
+        """Get the owned container holding the last token, copying every container on the way"""
+        if not isinstance(self.root, (dict, list)):
+            raise JsonPatchError(f"Path not found: {_format_pointer(tokens)}")
+        node = self.root = self._own(self.root)
+        for token in tokens[:-1]:
+            if isinstance(node, dict):
+                if token not in node:
+                    raise JsonPatchError(f"Path not found: {_format_pointer(tokens)}")
+                key = token
+            else:
+                key = _array_index(node, token)
+            child = node[key]
+            if not isinstance(child, (dict, list)):
+                raise JsonPatchError(f"Path not found: {_format_pointer(tokens)}")
+            if id(child) not in self._owned:
+                child = node[key] = self._own(child)
+            node = child
+        return node
+
+    def add(self, tokens: Tuple[str, ...], value: Any) -> None:
+        if not tokens:
+            self.root = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, list):
+            parent.insert(_array_index(parent, tokens[-1], allow_end=True), value)
+        else:
+            parent[tokens[-1]] = value
+
+    def remove(self, tokens: Tuple[str, ...]) -> Any:
+        if not tokens:
+            raise JsonPatchError("Cannot remove the whole document")
+        parent = self._parent(tokens)
+        if isinstance(parent, list):
+            return parent.pop(_array_index(parent, tokens[-1]))
+        if tokens[-1] not in parent:
+            raise JsonPatchError(f"Path not found: {_format_pointer(tokens)}")
+        return parent.pop(tokens[-1])
+
+    def replace(self, tokens: Tuple[str, ...], value: Any) -> None:
+        if not tokens:
+            self.root = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, list):
+            parent[_array_index(parent, tokens[-1])] = value
+        elif tokens[-1] in parent:
+            parent[tokens[-1]] = value
+        else:
+            raise JsonPatchError(f"Path not found: {_format_pointer(tokens)}")
+
+    def apply(self, operation: Operation) -> None:
+        op, path = operation.op, operation.path
+        if op == "add":
+            self.add(path, operation.value)
+        elif op == "remove":
+            self.remove(path)
+        elif op == "replace":
+            self.replace(path, operation.value)
+        elif op == "move":
+            if operation.from_ == path:
+                self._get(path)
+                return
+            if path[:len(operation.from_)] == operation.from_:
+                raise JsonPatchError("Cannot move a value into one of its own children")
+            self.add(path, self.remove(operation.from_))
+        elif op == "copy":
+            value = copy.deepcopy(self._get(operation.from_))
+            if isinstance(value, (dict, list)):
+                self._owned[id(value)] = value
+            self.add(path, value)
+        elif not json_equal(self._get(path), operation.value):
+            raise JsonPatchTestFailed(f"Test failed at {_format_pointer(path)}")
+
+
+def apply_patch(document: Any, patch: Iterable[Union[Dict[str, Any], Operation]]) -> Any:
+    """
+    Apply a JSON Patch, returning the patched document
+
+    The patch is atomic: if any operation fails, JsonPatchError is raised and
+    the input document is left as it was.
+
+    Args:
+        document: JSON document to patch (not modified)
+        patch: Operation objects, or the result of parse_patch
+
+    Returns:
+        The patched document, sharing unchanged subtrees with the input
+    """
+    patcher = _Patcher(document)
+    for index, operation in enumerate(patch):
+        try:
+            if not isinstance(operation, Operation):
+                operation = parse_operation(operation)
+            patcher.apply(operation)
+        except JsonPatchError as e:
+            raise type(e)(f"Operation {index}: {e}") from None
+    return patcher.root
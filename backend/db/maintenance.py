@@ -0,0 +1,22 @@
+"""
+Background maintenance tasks for the database
+"""
+import asyncio
+import logging
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from .repositories import RefreshTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_revoked_tokens_periodically(db: AsyncIOMotorDatabase, interval: float) -> None:
+    """Delete revoked refresh tokens every `interval` seconds until cancelled"""
+    token_repo = RefreshTokenRepository(db)
+    while True:
+        try:
+            purged = await token_repo.purge_revoked()
+            if purged:
+                logger.info("Purged %d revoked refresh tokens", purged)
+        except Exception as e:
+            logger.error(f"Revoked token purge failed: {e}")
+        await asyncio.sleep(interval)
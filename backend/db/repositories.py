@@ -1,7 +1,20 @@
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCursor
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
+import base64
+from collections import defaultdict
+import hashlib
+import json
 import logging
+from .cache import get_user_profile_cache
+from .batching import InsertBatcher
+from pydantic import ValidationError
+from models.schemas import DiagramCreate, DiagramType
+from .json_patch import JsonPatchError, Operation, apply_patch, parse_patch
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +36,17 @@ class UserRepository:
     async def create(self, email: str, name: str, picture: Optional[str] = None) -> Dict[str, Any]:
         """Create a new user"""
         try:
+            now = datetime.now(timezone.utc)
             user_data = {
                 "email": email,
                 "name": name,
                 "picture": picture or "",
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "created_at": now,
+                "updated_at": now,
             }
             result = await self.collection.insert_one(user_data)
             user_data["_id"] = result.inserted_id
+            get_user_profile_cache().invalidate(email)
             return user_data
         except Exception as e:
             logger.error(f"Error creating user: {e}")
@@ -40,17 +55,46 @@ class UserRepository:
     async def update(self, email: str, **kwargs) -> Optional[Dict[str, Any]]:
         """Update user information"""
         try:
-            update_data = {**kwargs, "updated_at": datetime.now(timezone.utc).isoformat()}
+            update_data = {**kwargs, "updated_at": datetime.now(timezone.utc)}
             result = await self.collection.find_one_and_update(
                 {"email": email},
                 {"$set": update_data},
                 return_document=True
             )
+            get_user_profile_cache().invalidate(email)
             return result
         except Exception as e:
             logger.error(f"Error updating user: {e}")
             raise
 
+    async def upsert(self, email: str, name: str, picture: Optional[str] = None) -> Dict[str, Any]:
+        """Create the user or refresh their profile in a single round trip"""
+        now = datetime.now(timezone.utc)
+        update = {
+            "$set": {"name": name, "picture": picture or "", "updated_at": now},
+            "$setOnInsert": {"email": email, "created_at": now},
+        }
+        try:
+            try:
+                result = await self.collection.find_one_and_update(
+                    {"email": email}, update, upsert=True, return_document=ReturnDocument.AFTER
+                )
+            except DuplicateKeyError:
+                # A concurrent first login inserted the user; the retry matches it
+                result = await self.collection.find_one_and_update(
+                    {"email": email}, update, upsert=True, return_document=ReturnDocument.AFTER
+                )
+            get_user_profile_cache().invalidate(email)
+            return result
+        except Exception as e:
+            logger.error(f"Error upserting user: {e}")
+            raise
+
+
+def hash_token(token: str) -> str:
+    """Get the fixed-length lookup key stored in place of a refresh token"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 
 class RefreshTokenRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -62,9 +106,9 @@ class RefreshTokenRepository:
         try:
             token_data = {
                 "email": email,
-                "token": token,
-                "expires_at": expires_at.isoformat(),
-                "created_at": datetime.now(timezone.utc).isoformat(),
+                "token_hash": hash_token(token),
+                "expires_at": expires_at,
+                "created_at": datetime.now(timezone.utc),
                 "is_revoked": False,
             }
             result = await self.collection.insert_one(token_data)
@@ -77,7 +121,7 @@ class RefreshTokenRepository:
     async def find_by_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Find refresh token"""
         try:
-            token_data = await self.collection.find_one({"token": token, "is_revoked": False})
+            token_data = await self.collection.find_one({"token_hash": hash_token(token), "is_revoked": False})
             return token_data
         except Exception as e:
             logger.error(f"Error finding refresh token: {e}")
@@ -87,7 +131,7 @@ class RefreshTokenRepository:
         """Revoke a refresh token"""
         try:
             result = await self.collection.update_one(
-                {"token": token},
+                {"token_hash": hash_token(token)},
                 {"$set": {"is_revoked": True}}
             )
             return result.modified_count > 0
@@ -107,31 +151,380 @@ class RefreshTokenRepository:
             logger.error(f"Error revoking all tokens for user: {e}")
             raise
 
+    async def purge_revoked(self) -> int:
+        """Delete revoked refresh tokens (expired ones are removed by the TTL index)"""
+        try:
+            result = await self.collection.delete_many({"is_revoked": True})
+            return result.deleted_count
+        except Exception as e:
+            logger.error(f"Error purging revoked tokens: {e}")
+            raise
+
+
+def _encode_keyset(timestamp: Union[datetime, str], object_id: ObjectId) -> str:
+    """
+    Encode a (timestamp, _id) keyset position as an opaque cursor
+
+    Legacy documents store timestamps as ISO strings. Those are kept as
+    strings (and flagged) so the next page compares like with like: MongoDB
+    only matches $lt between values of the same BSON type.
+    """
+    if isinstance(timestamp, str):
+        position = [timestamp, str(object_id), "str"]
+    else:
+        position = [timestamp.isoformat(), str(object_id)]
+    raw = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_keyset(cursor: str) -> Tuple[Union[datetime, str], ObjectId]:
+    """Decode a keyset position produced by _encode_keyset"""
+    try:
+        timestamp, object_id, *kind = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if kind == ["str"] and isinstance(timestamp, str):
+            return timestamp, ObjectId(object_id)
+        if kind:
+            raise ValueError("Unknown cursor timestamp type")
+        return datetime.fromisoformat(timestamp), ObjectId(object_id)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def _keyset_filter(field: str, after: Optional[Tuple[Union[datetime, str], ObjectId]]) -> Dict[str, Any]:
+    """Build the filter selecting documents strictly after a (field, _id) position, newest first"""
+    if after is None:
+        return {}
+    timestamp, object_id = after
+    return {"$or": [
+        {field: {"$lt": timestamp}},
+        {field: timestamp, "_id": {"$lt": object_id}},
+    ]}
+
 
 class StatusCheckRepository:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    # Keyset order shared by find_all, find_page and stream
+    PAGE_SORT = [("timestamp", DESCENDING), ("_id", DESCENDING)]
+
+    def __init__(self, db: AsyncIOMotorDatabase, batcher: Optional[InsertBatcher] = None):
         self.db = db
         self.collection = db.status_checks
+        self.batcher = batcher
 
     async def create(self, client_name: str) -> Dict[str, Any]:
-        """Create a status check record"""
+        """Create a status check record (coalesced with concurrent inserts when batching is enabled)"""
         try:
             status_data = {
                 "client_name": client_name,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": datetime.now(timezone.utc),
             }
-            result = await self.collection.insert_one(status_data)
-            status_data["_id"] = result.inserted_id
+            if self.batcher is not None:
+                status_data["_id"] = await self.batcher.insert(status_data)
+            else:
+                result = await self.collection.insert_one(status_data)
+                status_data["_id"] = result.inserted_id
             return status_data
         except Exception as e:
             logger.error(f"Error creating status check: {e}")
             raise
 
+    async def create_many(self, client_names: List[str]) -> List[Dict[str, Any]]:
+        """Create many status check records with a single unordered insert"""
+        try:
+            timestamp = datetime.now(timezone.utc)
+            status_data = [
+                {"_id": ObjectId(), "client_name": client_name, "timestamp": timestamp}
+                for client_name in client_names
+            ]
+            if status_data:
+                await self.collection.insert_many(status_data, ordered=False)
+            return status_data
+        except Exception as e:
+            logger.error(f"Error creating status checks: {e}")
+            raise
+
     async def find_all(self, limit: int = 1000) -> List[Dict[str, Any]]:
-        """Get all status checks"""
+        """Get all status checks, newest first"""
         try:
-            status_checks = await self.collection.find({}, {"_id": 0}).to_list(limit)
+            cursor = self.collection.find({}, {"_id": 0}).sort(self.PAGE_SORT)
+            status_checks = await cursor.to_list(limit)
             return status_checks
         except Exception as e:
             logger.error(f"Error finding status checks: {e}")
             raise
+
+    @staticmethod
+    def encode_cursor(status_check: Dict[str, Any]) -> str:
+        """Encode the (timestamp, _id) keyset position after a status check"""
+        return _encode_keyset(status_check["timestamp"], status_check["_id"])
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[Union[datetime, str], ObjectId]:
+        """Decode a keyset position produced by encode_cursor"""
+        return _decode_keyset(cursor)
+
+    def _keyset_query(self, after: Optional[Tuple[Union[datetime, str], ObjectId]]) -> Dict[str, Any]:
+        """Build the filter selecting documents strictly after a keyset position"""
+        return _keyset_filter("timestamp", after)
+
+    async def find_page(
+        self, limit: int, after: Optional[Tuple[Union[datetime, str], ObjectId]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get one page of status checks, newest first, starting after a keyset position"""
+        try:
+            cursor = self.collection.find(self._keyset_query(after)).sort(self.PAGE_SORT).limit(limit)
+            return await cursor.to_list(limit)
+        except Exception as e:
+            logger.error(f"Error finding status check page: {e}")
+            raise
+
+    def stream(
+        self,
+        after: Optional[Tuple[Union[datetime, str], ObjectId]] = None,
+        limit: int = 0,
+        batch_size: int = 500
+    ) -> AsyncIOMotorCursor:
+        """Get a cursor over status checks, newest first, fetched in batches as it is iterated"""
+        return (
+            self.collection.find(self._keyset_query(after))
+            .sort(self.PAGE_SORT)
+            .limit(limit)
+            .batch_size(batch_size)
+        )
+
+
+class VersionConflictError(Exception):
+    """A write was based on a stale document version"""
+
+    def __init__(self, current_version: Optional[int]):
+        super().__init__(f"Document is at version {current_version}")
+        self.current_version = current_version
+
+
+class DiagramRepository:
+    # Top-level diagram fields clients may change with a JSON Patch
+    PATCHABLE_FIELDS = frozenset({"name", "type", "nodes", "edges", "viewport"})
+    # Fields a patch may change but never remove
+    REQUIRED_FIELDS = frozenset({"name", "type", "nodes", "edges"})
+    # Stand-ins for required fields a patch leaves alone, so the rest can be validated
+    VALIDATION_DEFAULTS = {"name": "unchanged", "type": DiagramType.CLASS}
+    # Fields left out of diagram listings
+    SUMMARY_PROJECTION = {"nodes": 0, "edges": 0, "viewport": 0}
+    # Keyset order for diagram listings
+    PAGE_SORT = [("updated_at", DESCENDING), ("_id", DESCENDING)]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.diagrams
+
+    @staticmethod
+    def _object_id(diagram_id: str) -> Optional[ObjectId]:
+        """Parse a diagram id, treating malformed ids as unknown"""
+        try:
+            return ObjectId(diagram_id)
+        except (InvalidId, TypeError):
+            return None
+
+    async def create(
+        self,
+        project_id: str,
+        owner: str,
+        name: str,
+        type: str,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        viewport: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Create a diagram at version 1"""
+        try:
+            now = datetime.now(timezone.utc)
+            diagram = {
+                "project_id": project_id,
+                "owner": owner,
+                "name": name,
+                "type": type,
+                "nodes": nodes,
+                "edges": edges,
+                "viewport": viewport,
+                "version": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+            result = await self.collection.insert_one(diagram)
+            diagram["_id"] = result.inserted_id
+            return diagram
+        except Exception as e:
+            logger.error(f"Error creating diagram: {e}")
+            raise
+
+    @staticmethod
+    def encode_cursor(diagram: Dict[str, Any]) -> str:
+        """Encode the (updated_at, _id) keyset position after a diagram"""
+        return _encode_keyset(diagram["updated_at"], diagram["_id"])
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[Union[datetime, str], ObjectId]:
+        """Decode a keyset position produced by encode_cursor"""
+        return _decode_keyset(cursor)
+
+    async def find_by_project(
+        self,
+        project_id: str,
+        owner: str,
+        limit: int = 100,
+        after: Optional[Tuple[Union[datetime, str], ObjectId]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get one page of a project's diagrams without their contents, most recently updated first"""
+        try:
+            query = {"owner": owner, "project_id": project_id, **_keyset_filter("updated_at", after)}
+            cursor = self.collection.find(query, self.SUMMARY_PROJECTION).sort(self.PAGE_SORT).limit(limit)
+            return await cursor.to_list(limit)
+        except Exception as e:
+            logger.error(f"Error finding diagrams: {e}")
+            raise
+
+    async def find_by_id(self, project_id: str, diagram_id: str, owner: str) -> Optional[Dict[str, Any]]:
+        """Find a diagram"""
+        object_id = self._object_id(diagram_id)
+        if object_id is None:
+            return None
+        try:
+            return await self.collection.find_one({"_id": object_id, "owner": owner, "project_id": project_id})
+        except Exception as e:
+            logger.error(f"Error finding diagram: {e}")
+            raise
+
+    async def delete(self, project_id: str, diagram_id: str, owner: str) -> bool:
+        """Delete a diagram"""
+        object_id = self._object_id(diagram_id)
+        if object_id is None:
+            return False
+        try:
+            result = await self.collection.delete_one({"_id": object_id, "owner": owner, "project_id": project_id})
+            return result.deleted_count > 0
+        except Exception as e:
+            logger.error(f"Error deleting diagram: {e}")
+            raise
+
+    async def apply_patch(
+        self,
+        project_id: str,
+        diagram_id: str,
+        owner: str,
+        patch: List[Dict[str, Any]],
+        expected_version: int,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply an RFC 6902 JSON Patch to a diagram if it is still at expected_version
+
+        Only the fields the patch touches are read, and only the changed
+        array elements (or, when elements are added or removed, whole fields)
+        are written back.
+
+        Returns:
+            dict: _id, version and updated_at after the write, or None if not found
+
+        Raises:
+            JsonPatchError: if the patch is malformed, does not apply, targets other fields
+                or leaves an invalid diagram
+            VersionConflictError: if the diagram has moved past expected_version
+        """
+        operations = parse_patch(patch)
+        fields = self._patched_fields(operations)
+        object_id = self._object_id(diagram_id)
+        if object_id is None:
+            return None
+
+        query = {"_id": object_id, "owner": owner, "project_id": project_id}
+        try:
+            current = await self.collection.find_one(query, {"version": 1, **{field: 1 for field in fields}})
+        except Exception as e:
+            logger.error(f"Error loading diagram for patch: {e}")
+            raise
+        if current is None:
+            return None
+        if current["version"] != expected_version:
+            raise VersionConflictError(current["version"])
+
+        document = {field: current[field] for field in fields if field in current}
+        patched = apply_patch(document, operations)
+        self._validate(fields, patched)
+        now = datetime.now(timezone.utc)
+        update = self._build_update(document, patched, operations)
+        update.setdefault("$set", {})["updated_at"] = now
+        update["$inc"] = {"version": 1}
+
+        try:
+            result = await self.collection.update_one({**query, "version": expected_version}, update)
+        except Exception as e:
+            logger.error(f"Error saving diagram patch: {e}")
+            raise
+        if result.matched_count == 0:
+            # Another save landed between our read and write
+            raise VersionConflictError(None)
+        return {"_id": object_id, "version": expected_version + 1, "updated_at": now}
+
+    def _patched_fields(self, operations: List[Operation]) -> set:
+        """Get the top-level fields a patch reads or writes"""
+        fields = set()
+        for operation in operations:
+            for path in (operation.path, operation.from_):
+                if path is None:
+                    continue
+                if not path or path[0] not in self.PATCHABLE_FIELDS:
+                    raise JsonPatchError(f"Cannot patch {'/' + '/'.join(path)}")
+                fields.add(path[0])
+        return fields
+
+    def _validate(self, fields: set, patched: Dict[str, Any]):
+        """Check the patched fields still satisfy DiagramCreate"""
+        removed = (fields & self.REQUIRED_FIELDS) - patched.keys()
+        if removed:
+            raise JsonPatchError(f"Cannot remove required fields: {', '.join(sorted(removed))}")
+        try:
+            DiagramCreate(**{**self.VALIDATION_DEFAULTS, **patched})
+        except ValidationError as e:
+            problems = "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+            )
+            raise JsonPatchError(f"Patched diagram is invalid: {problems}") from None
+
+    @staticmethod
+    def _build_update(original: Dict[str, Any], patched: Dict[str, Any], operations: List[Operation]) -> Dict[str, Any]:
+        """
+        Build the smallest $set/$unset covering a patch
+
+        Changes inside existing array elements (e.g. /nodes/42/position/x) set
+        just that element; adding, removing or moving elements, or touching a
+        non-array field, sets the whole field.
+        """
+        whole = set()
+        elements = defaultdict(set)
+        for operation in operations:
+            if operation.op == "test":
+                continue
+            written = (operation.path, operation.from_) if operation.op == "move" else (operation.path,)
+            for path in written:
+                field = path[0]
+                structural = len(path) == 2 and operation.op != "replace"
+                if len(path) == 1 or structural or not isinstance(original.get(field), list):
+                    whole.add(field)
+                else:
+                    elements[field].add(int(path[1]))
+
+        set_fields, unset_fields = {}, {}
+        for field in whole:
+            if field in patched:
+                set_fields[field] = patched[field]
+            else:
+                unset_fields[field] = ""
+        for field, indexes in elements.items():
+            if field not in whole:
+                for index in indexes:
+                    set_fields[f"{field}.{index}"] = patched[field][index]
+
+        update = {}
+        if set_fields:
+            update["$set"] = set_fields
+        if unset_fields:
+            update["$unset"] = unset_fields
+        return update
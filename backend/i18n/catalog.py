@@ -0,0 +1,257 @@
+"""
+Compiled translation catalog
+
+All locales are flattened to dotted keys, merged with the fallback locale and
+written to one binary file. Every string is stored once, so keys shared by all
+locales and identical translations cost nothing extra per language.
+
+Layout (little-endian uint32 unless noted):
+
+    magic                       8 bytes
+    string_count, key_count, locale_count
+    string_offsets              string_count + 1 entries into the string data
+    key_ids                     key_count string ids, sorted by key
+    locale_ids                  locale_count string ids
+    value_ids                   locale_count * key_count string ids (MISSING if absent)
+    string data                 UTF-8
+
+The file is opened with mmap, so pre-forked workers share its pages through
+the page cache, and a locale's value table is only touched on first use.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import contextlib
+import tempfile
+import logging
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CATALOG_MAGIC = b'ASCAT\x00\x01\x00'
+HEADER = struct.Struct('<8sIII')
+# Value id for keys a locale (and its fallback) does not translate
+MISSING = 0xFFFFFFFF
+
+
+def flatten(obj: Dict[str, Any], prefix: str = '') -> Dict[str, str]:
+    """Flatten nested dictionaries into dot-notation keys, keeping non-empty strings"""
+    flat = {}
+    for key, value in obj.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{dotted}."))
+        elif isinstance(value, str) and value:
+            flat[dotted] = value
+    return flat
+
+
+def load_locale_sources(locales_dir: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """Load every locales/<locale>/*.json file, merged per locale"""
+    locales_dir = Path(locales_dir)
+    translations = {}
+    if not locales_dir.is_dir():
+        return translations
+
+    for locale_dir in sorted(p for p in locales_dir.iterdir() if p.is_dir()):
+        locale_translations = {}
+        for file_path in sorted(locale_dir.glob('*.json')):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    locale_translations.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error(f"Error loading {file_path}: {e}")
+        translations[locale_dir.name] = locale_translations
+    return translations
+
+
+def sources_mtime(locales_dir: Union[str, Path]) -> float:
+    """Get the newest modification time among the locale JSON files"""
+    return max((p.stat().st_mtime for p in Path(locales_dir).glob('*/*.json')), default=0.0)
+
+
+def build_catalog(translations: Dict[str, Dict[str, Any]], fallback_locale: str) -> bytes:
+    """Serialize translations into the catalog format, merging the fallback into every locale"""
+    fallback = flatten(translations.get(fallback_locale, {}))
+    catalogs = {locale: {**fallback, **flatten(tree)} for locale, tree in translations.items()}
+    catalogs.setdefault(fallback_locale, fallback)
+
+    locales = sorted(catalogs)
+    keys = sorted(set().union(*catalogs.values()))
+
+    string_ids: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        return string_ids.setdefault(text, len(string_ids))
+
+    key_ids = array('I', map(intern, keys))
+    locale_ids = array('I', map(intern, locales))
+    value_ids = array('I')
+    for locale in locales:
+        catalog = catalogs[locale]
+        value_ids.extend(intern(catalog[key]) if key in catalog else MISSING for key in keys)
+
+    encoded = [text.encode('utf-8') for text in string_ids]
+    offsets = array('I', [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    tables = [offsets, key_ids, locale_ids, value_ids]
+    if sys.byteorder != 'little':
+        for table in tables:
+            table.byteswap()
+    return b''.join([
+        HEADER.pack(CATALOG_MAGIC, len(encoded), len(keys), len(locales)),
+        *(table.tobytes() for table in tables),
+        *encoded,
+    ])
+
+
+def compile_catalog(locales_dir: Union[str, Path], output: Union[str, Path], fallback_locale: str) -> int:
+    """
+    Compile locale JSON into a catalog file, replacing it atomically
+
+    Returns:
+        int: size of the written catalog in bytes
+    """
+    data = build_catalog(load_locale_sources(locales_dir), fallback_locale)
+    output = Path(output)
+    fd, temp_path = tempfile.mkstemp(dir=output.parent, prefix=f'.{output.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, output)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+    return len(data)
+
+
+class MessageCatalog:
+    """Read-only view over a compiled catalog"""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        self._buffer = buffer
+        if len(buffer) < HEADER.size:
+            raise ValueError("Truncated translation catalog")
+        magic, string_count, key_count, locale_count = HEADER.unpack_from(buffer)
+        if magic != CATALOG_MAGIC:
+            raise ValueError("Not a translation catalog")
+        table_entries = string_count + 1 + key_count + locale_count + locale_count * key_count
+        if HEADER.size + table_entries * 4 > len(buffer):
+            raise ValueError("Truncated translation catalog")
+
+        view = memoryview(buffer)
+        position = HEADER.size
+
+        def table(count: int):
+            nonlocal position
+            section = view[position:position + count * 4]
+            position += count * 4
+            if sys.byteorder == 'little':
+                return section.cast('I')
+            swapped = array('I', section)
+            swapped.byteswap()
+            return swapped
+
+        self._offsets = table(string_count + 1)
+        key_ids = table(key_count)
+        locale_ids = table(locale_count)
+        self._values_start = position
+        self._key_count = key_count
+        value_ids = table(locale_count * key_count)
+        self._data = view[position:]
+        if self._offsets[string_count] > len(self._data) or any(
+            string_id >= string_count for string_id in chain(key_ids, locale_ids)
+        ) or any(
+            string_id >= string_count and string_id != MISSING for string_id in value_ids
+        ):
+            raise ValueError("Corrupt translation catalog")
+
+        # locale -> value id table, filled in the first time a locale is used
+        self._tables: Dict[str, Any] = {}
+        # locale -> key -> decoded text, only for keys that have been looked up
+        self._resolved: Dict[str, Dict[str, str]] = {}
+
+        self._locale_index = {self._decode(string_id): i for i, string_id in enumerate(locale_ids)}
+        self.locales: List[str] = list(self._locale_index)
+        self._key_index = {sys.intern(self._decode(string_id)): i for i, string_id in enumerate(key_ids)}
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'MessageCatalog':
+        """Map a catalog file into memory"""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_translations(cls, translations: Dict[str, Dict[str, Any]], fallback_locale: str) -> 'MessageCatalog':
+        """Build a catalog in memory"""
+        return cls(build_catalog(translations, fallback_locale))
+
+    def _decode(self, string_id: int) -> str:
+        return str(self._data[self._offsets[string_id]:self._offsets[string_id + 1]], 'utf-8')
+
+    def _table(self, locale: str):
+        """Get a locale's value ids, slicing them out of the buffer on first use"""
+        table = self._tables.get(locale)
+        if table is None:
+            index = self._locale_index[locale]
+            start = self._values_start + index * self._key_count * 4
+            view = memoryview(self._buffer)[start:start + self._key_count * 4]
+            if sys.byteorder == 'little':
+                table = view.cast('I')
+            else:
+                table = array('I', view)
+                table.byteswap()
+            self._tables[locale] = table
+        return table
+
+    def get(self, locale: str, key: str) -> Optional[str]:
+        """
+        Get the text for a key, with the fallback locale already merged in
+
+        Raises:
+            KeyError: if the catalog has no such locale
+        """
+        try:
+            return self._resolved[locale][key]
+        except KeyError:
+            return self._resolve(locale, key)
+
+    def _resolve(self, locale: str, key: str) -> Optional[str]:
+        """Look a key up in the buffer and remember the decoded text"""
+        table = self._table(locale)
+        index = self._key_index.get(key)
+        if index is None or table[index] == MISSING:
+            return None
+        text = self._decode(table[index])
+        self._resolved.setdefault(locale, {})[key] = text
+        return text
+
+    def __contains__(self, locale: str) -> bool:
+        return locale in self._locale_index
+
+    def keys(self) -> Iterable[str]:
+        """Get every flattened key"""
+        return self._key_index.keys()
+
+
+def load_catalog(catalog_path: Union[str, Path], locales_dir: Union[str, Path], fallback_locale: str) -> MessageCatalog:
+    """Open the compiled catalog, or compile the JSON in memory when it is missing or stale"""
+    catalog_path = Path(catalog_path)
+    try:
+        if catalog_path.stat().st_mtime >= sources_mtime(locales_dir):
+            return MessageCatalog.open(catalog_path)
+        logger.warning(f"Translation catalog {catalog_path} is older than {locales_dir}; compiling in memory")
+    except FileNotFoundError:
+        logger.info(f"No translation catalog at {catalog_path}; compiling {locales_dir} in memory")
+    except (ValueError, struct.error) as e:
+        logger.warning(f"Ignoring translation catalog {catalog_path}: {e}")
+    return MessageCatalog.from_translations(load_locale_sources(locales_dir), fallback_locale)
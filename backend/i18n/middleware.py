@@ -1,18 +1,127 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-
-class LocaleMiddleware(BaseHTTPMiddleware):
-    """Middleware to detect and set user locale"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Get locale from header, query param, or cookie
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .locale_config import SUPPORTED_LOCALES, DEFAULT_LOCALE
+
+LOCALE_COOKIE = "ascend_locale"
+LOCALE_COOKIE_MAX_AGE = 31536000
+
+# qvalue grammar from RFC 9110 section 12.4.2
+QVALUE = re.compile(r"0(\.\d{0,3})?|1(\.0{0,3})?")
+
+
+def parse_accept_language(header: str) -> List[Tuple[str, float]]:
+    """
+    Parse an Accept-Language header into (language range, q) pairs
+
+    Ranges are lowercased and ordered by descending q; ties keep header order.
+    Malformed q-values count as 0 (not acceptable).
+    """
+    ranges = []
+    for item in header.split(","):
+        language, _, params = item.strip().partition(";")
+        language = language.strip().lower()
+        if not language:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                value = value.strip()
+                q = float(value) if QVALUE.fullmatch(value) else 0.0
+        ranges.append((language, q))
+    return sorted(ranges, key=lambda pair: -pair[1])
+
+
+def negotiate_locale(header: str, supported: Iterable[str], default: str) -> str:
+    """
+    Pick the best supported locale for an Accept-Language header
+
+    Uses RFC 4647 lookup: each range is tried in q order, dropping subtags
+    from the end ("zh-hant-tw" -> "zh-hant" -> "zh") until one is supported.
+    """
+    supported = {locale.lower(): locale for locale in supported}
+    ranges = parse_accept_language(header)
+    excluded = {language for language, q in ranges if q == 0}
+
+    for language, q in ranges:
+        if q == 0:
+            continue
+        if language == "*":
+            for locale in supported:
+                if locale not in excluded:
+                    return supported[locale]
+            continue
+        while language:
+            if language in supported and language not in excluded:
+                return supported[language]
+            language = language.rpartition("-")[0]
+    return default
+
+
+class LocaleMiddleware:
+    """ASGI middleware to detect and set user locale"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        supported: Iterable[str] = SUPPORTED_LOCALES,
+        default: str = DEFAULT_LOCALE,
+        cache_size: int = 1024,
+    ):
+        self.app = app
+        self.supported = tuple(supported)
+        self.default = default
+        # Accept-Language strings repeat heavily across clients
+        self._negotiate = lru_cache(maxsize=cache_size)(self._negotiate_uncached)
+
+    def _negotiate_uncached(self, header: str) -> str:
+        return negotiate_locale(header, self.supported, self.default)
+
+    def _supported(self, locale: Optional[str]) -> Optional[str]:
+        """Return the locale if supported, else None"""
+        return locale if locale in self.supported else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_language = ""
+        cookie_locale = None
+        for name, value in scope["headers"]:
+            if name == b"accept-language":
+                accept_language = value.decode("latin-1")
+            elif name == b"cookie":
+                # Lenient like Request.cookies: one malformed cookie must not hide the rest
+                cookie_locale = cookie_parser(value.decode("latin-1")).get(LOCALE_COOKIE, cookie_locale)
+
+        # Explicit ?lang= wins, then the remembered cookie, then the browser's preferences
+        query_locale = None
+        if scope.get("query_string"):
+            query_locale = parse_qs(scope["query_string"].decode("latin-1")).get("lang", [None])[0]
         locale = (
-            request.query_params.get('lang') or
-            request.headers.get('Accept-Language', 'en').split(',')[0].split('-')[0] or
-            request.cookies.get('ascend_locale', 'en')
+            self._supported(query_locale)
+            or self._supported(cookie_locale)
+            or self._negotiate(accept_language)
         )
-        
-        request.state.locale = locale
-        response = await call_next(request)
-        response.set_cookie("ascend_locale", locale, max_age=31536000)
-        return response
+        scope.setdefault("state", {})["locale"] = locale
+
+        if locale == cookie_locale:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{LOCALE_COOKIE}={locale}; Max-Age={LOCALE_COOKIE_MAX_AGE}; Path=/; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
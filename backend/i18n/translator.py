@@ -1,105 +1,83 @@
-import json
 import os
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Optional, Tuple
+from .catalog import MessageCatalog, load_catalog
 from .error_codes import ErrorCode
+from core.config import get_i18n_catalog_path
+
+LOCALES_DIR = os.path.join(os.path.dirname(__file__), '..', 'locales')
+# Built by scripts/compile_locales.py; locales/*.json are compiled in memory when it is missing
+DEFAULT_CATALOG_PATH = os.path.join(LOCALES_DIR, 'messages.catalog')
 
 class Translator:
     """Handles all server-side translations"""
-    
+
     _instance = None
-    _translations: Dict[str, Dict[str, Any]] = {}
-    
-    def __new__(cls):
+
+    FALLBACK_LOCALE = 'en'
+
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
         return cls._instance
-    
+
     def __init__(self, locale: str = "en"):
         if self._initialized:
             return
         self.locale = locale
-        self.translations = self._load_all_translations()
+        self._catalog: Optional[MessageCatalog] = None
+        # (locale, dotted key) -> bound str.format, for texts with placeholders that have been formatted
+        self._formatters: Dict[Tuple[str, str], Callable[..., str]] = {}
         self._initialized = True
-    
-    def _load_all_translations(self) -> Dict[str, Dict[str, Any]]:
-        """Load all translation files"""
-        translations = {}
-        locales_path = os.path.join(os.path.dirname(__file__), '..', 'locales')
-        
-        if os.path.exists(locales_path):
-            for locale_dir in os.listdir(locales_path):
-                locale_path = os.path.join(locales_path, locale_dir)
-                if os.path.isdir(locale_path):
-                    translations[locale_dir] = self._load_locale_translations(locale_dir)
-        
-        return translations
-    
-    def _load_locale_translations(self, locale: str) -> Dict[str, Any]:
-        """Load translation files for a specific locale"""
-        locale_translations = {}
-        locales_path = os.path.join(os.path.dirname(__file__), '..', 'locales', locale)
-        
-        if not os.path.exists(locales_path):
-            return {}
-        
-        for filename in os.listdir(locales_path):
-            if filename.endswith('.json'):
-                file_path = os.path.join(locales_path, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        locale_translations.update(json.load(f))
-                except Exception as e:
-                    print(f"Error loading {file_path}: {e}")
-        
-        return locale_translations
-    
+
+    @property
+    def catalog(self) -> MessageCatalog:
+        """Get the message catalog, opening it on first use"""
+        if self._catalog is None:
+            catalog_path = get_i18n_catalog_path() or DEFAULT_CATALOG_PATH
+            self._catalog = load_catalog(catalog_path, LOCALES_DIR, self.FALLBACK_LOCALE)
+        return self._catalog
+
     def get_error_message(self, error_code: str, locale: Optional[str] = None) -> str:
         """Get translated error message by code"""
-        if locale is None:
-            locale = self.locale
-        
-        # Fallback chain: requested locale -> English -> error code
-        for fallback_locale in [locale, 'en']:
-            if fallback_locale in self.translations:
-                errors = self.translations[fallback_locale].get('errors', {})
-                if error_code in errors:
-                    return errors[error_code]
-        
-        return f"Error: {error_code}"
-    
+        message = self._lookup("errors." + error_code, locale)
+        return message if message is not None else f"Error: {error_code}"
+
     def get(self, key: str, locale: Optional[str] = None, **kwargs) -> str:
         """Get translated string with variable substitution"""
-        if locale is None:
-            locale = self.locale
-        
-        # Fallback chain
-        for fallback_locale in [locale, 'en']:
-            if fallback_locale in self.translations:
-                text = self._get_nested_value(self.translations[fallback_locale], key)
-                if text:
-                    return text.format(**kwargs) if kwargs else text
-        
-        return key
-    
-    def _get_nested_value(self, obj: Dict, key: str) -> Optional[str]:
-        """Get nested dictionary value using dot notation"""
-        keys = key.split('.')
-        current = obj
-        
-        for k in keys:
-            if isinstance(current, dict) and k in current:
-                current = current[k]
-            else:
-                return None
-        
-        return current if isinstance(current, str) else None
-    
+        catalog = self._catalog or self.catalog
+        locale = locale or self.locale
+        if locale not in catalog:
+            locale = self.FALLBACK_LOCALE
+
+        if kwargs:
+            formatter = self._formatters.get((locale, key))
+            if formatter is not None:
+                return formatter(**kwargs)
+
+        # Fallback chain (requested locale -> English) is merged into the catalog
+        text = catalog.get(locale, key)
+        if text is None:
+            return key
+        if kwargs and ('{' in text or '}' in text):
+            formatter = self._formatters[(locale, key)] = text.format
+            return formatter(**kwargs)
+        return text
+
+    def _lookup(self, key: str, locale: Optional[str]) -> Optional[str]:
+        """Find a key's text, or None"""
+        catalog = self._catalog or self.catalog
+        # Fallback chain (requested locale -> English) is merged into the catalog
+        try:
+            return catalog.get(locale or self.locale, key)
+        except KeyError:
+            return catalog.get(self.FALLBACK_LOCALE, key)
+
     def set_locale(self, locale: str) -> None:
         """Change the current locale"""
-        if locale in self.translations:
+        if locale in self.catalog:
             self.locale = locale
-    
+
     def get_supported_locales(self) -> list:
         """Get list of supported locales"""
-        return list(self.translations.keys())
+        return list(self.catalog.locales)
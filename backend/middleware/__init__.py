@@ -1,10 +1,17 @@
 """Middleware package"""
 from .logging_middleware import LoggingMiddleware
-from .error_handler import validation_exception_handler, general_exception_handler, jwt_exception_handler
+from .error_handler import (
+    validation_exception_handler, general_exception_handler, jwt_exception_handler,
+    ErrorResponses, LogRateLimiter, get_error_responses, get_validation_log_limiter,
+)
 
 __all__ = [
     "LoggingMiddleware",
     "validation_exception_handler",
     "general_exception_handler",
     "jwt_exception_handler",
+    "ErrorResponses",
+    "LogRateLimiter",
+    "get_error_responses",
+    "get_validation_log_limiter",
 ]
@@ -1,12 +1,27 @@
+import json
 import logging
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
-from pydantic import ValidationError
 from jose import JWTError
+from i18n.error_codes import ErrorCode
+from i18n.locale_config import SUPPORTED_LOCALES, DEFAULT_LOCALE
+from core.config import get_validation_log_limit, get_validation_log_window
 
 logger = logging.getLogger(__name__)
 
+# error_type reported alongside each code, by code category
+ERROR_TYPES = {
+    "AUTH": "auth_error",
+    "VAL": "validation_error",
+    "RES": "resource_error",
+    "SRV": "internal_error",
+}
+
 
 class ErrorResponse:
     def __init__(self, status_code: int, detail: str, error_type: str = None):
@@ -15,38 +30,146 @@ class ErrorResponse:
         self.error_type = error_type or "error"
 
 
+class ErrorResponses:
+    """
+    Error bodies rendered once for every (ErrorCode, locale)
+
+    Unknown locales get the default locale's body.
+    """
+
+    def __init__(self, translator, locales: Iterable[str] = SUPPORTED_LOCALES, default: str = DEFAULT_LOCALE):
+        self.default = default
+        self._bodies: Dict[Tuple[ErrorCode, str], bytes] = {}
+        for code in ErrorCode:
+            for locale in {*locales, default}:
+                self._bodies[code, locale] = json.dumps({
+                    "detail": translator.get_error_message(code.value, locale),
+                    "error_code": code.value,
+                    "error_type": ERROR_TYPES[code.value.split("_")[0]],
+                }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def body(self, code: ErrorCode, locale: Optional[str]) -> Tuple[bytes, str]:
+        """Get the rendered body and the locale it is in"""
+        body = self._bodies.get((code, locale))
+        if body is None:
+            return self._bodies[code, self.default], self.default
+        return body, locale
+
+    def response(self, request: Request, code: ErrorCode, status_code: int, **fields) -> Response:
+        """
+        Build a JSON error response in the request's locale
+
+        Extra fields are appended to the pre-rendered body.
+        """
+        body, locale = self.body(code, getattr(request.state, "locale", None))
+        if fields:
+            extra = json.dumps(jsonable_encoder(fields), ensure_ascii=False, separators=(",", ":"))
+            body = body[:-1] + b"," + extra[1:].encode("utf-8")
+        return Response(body, status_code=status_code, media_type="application/json",
+                        headers={"Content-Language": locale})
+
+
+_error_responses: Optional[ErrorResponses] = None
+
+
+def get_error_responses() -> ErrorResponses:
+    """Get the error response table, building it on first use"""
+    global _error_responses
+    if _error_responses is None:
+        from i18n.translator import Translator
+        _error_responses = ErrorResponses(Translator())
+    return _error_responses
+
+
+class LogRateLimiter:
+    """
+    Fixed-window limit on log records per key
+
+    At most `limit` records per key are let through each `window` seconds;
+    the rest are counted and reported with the next record that gets through.
+    Only the `max_keys` most recently seen keys are tracked.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 4096):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> [window start, records allowed, records suppressed]
+        self._windows: "OrderedDict[Tuple, list]" = OrderedDict()
+
+    def allow(self, key: Tuple) -> Tuple[bool, int]:
+        """
+        Check whether a record for key may be logged
+
+        Returns:
+            tuple: (allowed, records suppressed since the last allowed one)
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None:
+                state = self._windows[key] = [now, 0, 0]
+                if len(self._windows) > self.max_keys:
+                    self._windows.popitem(last=False)
+            else:
+                self._windows.move_to_end(key)
+                if now - state[0] >= self.window:
+                    state[0], state[1] = now, 0
+
+            if state[1] >= self.limit:
+                state[2] += 1
+                return False, 0
+            state[1] += 1
+            suppressed, state[2] = state[2], 0
+            return True, suppressed
+
+
+# Validation errors logged per client and route in each window; the rest are counted
+_validation_log_limiter: Optional[LogRateLimiter] = None
+
+
+def get_validation_log_limiter() -> LogRateLimiter:
+    """Get the limiter for validation failure logs, creating it on first use"""
+    global _validation_log_limiter
+    if _validation_log_limiter is None:
+        _validation_log_limiter = LogRateLimiter(get_validation_log_limit(), get_validation_log_window())
+    return _validation_log_limiter
+
+
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors"""
-    logger.warning(f"Validation error on {request.url}: {exc.errors()}")
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "detail": "Validation error",
-            "errors": exc.errors()
-        }
+    errors = exc.errors()
+    client = request.client.host if request.client else None
+    allowed, suppressed = get_validation_log_limiter().allow((client, request.url.path))
+    if allowed:
+        # Only locations and error types: inputs may hold passwords or tokens
+        summary = ", ".join(f"{'.'.join(map(str, error['loc']))} ({error['type']})" for error in errors)
+        repeated = f" ({suppressed} similar suppressed)" if suppressed else ""
+        logger.warning(f"Validation error on {request.method} {request.url.path} from {client}: {summary}{repeated}")
+
+    if errors and all(error["type"] == "missing" for error in errors):
+        code = ErrorCode.VAL_MISSING_FIELD
+    else:
+        code = ErrorCode.VAL_INVALID_FORMAT
+    return get_error_responses().response(
+        request, code, status.HTTP_422_UNPROCESSABLE_ENTITY, errors=errors
     )
 
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
     logger.error(f"Unexpected error on {request.url}: {str(exc)}", exc_info=True)
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "detail": "Internal server error",
-            "error_type": "internal_error"
-        }
+    return get_error_responses().response(
+        request, ErrorCode.SRV_INTERNAL_ERROR, status.HTTP_500_INTERNAL_SERVER_ERROR
     )
 
 
 async def jwt_exception_handler(request: Request, exc: JWTError):
     """Handle JWT errors"""
     logger.warning(f"JWT error on {request.url}: {str(exc)}")
-    return JSONResponse(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        content={
-            "detail": "Invalid or expired token",
-            "error_type": "jwt_error"
-        },
-        headers={"WWW-Authenticate": "Bearer"}
+    response = get_error_responses().response(
+        request, ErrorCode.AUTH_INVALID_TOKEN, status.HTTP_401_UNAUTHORIZED
     )
+    response.headers["WWW-Authenticate"] = "Bearer"
+    return response
@@ -1,40 +1,62 @@
+import itertools
 import logging
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests and responses"""
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Log request
-        request_id = request.headers.get("X-Request-ID", "N/A")
-        logger.info(
-            f"[{request_id}] {request.method} {request.url.path} - "
-            f"Client: {request.client.host if request.client else 'unknown'}"
-        )
-        
-        start_time = time.time()
-        
+class LoggingMiddleware:
+    """ASGI middleware for logging HTTP requests and responses"""
+
+    def __init__(self, app: ASGIApp, sample_rate: int = 1):
+        self.app = app
+        # Log 1 in `sample_rate` successful requests; errors are always logged
+        self.sample_rate = max(1, sample_rate)
+        self._counter = itertools.count()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = "N/A"
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add custom headers
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", str(time.perf_counter() - start_time))
+                headers.append("X-Request-ID", request_id)
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            logger.error(f"[{request_id}] Request failed with exception: {str(e)}", exc_info=True)
+            logger.error("[%s] Request failed with exception: %s", request_id, e, exc_info=True)
             raise
-        
-        # Log response
-        process_time = time.time() - start_time
-        logger.info(
-            f"[{request_id}] {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - Duration: {process_time:.3f}s"
-        )
-        
-        # Add custom headers
-        response.headers["X-Process-Time"] = str(process_time)
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
+
+        # Log response once the body has been sent
+        if status_code < 400 and next(self._counter) % self.sample_rate:
+            return
+        if logger.isEnabledFor(logging.INFO):
+            client = scope.get("client")
+            logger.info(
+                "[%s] %s %s - Client: %s - Status: %d - Duration: %.3fs",
+                request_id,
+                scope["method"],
+                scope["path"],
+                client[0] if client else "unknown",
+                status_code,
+                time.perf_counter() - start_time,
+            )
@@ -9,6 +9,11 @@ from .schemas import (
     StatusCheckCreate,
     StatusCheck,
     TokenType,
+    DiagramType,
+    DiagramCreate,
+    DiagramSummary,
+    Diagram,
+    DiagramPatchResult,
 )
 
 __all__ = [
@@ -21,4 +26,9 @@ __all__ = [
     "StatusCheckCreate",
     "StatusCheck",
     "TokenType",
+    "DiagramType",
+    "DiagramCreate",
+    "DiagramSummary",
+    "Diagram",
+    "DiagramPatchResult",
 ]
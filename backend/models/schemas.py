@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr, validator
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Dict, Optional, List
+from datetime import datetime, timezone
 from enum import Enum
 
 
@@ -75,7 +75,52 @@ class StatusCheckCreate(BaseModel):
 class StatusCheck(BaseModel):
     id: str = Field(default_factory=lambda: str(__import__('uuid').uuid4()))
     client_name: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(__import__('timezone').utc))
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     class Config:
         extra = "ignore"
+
+
+class DiagramType(str, Enum):
+    CLASS = "class"
+    SEQUENCE = "sequence"
+    USECASE = "usecase"
+
+
+class DiagramCreate(BaseModel):
+    name: str
+    type: DiagramType
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, Any]] = []
+    viewport: Optional[Dict[str, Any]] = None
+
+    @validator('name')
+    def name_not_empty(cls, v):
+        if not v or not v.strip():
+            raise ValueError('Diagram name cannot be empty')
+        return v.strip()
+
+
+class DiagramSummary(BaseModel):
+    id: str
+    project_id: str
+    name: str
+    type: DiagramType
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        extra = "ignore"
+
+
+class Diagram(DiagramSummary):
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, Any]] = []
+    viewport: Optional[Dict[str, Any]] = None
+
+
+class DiagramPatchResult(BaseModel):
+    id: str
+    version: int
+    updated_at: datetime
@@ -1,4 +1,4 @@
 """Routes package"""
-from . import auth, status, health
+from . import auth, status, health, jwks, branding, i18n, diagrams
 
-__all__ = ["auth", "status", "health"]
+__all__ = ["auth", "status", "health", "jwks", "branding", "i18n", "diagrams"]
@@ -1,27 +1,34 @@
-from fastapi import APIRouter
-from ..core.branding import get_branding
+from fastapi import APIRouter, Request, Response
+from core.branding import get_branding
+from core.static_payload import StaticPayload
 
 router = APIRouter(prefix="/api/branding", tags=["branding"])
 
+# Branding only changes on deploy, so each response is serialized and compressed once
+_branding = get_branding()
+BRANDING_PAYLOADS = {
+    "config": StaticPayload(_branding),
+    "colors": StaticPayload({"colors": _branding["colors"]}),
+    "links": StaticPayload({"links": _branding["links"]}),
+    "social": StaticPayload({"social": _branding["social"]}),
+}
+
 @router.get("/config")
-async def get_branding_config():
+async def get_branding_config(request: Request) -> Response:
     """Get branding configuration"""
-    return get_branding()
+    return BRANDING_PAYLOADS["config"].response(request)
 
 @router.get("/colors")
-async def get_colors():
+async def get_colors(request: Request) -> Response:
     """Get color palette"""
-    branding = get_branding()
-    return {"colors": branding["colors"]}
+    return BRANDING_PAYLOADS["colors"].response(request)
 
 @router.get("/links")
-async def get_links():
+async def get_links(request: Request) -> Response:
     """Get important links"""
-    branding = get_branding()
-    return {"links": branding["links"]}
+    return BRANDING_PAYLOADS["links"].response(request)
 
 @router.get("/social")
-async def get_social():
+async def get_social(request: Request) -> Response:
     """Get social media links"""
-    branding = get_branding()
-    return {"social": branding["social"]}
+    return BRANDING_PAYLOADS["social"].response(request)
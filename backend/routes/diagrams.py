@@ -0,0 +1,208 @@
+"""
+Diagram routes: stored React Flow graphs, saved incrementally with JSON Patch
+"""
+import logging
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from models.schemas import Diagram, DiagramCreate, DiagramPatchResult, DiagramSummary, TokenData
+from db.repositories import DiagramRepository, VersionConflictError
+from db.json_patch import JsonPatchError, JsonPatchTestFailed
+from core.dependencies import get_current_user, get_diagram_repo
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/projects/{project_id}/diagrams", tags=["diagrams"])
+
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+MAX_PAGE_SIZE = 100
+
+
+def _to_diagram(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Expose the MongoDB _id as the diagram id"""
+    doc["id"] = str(doc.pop("_id"))
+    return doc
+
+
+def _etag(version: int) -> str:
+    """Get the ETag for a diagram version"""
+    return f'"{version}"'
+
+
+def _parse_if_match(if_match: Optional[str]) -> int:
+    """Read the diagram version a client's edit is based on"""
+    if if_match is None:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match with the diagram's ETag is required"
+        )
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be a diagram ETag"
+        )
+
+
+@router.get("/", response_model=List[DiagramSummary])
+async def list_diagrams(
+    project_id: str,
+    response: Response,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    current_user: TokenData = Depends(get_current_user),
+    diagram_repo: DiagramRepository = Depends(get_diagram_repo)
+):
+    """
+    List a project's diagrams, most recently updated first
+
+    Args:
+        project_id: Project the diagrams belong to
+        limit: Page size
+        after: Cursor from a previous page's X-Next-Cursor header
+        current_user: Authenticated user
+        diagram_repo: Diagram repository
+
+    Returns:
+        List[DiagramSummary]: One page of diagrams without their nodes and edges
+    """
+    try:
+        position = diagram_repo.decode_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    diagrams = await diagram_repo.find_by_project(project_id, current_user.email, limit, position)
+    if len(diagrams) == limit:
+        response.headers["X-Next-Cursor"] = diagram_repo.encode_cursor(diagrams[-1])
+    return [_to_diagram(doc) for doc in diagrams]
+
+
+@router.post("/", response_model=Diagram, status_code=status.HTTP_201_CREATED)
+async def create_diagram(
+    project_id: str,
+    input: DiagramCreate,
+    response: Response,
+    current_user: TokenData = Depends(get_current_user),
+    diagram_repo: DiagramRepository = Depends(get_diagram_repo)
+):
+    """
+    Create a diagram
+
+    Args:
+        project_id: Project the diagram belongs to
+        input: Diagram name, type and initial graph
+        response: Response carrying the ETag
+        current_user: Authenticated user
+        diagram_repo: Diagram repository
+
+    Returns:
+        Diagram: Created diagram at version 1
+    """
+    diagram = await diagram_repo.create(
+        project_id, current_user.email, input.name, input.type.value, input.nodes, input.edges, input.viewport
+    )
+    response.headers["ETag"] = _etag(diagram["version"])
+    return _to_diagram(diagram)
+
+
+@router.get("/{diagram_id}", response_model=Diagram)
+async def get_diagram(
+    project_id: str,
+    diagram_id: str,
+    response: Response,
+    current_user: TokenData = Depends(get_current_user),
+    diagram_repo: DiagramRepository = Depends(get_diagram_repo)
+):
+    """
+    Get a diagram with its nodes and edges
+
+    Args:
+        project_id: Project the diagram belongs to
+        diagram_id: Diagram id
+        response: Response carrying the ETag
+        current_user: Authenticated user
+        diagram_repo: Diagram repository
+
+    Returns:
+        Diagram: The stored diagram; its ETag is the version to send in If-Match
+    """
+    diagram = await diagram_repo.find_by_id(project_id, diagram_id, current_user.email)
+    if diagram is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Diagram not found")
+    response.headers["ETag"] = _etag(diagram["version"])
+    return _to_diagram(diagram)
+
+
+@router.patch("/{diagram_id}", response_model=DiagramPatchResult)
+async def patch_diagram(
+    project_id: str,
+    diagram_id: str,
+    response: Response,
+    patch: List[Dict[str, Any]] = Body(..., media_type=JSON_PATCH_MEDIA_TYPE),
+    if_match: Optional[str] = Header(None),
+    current_user: TokenData = Depends(get_current_user),
+    diagram_repo: DiagramRepository = Depends(get_diagram_repo)
+):
+    """
+    Save changes to a diagram as an RFC 6902 JSON Patch
+
+    The patch applies to the diagram's name, type, nodes, edges and viewport,
+    e.g. [{"op": "replace", "path": "/nodes/3/position", "value": {"x": 10, "y": 20}}].
+
+    Args:
+        project_id: Project the diagram belongs to
+        diagram_id: Diagram id
+        response: Response carrying the new ETag
+        patch: JSON Patch operations
+        if_match: ETag of the version the changes are based on
+        current_user: Authenticated user
+        diagram_repo: Diagram repository
+
+    Returns:
+        DiagramPatchResult: New version of the diagram
+    """
+    expected_version = _parse_if_match(if_match)
+    try:
+        result = await diagram_repo.apply_patch(
+            project_id, diagram_id, current_user.email, patch, expected_version
+        )
+    except VersionConflictError as e:
+        headers = {"ETag": _etag(e.current_version)} if e.current_version is not None else None
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Diagram was changed by another save; reload and retry",
+            headers=headers
+        )
+    except JsonPatchTestFailed as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except JsonPatchError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Diagram not found")
+    response.headers["ETag"] = _etag(result["version"])
+    return _to_diagram(result)
+
+
+@router.delete("/{diagram_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_diagram(
+    project_id: str,
+    diagram_id: str,
+    current_user: TokenData = Depends(get_current_user),
+    diagram_repo: DiagramRepository = Depends(get_diagram_repo)
+):
+    """
+    Delete a diagram
+
+    Args:
+        project_id: Project the diagram belongs to
+        diagram_id: Diagram id
+        current_user: Authenticated user
+        diagram_repo: Diagram repository
+    """
+    if not await diagram_repo.delete(project_id, diagram_id, current_user.email):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Diagram not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
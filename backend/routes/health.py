@@ -1,7 +1,9 @@
 """
 Health check routes
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, status
+from core.dependencies import get_readiness_probe
+from db.health import ReadinessProbe
 
 router = APIRouter(tags=["health"])
 
@@ -15,3 +17,32 @@ async def health_check():
         dict: Health status
     """
     return {"status": "healthy", "message": "API is running"}
+
+
+@router.get("/health/live")
+async def liveness_check():
+    """
+    Liveness probe; never touches dependencies
+    
+    Returns:
+        dict: Liveness status
+    """
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness_check(response: Response, probe: ReadinessProbe = Depends(get_readiness_probe)):
+    """
+    Readiness probe backed by a cached MongoDB ping and pool stats
+    
+    Args:
+        response: Response, set to 503 when not ready
+        probe: MongoDB readiness probe
+    
+    Returns:
+        dict: Readiness, last ping latency and connection pool usage
+    """
+    result = await probe.check()
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if result["ready"] else "unavailable", **result}
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from ..i18n.translator import Translator
-from ..i18n.locale_config import SUPPORTED_LOCALES
-from ..core.dependencies import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from i18n.translator import Translator
+from i18n.locale_config import SUPPORTED_LOCALES, DEFAULT_LOCALE
+from core.dependencies import get_current_user
+from core.static_payload import StaticPayload
 
 router = APIRouter(prefix="/api/i18n", tags=["i18n"])
 
+# Supported locales only change on deploy
+SUPPORTED_LANGUAGES_PAYLOAD = StaticPayload({"languages": SUPPORTED_LOCALES})
+
 @router.post("/language")
 async def set_user_language(
     language: str,
@@ -17,11 +21,11 @@ async def set_user_language(
     return {"language": language}
 
 @router.get("/language")
-async def get_user_language(current_user = Depends(get_current_user)):
-    """Get user's preferred language"""
-    return {"language": current_user.get("language", "en")}
+async def get_user_language(request: Request, current_user = Depends(get_current_user)):
+    """Get user's preferred language, as negotiated by LocaleMiddleware"""
+    return {"language": getattr(request.state, "locale", DEFAULT_LOCALE)}
 
 @router.get("/supported-languages")
-async def get_supported_languages():
+async def get_supported_languages(request: Request) -> Response:
     """Get list of supported languages"""
-    return {"languages": SUPPORTED_LOCALES}
+    return SUPPORTED_LANGUAGES_PAYLOAD.response(request)
@@ -0,0 +1,22 @@
+"""
+Public signing keys for verifying tokens issued by this API
+"""
+from fastapi import APIRouter, Response
+from services.keyring import get_keyring
+
+router = APIRouter(tags=["authentication"])
+
+
+@router.get("/.well-known/jwks.json")
+async def get_jwks(response: Response):
+    """
+    Get the JSON Web Key Set of token signing keys
+    
+    Sibling services use these keys to verify access tokens locally.
+    Empty when tokens are signed with a shared HMAC secret.
+    
+    Returns:
+        dict: JWK Set with one public key per kid
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_keyring().jwks()
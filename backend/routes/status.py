@@ -1,9 +1,13 @@
 """
 Status check routes for monitoring
 """
+import json
 import logging
-from fastapi import APIRouter, Depends
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional
 from models.schemas import StatusCheck, StatusCheckCreate
 from db.repositories import StatusCheckRepository
 from core.dependencies import get_status_repo
@@ -12,18 +16,108 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/status", tags=["status"])
 
+MAX_PAGE_SIZE = 1000
+MAX_BULK_SIZE = 10000
+# Bulk bodies are read up to this size; MAX_BULK_SIZE typical records fit well within it
+MAX_BULK_BODY_BYTES = 4 * 1024 * 1024
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _to_status_check(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Expose the MongoDB _id as the status check id"""
+    object_id = doc.pop("_id")
+    doc.setdefault("id", str(object_id))
+    return doc
+
+
+def _json_default(value: Any) -> str:
+    """Serialize values json.dumps cannot handle natively"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _parse_bulk_body(body: bytes, content_type: str) -> List[StatusCheckCreate]:
+    """Parse a JSON array or NDJSON body into validated status checks"""
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        # Lines are counted before any of them is decoded
+        lines = [line for line in body.splitlines() if line.strip()]
+        if len(lines) > MAX_BULK_SIZE:
+            raise ValueError(f"At most {MAX_BULK_SIZE} status checks per request")
+        items = [json.loads(line) for line in lines]
+    else:
+        items = json.loads(body)
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array of status checks")
+    if len(items) > MAX_BULK_SIZE:
+        raise ValueError(f"At most {MAX_BULK_SIZE} status checks per request")
+    return [StatusCheckCreate(**item) for item in items]
+
+
+async def _read_bulk_body(request: Request) -> bytes:
+    """Read a bulk request body, refusing it once it exceeds MAX_BULK_BODY_BYTES"""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Bulk request bodies are limited to {MAX_BULK_BODY_BYTES} bytes"
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BULK_BODY_BYTES:
+        raise too_large
+
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BULK_BODY_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _ndjson_lines(cursor) -> AsyncIterator[str]:
+    """Write one JSON line per document as the cursor yields it"""
+    async for doc in cursor:
+        yield json.dumps(_to_status_check(doc), default=_json_default) + "\n"
+
 
 @router.get("/", response_model=List[StatusCheck])
-async def get_status_checks(status_repo: StatusCheckRepository = Depends(get_status_repo)):
+async def get_status_checks(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    output: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    status_repo: StatusCheckRepository = Depends(get_status_repo)
+):
     """
-    Get all status checks
+    Get status checks, newest first
+    
+    Args:
+        limit: Page size (JSON defaults to 1000; NDJSON streams everything when omitted)
+        after: Cursor from a previous page's X-Next-Cursor header
+        output: "json" for a page as an array, "ndjson" to stream one record per line
+        status_repo: Status check repository
     
     Returns:
-        List[StatusCheck]: List of all status check records
+        List[StatusCheck]: One page of status check records
     """
     try:
-        status_checks = await status_repo.find_all()
-        return status_checks
+        position = status_repo.decode_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    
+    try:
+        if output == "ndjson":
+            cursor = status_repo.stream(after=position, limit=limit or 0)
+            return StreamingResponse(_ndjson_lines(cursor), media_type=NDJSON_MEDIA_TYPE)
+        
+        page_size = limit or MAX_PAGE_SIZE
+        status_checks = await status_repo.find_page(page_size, position)
+        if len(status_checks) == page_size:
+            response.headers["X-Next-Cursor"] = status_repo.encode_cursor(status_checks[-1])
+        return [_to_status_check(doc) for doc in status_checks]
     except Exception as e:
         logger.error(f"Error fetching status checks: {e}")
         raise
@@ -46,7 +140,42 @@ async def create_status_check(
     """
     try:
         status_check = await status_repo.create(input.client_name)
-        return status_check
+        return _to_status_check(status_check)
     except Exception as e:
         logger.error(f"Error creating status check: {e}")
         raise
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def create_status_checks_bulk(
+    request: Request,
+    status_repo: StatusCheckRepository = Depends(get_status_repo)
+):
+    """
+    Create many status check records in one write
+    
+    Accepts a JSON array of StatusCheckCreate objects, or one object per
+    line with Content-Type application/x-ndjson. Bodies over
+    MAX_BULK_BODY_BYTES are refused with 413 before they are parsed.
+    
+    Args:
+        request: Raw request carrying the batch
+        status_repo: Status check repository
+    
+    Returns:
+        dict: Number of records inserted
+    """
+    try:
+        items = _parse_bulk_body(await _read_bulk_body(request), request.headers.get("content-type", ""))
+    except (ValueError, TypeError, ValidationError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid status check batch: {e}"
+        )
+    
+    try:
+        created = await status_repo.create_many([item.client_name for item in items])
+        return {"inserted": len(created)}
+    except Exception as e:
+        logger.error(f"Error creating status checks in bulk: {e}")
+        raise
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Index Audit Script
+Runs explain() on every repository query and fails on collection scans
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from core.config import get_database_url, get_database_name
+from db.indexes import ensure_indexes, audit_query_plans, find_collection_scans
+
+
+async def run(args) -> int:
+    client = AsyncIOMotorClient(args.mongo_url, tz_aware=True)
+    db = client[args.db_name]
+    try:
+        if args.ensure:
+            print("🔧 Ensuring indexes...\n")
+            await ensure_indexes(db)
+
+        print("🔍 Auditing repository query plans...\n")
+        plans = await audit_query_plans(db)
+        for name, stages in plans.items():
+            print(f"  {name}: {' → '.join(stages)}")
+
+        scans = find_collection_scans(plans)
+        if scans:
+            print(f"\n✗ {len(scans)} queries use a COLLSCAN:")
+            for name in scans:
+                print(f"  {name}")
+            return 1
+
+        print("\n✓ All repository queries use an index")
+        return 0
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit MongoDB query plans')
+    parser.add_argument('--ensure', action='store_true', help='Create indexes before auditing')
+    parser.add_argument('--mongo-url', default=get_database_url(), help='MongoDB connection URL')
+    parser.add_argument('--db-name', default=get_database_name(), help='Database name')
+
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Locale Compilation Script
+Compiles locales/*/*.json into the binary catalog the Translator maps at runtime
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from i18n.catalog import MessageCatalog, compile_catalog
+from i18n.translator import DEFAULT_CATALOG_PATH, LOCALES_DIR, Translator
+from core.config import get_i18n_catalog_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile translation catalog')
+    parser.add_argument('--locales-dir', default=LOCALES_DIR, help='Directory of <locale>/*.json files')
+    parser.add_argument('--output', default=get_i18n_catalog_path() or DEFAULT_CATALOG_PATH, help='Catalog file to write')
+    args = parser.parse_args()
+
+    print(f"🌐 Compiling {Path(args.locales_dir).resolve()}...\n")
+    size = compile_catalog(args.locales_dir, args.output, Translator.FALLBACK_LOCALE)
+
+    catalog = MessageCatalog.open(args.output)
+    print(f"  locales: {', '.join(catalog.locales)}")
+    print(f"  keys:    {len(catalog.keys())}")
+    print(f"\n✓ Wrote {size:,} bytes to {Path(args.output).resolve()}")
+
+
+if __name__ == '__main__':
+    main()
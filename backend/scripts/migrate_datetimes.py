@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Datetime Migration Script
+Converts ISO-8601 string timestamps to native BSON dates
+"""
+
+import sys
+import asyncio
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from core.config import get_database_url, get_database_name
+
+# Date fields written by the repositories, per collection
+DATE_FIELDS: Dict[str, List[str]] = {
+    'status_checks': ['timestamp'],
+    'users': ['created_at', 'updated_at'],
+    'refresh_tokens': ['expires_at', 'created_at'],
+}
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 string, treating naive values as UTC"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def convert_fields(doc: Dict[str, Any], fields: List[str]) -> Dict[str, datetime]:
+    """Get the $set payload converting a document's string date fields"""
+    converted = {}
+    for field in fields:
+        value = doc.get(field)
+        if isinstance(value, str):
+            try:
+                converted[field] = parse_timestamp(value)
+            except ValueError:
+                print(f"  Skipping unparseable {field}={value!r} on {doc['_id']}")
+    return converted
+
+
+async def migrate_collection(collection, fields: List[str], batch_size: int, dry_run: bool) -> int:
+    """Convert one collection in batches and return the number of documents updated"""
+    query = {'$or': [{field: {'$type': 'string'}} for field in fields]}
+    projection = {field: 1 for field in fields}
+    cursor = collection.find(query, projection).batch_size(batch_size)
+
+    migrated = 0
+    batch = []
+    async for doc in cursor:
+        converted = convert_fields(doc, fields)
+        if converted:
+            batch.append(UpdateOne({'_id': doc['_id']}, {'$set': converted}))
+        if len(batch) >= batch_size:
+            if not dry_run:
+                await collection.bulk_write(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+
+    if batch:
+        if not dry_run:
+            await collection.bulk_write(batch, ordered=False)
+        migrated += len(batch)
+
+    return migrated
+
+
+async def run(args) -> None:
+    client = AsyncIOMotorClient(args.mongo_url, tz_aware=True)
+    db = client[args.db_name]
+    dry_run = not args.execute
+    try:
+        print("🕒 Converting string timestamps to BSON dates...\n")
+        for collection_name, fields in DATE_FIELDS.items():
+            migrated = await migrate_collection(db[collection_name], fields, args.batch_size, dry_run)
+            mode = "would convert" if dry_run else "converted"
+            print(f"  {collection_name}: {mode} {migrated} documents")
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert string timestamps to BSON dates')
+    parser.add_argument('--execute', action='store_true', help='Execute changes (default is a dry run)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Documents per bulk write')
+    parser.add_argument('--mongo-url', default=get_database_url(), help='MongoDB connection URL')
+    parser.add_argument('--db-name', default=get_database_name(), help='Database name')
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
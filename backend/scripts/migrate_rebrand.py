@@ -6,6 +6,7 @@ Automates the migration from ZenUML to Ascend
 
 import sys
 import argparse
+import subprocess
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -13,6 +14,67 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.rebrand_scanner import RebrandScanner
 from utils.string_replacer import StringReplacer
 from utils.env_migrator import EnvironmentMigrator
+from utils.file_scan import DEFAULT_MAX_FILE_SIZE
+from utils.scan_manifest import ScanManifest
+from utils.report_writers import REPORT_WRITERS, create_report_writer
+
+DEFAULT_MANIFEST = '.rebrand-manifest.sqlite'
+
+def changed_files_since(root: str, ref: str) -> list:
+    """Get files under root changed since a git ref, including uncommitted and untracked ones"""
+    def git(*args):
+        result = subprocess.run(
+            ['git', *args], cwd=root, capture_output=True, text=True, check=True
+        )
+        return [line for line in result.stdout.splitlines() if line]
+    
+    changed = git('diff', '--name-only', '--relative', ref, '--')
+    untracked = git('ls-files', '--others', '--exclude-standard')
+    return sorted(set(changed) | set(untracked))
+
+def write_report(args, output, log, dry_run: bool):
+    """Run --scan and/or --replace, streaming the report to output"""
+    writer = create_report_writer(args.format, output, StringReplacer.REPLACEMENTS)
+    
+    if args.scan:
+        log("🔍 Scanning for old identifiers...\n")
+        scanner = RebrandScanner(args.root, workers=args.workers, max_file_size=args.max_file_size)
+        paths = None
+        if args.since:
+            try:
+                paths = changed_files_since(args.root, args.since)
+            except subprocess.CalledProcessError as e:
+                log(f"❌ git diff against {args.since} failed: {e.stderr.strip()}")
+                sys.exit(1)
+            log(f"Scanning {len(paths)} files changed since {args.since}")
+        
+        manifest = None
+        if args.manifest:
+            manifest_path = Path(args.manifest)
+            if not manifest_path.is_absolute():
+                manifest_path = Path(args.root) / manifest_path
+            manifest = ScanManifest(str(manifest_path), scanner.fingerprint())
+        
+        try:
+            for match in scanner.iter_scan(paths, manifest):
+                writer.write_match(match)
+        finally:
+            if manifest is not None:
+                manifest.close()
+        writer.summary.files += sum(scanner.stats.values())
+        
+        if manifest is not None:
+            stats = scanner.stats
+            log(f"Manifest: {stats['cached']} unchanged, {stats['rehashed']} rehashed, {stats['scanned']} scanned")
+    
+    if args.replace:
+        log("🔄 Replacing old identifiers...\n")
+        replacer = StringReplacer(args.root, dry_run=dry_run, max_file_size=args.max_file_size, workers=args.workers)
+        for change in replacer.iter_replace():
+            writer.write_change(change)
+        writer.summary.files += replacer.files_processed
+    
+    writer.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Ascend Rebrand Migration')
@@ -23,30 +85,37 @@ def main():
     parser.add_argument('--execute', action='store_true', help='Execute changes (disable dry-run)')
     parser.add_argument('--root', default='.', help='Root directory to scan')
     parser.add_argument('--env-file', default='.env', help='Path to .env file')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE, help='Skip files larger than this many bytes')
+    parser.add_argument('--manifest', nargs='?', const=DEFAULT_MANIFEST, default=None,
+                        help=f'Reuse results for unchanged files from this manifest (default: {DEFAULT_MANIFEST} under --root)')
+    parser.add_argument('--since', metavar='GIT_REF', help='Only scan files changed since this git ref')
+    parser.add_argument('--format', choices=sorted(REPORT_WRITERS), default='text', help='Report format (default: text)')
+    parser.add_argument('--output', help='Write the report to this file instead of stdout')
+    parser.add_argument('--workers', type=int, default=None, help='Scan/replace worker processes (default: CPU count)')
     
     args = parser.parse_args()
     
     dry_run = not args.execute
+    # Keep stdout machine-readable: progress messages go to stderr unless writing text there
+    log_stream = sys.stdout if args.format == 'text' and args.output is None else sys.stderr
     
-    if args.scan:
-        print("🔍 Scanning for old identifiers...\n")
-        scanner = RebrandScanner(args.root)
-        scanner.scan()
-        print(scanner.report())
+    def log(message: str = ''):
+        print(message, file=log_stream, flush=True)
     
-    if args.replace:
-        print("🔄 Replacing old identifiers...\n")
-        replacer = StringReplacer(args.root, dry_run=dry_run)
-        replacer.replace_all()
-        print(replacer.report())
+    if args.scan or args.replace:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as output:
+                write_report(args, output, log, dry_run)
+        else:
+            write_report(args, sys.stdout, log, dry_run)
     
     if args.migrate_env:
-        print("🔐 Migrating environment variables...\n")
+        log("🔐 Migrating environment variables...\n")
         result = EnvironmentMigrator.migrate_env_file(args.env_file, dry_run=dry_run)
-        print(f"Status: {result['status']}")
+        log(f"Status: {result['status']}")
         if 'migrated' in result:
             for old, new in result['migrated'].items():
-                print(f"  {old} → {new}")
+                log(f"  {old} → {new}")
     
     if not any([args.scan, args.replace, args.migrate_env]):
         print("Use --scan, --replace, or --migrate-env")
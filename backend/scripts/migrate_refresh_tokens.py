@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Refresh Token Migration Script
+Replaces raw refresh token strings with their SHA-256 lookup keys
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from core.config import get_database_url, get_database_name
+from db.repositories import hash_token
+from db.indexes import ensure_indexes, drop_legacy_indexes
+
+
+async def migrate(db, batch_size: int, dry_run: bool) -> int:
+    """Hash every legacy token document in batches and return the count"""
+    collection = db.refresh_tokens
+    cursor = collection.find({"token": {"$exists": True}}, {"token": 1}).batch_size(batch_size)
+
+    migrated = 0
+    batch = []
+    async for doc in cursor:
+        batch.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"token_hash": hash_token(doc["token"])}, "$unset": {"token": ""}}
+        ))
+        if len(batch) >= batch_size:
+            if not dry_run:
+                await collection.bulk_write(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+
+    if batch:
+        if not dry_run:
+            await collection.bulk_write(batch, ordered=False)
+        migrated += len(batch)
+
+    return migrated
+
+
+async def run(args) -> None:
+    client = AsyncIOMotorClient(args.mongo_url, tz_aware=True)
+    db = client[args.db_name]
+    dry_run = not args.execute
+    try:
+        if not dry_run:
+            # The old unique index on the raw token would reject every unset token after the first
+            dropped = await drop_legacy_indexes(db)
+            if dropped:
+                print(f"Dropped legacy indexes: {', '.join(dropped)}")
+
+        print("🔐 Hashing stored refresh tokens...\n")
+        migrated = await migrate(db, args.batch_size, dry_run)
+        mode = "Would migrate" if dry_run else "Migrated"
+        print(f"{mode} {migrated} refresh tokens")
+
+        if not dry_run:
+            # Builds the unique index on token_hash now that every document has one
+            await ensure_indexes(db)
+            print("Indexes updated")
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hash stored refresh tokens')
+    parser.add_argument('--execute', action='store_true', help='Execute changes (default is a dry run)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Documents per bulk write')
+    parser.add_argument('--mongo-url', default=get_database_url(), help='MongoDB connection URL')
+    parser.add_argument('--db-name', default=get_database_name(), help='Database name')
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
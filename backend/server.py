@@ -14,6 +14,7 @@ from typing import List, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
 from auth import create_access_token, get_google_auth_url, get_current_user, TokenData
+from core.http import create_http_client
 
 
 ROOT_DIR = Path(__file__).parent
@@ -24,9 +25,12 @@ load_dotenv()
 
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ.get('DB_NAME', 'zenuml')]
 
+# Shared, connection-pooled client for Google OAuth (created on startup)
+http_client: Optional[httpx.AsyncClient] = None
+
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -62,9 +66,8 @@ async def create_status_check(input: StatusCheckCreate):
     status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
     
-    # Convert to dict and serialize datetime to ISO string for MongoDB
+    # Timestamps are stored as native BSON dates
     doc = status_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
     
     _ = await db.status_checks.insert_one(doc)
     return status_obj
@@ -73,12 +76,6 @@ async def create_status_check(input: StatusCheckCreate):
 async def get_status_checks():
     # Exclude MongoDB's _id field from the query results
     status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
-    
-    # Convert ISO string timestamps back to datetime objects
-    for check in status_checks:
-        if isinstance(check['timestamp'], str):
-            check['timestamp'] = datetime.fromisoformat(check['timestamp'])
-    
     return status_checks
 
 # Google OAuth endpoints
@@ -91,63 +88,62 @@ async def login_google():
 async def auth_google_callback(code: str):
     token_url = "https://oauth2.googleapis.com/token"
     
-    async with httpx.AsyncClient() as client:
-        # Exchange authorization code for tokens
-        token_response = await client.post(
-            token_url,
-            data={
-                'code': code,
-                'client_id': os.getenv('GOOGLE_CLIENT_ID'),
-                'client_secret': os.getenv('GOOGLE_CLIENT_SECRET'),
-                'redirect_uri': os.getenv('GOOGLE_REDIRECT_URI'),
-                'grant_type': 'authorization_code',
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-        
-        tokens = token_response.json()
-        if token_response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
-        
-        # Get user info
-        userinfo_url = "https://www.googleapis.com/oauth2/v3/userinfo"
-        userinfo_response = await client.get(
-            userinfo_url,
-            headers={"Authorization": f"Bearer {tokens['access_token']}"}
-        )
-        
-        user_info = userinfo_response.json()
-        
-        # Create or update user in database
-        user = await db.users.find_one({"email": user_info["email"]})
-        if not user:
-            user = {
-                "email": user_info["email"],
-                "name": user_info.get("name", ""),
-                "picture": user_info.get("picture", ""),
-                "created_at": datetime.now(timezone.utc).isoformat(),
-            }
-            await db.users.insert_one(user)
-        
-        # Create JWT token
-        access_token_expires = timedelta(minutes=30)
-        access_token = create_access_token(
-            data={"sub": user_info["email"]},
-            expires_delta=access_token_expires
+    # Exchange authorization code for tokens
+    token_response = await http_client.post(
+        token_url,
+        data={
+            'code': code,
+            'client_id': os.getenv('GOOGLE_CLIENT_ID'),
+            'client_secret': os.getenv('GOOGLE_CLIENT_SECRET'),
+            'redirect_uri': os.getenv('GOOGLE_REDIRECT_URI'),
+            'grant_type': 'authorization_code',
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    
+    tokens = token_response.json()
+    if token_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
         )
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "email": user_info["email"],
-                "name": user_info.get("name", ""),
-                "picture": user_info.get("picture", "")
-            }
+    
+    # Get user info
+    userinfo_url = "https://www.googleapis.com/oauth2/v3/userinfo"
+    userinfo_response = await http_client.get(
+        userinfo_url,
+        headers={"Authorization": f"Bearer {tokens['access_token']}"}
+    )
+    
+    user_info = userinfo_response.json()
+    
+    # Create or update user in database
+    user = await db.users.find_one({"email": user_info["email"]})
+    if not user:
+        user = {
+            "email": user_info["email"],
+            "name": user_info.get("name", ""),
+            "picture": user_info.get("picture", ""),
+            "created_at": datetime.now(timezone.utc),
+        }
+        await db.users.insert_one(user)
+    
+    # Create JWT token
+    access_token_expires = timedelta(minutes=30)
+    access_token = create_access_token(
+        data={"sub": user_info["email"]},
+        expires_delta=access_token_expires
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": {
+            "email": user_info["email"],
+            "name": user_info.get("name", ""),
+            "picture": user_info.get("picture", "")
         }
+    }
 
 # Protected route example
 @api_router.get("/me")
@@ -178,6 +174,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_http_client():
+    global http_client
+    http_client = create_http_client()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await http_client.aclose()
     client.close()
\ No newline at end of file
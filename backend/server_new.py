@@ -2,25 +2,41 @@
 ZenUML Backend Server
 Main application entry point with refactored structure
 """
-from fastapi import FastAPI, status
-from fastapi.responses import JSONResponse
-from fastapi.exceptions import RequestValidationError
-from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.sessions import SessionMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from pathlib import Path
+import asyncio
 import logging
 import os
 
+from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+from jose import JWTError
+from motor.motor_asyncio import AsyncIOMotorClient
+
 # Import routes
-from routes import auth, status as status_routes, health
+from routes import auth, status as status_routes, health, jwks, branding, i18n as i18n_routes, diagrams
 from middleware.logging_middleware import LoggingMiddleware
-from middleware.error_handler import validation_exception_handler
-from core.dependencies import set_db
-from core.config import get_database_url, get_database_name, get_cors_origins
+from middleware.error_handler import (
+    validation_exception_handler, general_exception_handler, jwt_exception_handler, get_error_responses
+)
+from i18n.middleware import LocaleMiddleware
+from core.http import create_http_client
+from services.keyring import get_keyring
+from db.indexes import ensure_indexes
+from db.batching import InsertBatcher
+from db.maintenance import purge_revoked_tokens_periodically
+from db.health import PoolMonitor, ReadinessProbe
+from core.dependencies import set_db, set_status_batcher, set_http_client, set_readiness_probe
+from core.config import (
+    get_database_url, get_database_name, get_cors_origins, get_token_purge_interval, get_log_sample_rate,
+    is_status_batching_enabled, get_status_batch_max_size, get_status_batch_max_delay_ms,
+    get_health_probe_ttl, get_health_ping_timeout
+)
 
-# Load environment variables
+# Load environment variables; app modules read them through core.config when objects are built
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 load_dotenv()
@@ -30,56 +46,69 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-logger = logging.getLogger(__name__)
-
-# Create FastAPI app
-app = FastAPI(
-    title="ZenUML API",
-    description="Backend API for ZenUML diagram tool",
-    version="1.0.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
-)
-
-# MongoDB connection
-mongo_url = get_database_url()
-db_name = get_database_name()
-client = AsyncIOMotorClient(mongo_url)
-db = client[db_name]
-
-# Set database instance for dependency injection
-set_db(db)
-
-# Add middleware
-app.add_middleware(
-    SessionMiddleware,
-    secret_key=os.getenv('SESSION_SECRET', 'your-secret-key-123'),
-    session_cookie="zenuml_session"
-)
-
-app.add_middleware(LoggingMiddleware)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=get_cors_origins(),
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Exception handlers
-app.add_exception_handler(RequestValidationError, validation_exception_handler)
+logger = logging.getLogger(__name__)
 
 
-# Include routers
-app.include_router(health.router)
-app.include_router(auth.router, prefix="/api")
-app.include_router(status_routes.router, prefix="/api")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown"""
+    logger.info("Starting ZenUML API server")
+    db_name = get_database_name()
+    pool_monitor = PoolMonitor()
+    client = AsyncIOMotorClient(get_database_url(), tz_aware=True, event_listeners=[pool_monitor])
+    db = client[db_name]
+    set_db(db)
+    set_readiness_probe(ReadinessProbe(
+        db, pool_monitor, ttl=get_health_probe_ttl(), timeout=get_health_ping_timeout()
+    ))
+    logger.info(f"Connected to MongoDB: {db_name}")
+    
+    keyring = get_keyring()
+    logger.info(f"JWT signing with {keyring.algorithm}, active kid {keyring.active_kid}")
+    
+    # Render every localized error body before the first request needs one
+    get_error_responses()
+    
+    try:
+        await ensure_indexes(db)
+        logger.info("MongoDB indexes ensured")
+    except Exception as e:
+        logger.error(f"Failed to ensure MongoDB indexes: {e}")
+    
+    app.state.http_client = create_http_client()
+    set_http_client(app.state.http_client)
+    
+    app.state.token_purge_task = asyncio.create_task(
+        purge_revoked_tokens_periodically(db, get_token_purge_interval())
+    )
+    
+    app.state.status_batcher = None
+    if is_status_batching_enabled():
+        app.state.status_batcher = InsertBatcher(
+            db.status_checks,
+            max_batch_size=get_status_batch_max_size(),
+            max_delay_ms=get_status_batch_max_delay_ms()
+        )
+        set_status_batcher(app.state.status_batcher)
+        logger.info("Status check insert batching enabled")
+    
+    try:
+        yield
+    finally:
+        logger.info("Shutting down ZenUML API server")
+        app.state.token_purge_task.cancel()
+        if app.state.status_batcher is not None:
+            await app.state.status_batcher.close()
+            set_status_batcher(None)
+        await app.state.http_client.aclose()
+        set_http_client(None)
+        client.close()
+        set_readiness_probe(None)
+        set_db(None)
 
 
 # Root endpoint
-@app.get("/")
 async def root():
     """Root endpoint"""
     return {
@@ -89,20 +118,57 @@ async def root():
     }
 
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize on startup"""
-    logger.info("Starting ZenUML API server")
-    logger.info(f"Connected to MongoDB: {db_name}")
-
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Shutting down ZenUML API server")
-    client.close()
+def create_app() -> FastAPI:
+    """Create the FastAPI application; connections are opened by its lifespan"""
+    app = FastAPI(
+        title="ZenUML API",
+        description="Backend API for ZenUML diagram tool",
+        version="1.0.0",
+        docs_url="/api/docs",
+        redoc_url="/api/redoc",
+        openapi_url="/api/openapi.json",
+        lifespan=lifespan
+    )
+    
+    # Add middleware
+    app.add_middleware(LocaleMiddleware)
+    
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key=os.getenv('SESSION_SECRET', 'your-secret-key-123'),
+        session_cookie="zenuml_session"
+    )
+    
+    app.add_middleware(LoggingMiddleware, sample_rate=get_log_sample_rate())
+    
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=get_cors_origins(),
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Exception handlers
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(JWTError, jwt_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
+    
+    # Include routers
+    app.include_router(health.router)
+    app.include_router(jwks.router)
+    app.include_router(auth.router, prefix="/api")
+    app.include_router(status_routes.router, prefix="/api")
+    app.include_router(diagrams.router, prefix="/api")
+    app.include_router(branding.router)
+    app.include_router(i18n_routes.router)
+    app.add_api_route("/", root, methods=["GET"])
+    
+    return app
+
+
+# Application instance served by `uvicorn server_new:app`
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -1,25 +1,49 @@
 import os
+import time
+import asyncio
+import hashlib
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 import httpx
-from jose import JWTError, jwt
+from jose import JWTError
 from db.repositories import UserRepository, RefreshTokenRepository
+from db.cache import TTLCache
+from services.keyring import get_keyring
+from core.config import get_google_token_url, get_google_userinfo_url, get_token_cache_max_size
 from models.schemas import TokenData, TokenType
 
 logger = logging.getLogger(__name__)
 
-# JWT settings
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")
-ALGORITHM = "HS256"
+# JWT settings (signing keys and algorithm live in services.keyring)
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+# Per-call timeout for Google OAuth requests (endpoints come from core.config)
+GOOGLE_REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Verified tokens, keyed by SHA-256 digest and expiring at the token's own exp
+_verified_tokens: Optional[TTLCache] = None
+
+
+def get_verified_token_cache() -> TTLCache:
+    """Get the process-wide verified token cache, creating it on first use"""
+    global _verified_tokens
+    if _verified_tokens is None:
+        _verified_tokens = TTLCache(maxsize=get_token_cache_max_size(), ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    return _verified_tokens
+
 
 class AuthService:
-    def __init__(self, user_repo: UserRepository, token_repo: RefreshTokenRepository):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        token_repo: RefreshTokenRepository,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.user_repo = user_repo
         self.token_repo = token_repo
+        self.http_client = http_client
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create JWT access token"""
@@ -31,7 +55,7 @@ class AuthService:
                 expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
             
             to_encode.update({"exp": expire, "type": TokenType.ACCESS.value})
-            encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+            encoded_jwt = get_keyring().sign(to_encode)
             return encoded_jwt
         except Exception as e:
             logger.error(f"Error creating access token: {e}")
@@ -43,7 +67,7 @@ class AuthService:
             to_encode = data.copy()
             expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
             to_encode.update({"exp": expire, "type": TokenType.REFRESH.value})
-            encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+            encoded_jwt = get_keyring().sign(to_encode)
             return encoded_jwt
         except Exception as e:
             logger.error(f"Error creating refresh token: {e}")
@@ -66,15 +90,33 @@ class AuthService:
 
     def verify_token(self, token: str, token_type: TokenType = TokenType.ACCESS) -> Optional[TokenData]:
         """Verify JWT token"""
+        keyring = get_keyring()
+        verified_tokens = get_verified_token_cache()
+        digest = hashlib.sha256(token.encode()).digest()
+        cached = verified_tokens.get(digest)
+        if cached is not None:
+            token_data, kid = cached
+            # Tokens signed with a retired key stop verifying immediately
+            if kid in keyring:
+                if token_data.token_type != token_type:
+                    return None
+                return token_data.model_copy()
+            verified_tokens.invalidate(digest)
+        
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = keyring.verify(token)
             email: str = payload.get("sub")
             token_type_claim: str = payload.get("type")
             
             if email is None or token_type_claim != token_type.value:
                 return None
             
-            return TokenData(email=email, token_type=TokenType(token_type_claim))
+            token_data = TokenData(email=email, token_type=TokenType(token_type_claim))
+            expires_in = payload.get("exp", 0) - time.time()
+            if expires_in > 0:
+                verified_tokens.set(digest, (token_data, keyring.get_kid(token)), ttl=expires_in)
+            
+            return token_data.model_copy()
         except JWTError as e:
             logger.error(f"Error verifying token: {e}")
             return None
@@ -99,73 +141,73 @@ class AuthService:
             logger.error(f"Error refreshing access token: {e}")
             return None
 
+    async def _fetch_google_user(self, client: httpx.AsyncClient, code: str) -> Optional[dict]:
+        """Exchange an authorization code and fetch the Google user profile"""
+        # Exchange authorization code for tokens
+        token_response = await client.post(
+            get_google_token_url(),
+            data={
+                'code': code,
+                'client_id': os.getenv('GOOGLE_CLIENT_ID'),
+                'client_secret': os.getenv('GOOGLE_CLIENT_SECRET'),
+                'redirect_uri': os.getenv('GOOGLE_REDIRECT_URI'),
+                'grant_type': 'authorization_code',
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=GOOGLE_REQUEST_TIMEOUT
+        )
+        
+        if token_response.status_code != 200:
+            logger.error(f"Google token exchange failed: {token_response.text}")
+            return None
+        
+        tokens = token_response.json()
+        
+        # Get user info
+        userinfo_response = await client.get(
+            get_google_userinfo_url(),
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+            timeout=GOOGLE_REQUEST_TIMEOUT
+        )
+        
+        if userinfo_response.status_code != 200:
+            logger.error(f"Failed to get user info: {userinfo_response.text}")
+            return None
+        
+        return userinfo_response.json()
+
     async def handle_google_callback(self, code: str) -> Optional[dict]:
         """Handle Google OAuth callback"""
         try:
-            token_url = "https://oauth2.googleapis.com/token"
+            if self.http_client is not None:
+                user_info = await self._fetch_google_user(self.http_client, code)
+            else:
+                async with httpx.AsyncClient() as client:
+                    user_info = await self._fetch_google_user(client, code)
             
-            async with httpx.AsyncClient() as client:
-                # Exchange authorization code for tokens
-                token_response = await client.post(
-                    token_url,
-                    data={
-                        'code': code,
-                        'client_id': os.getenv('GOOGLE_CLIENT_ID'),
-                        'client_secret': os.getenv('GOOGLE_CLIENT_SECRET'),
-                        'redirect_uri': os.getenv('GOOGLE_REDIRECT_URI'),
-                        'grant_type': 'authorization_code',
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
-                
-                if token_response.status_code != 200:
-                    logger.error(f"Google token exchange failed: {token_response.text}")
-                    return None
-                
-                tokens = token_response.json()
-                
-                # Get user info
-                userinfo_url = "https://www.googleapis.com/oauth2/v3/userinfo"
-                userinfo_response = await client.get(
-                    userinfo_url,
-                    headers={"Authorization": f"Bearer {tokens['access_token']}"}
-                )
-                
-                if userinfo_response.status_code != 200:
-                    logger.error(f"Failed to get user info: {userinfo_response.text}")
-                    return None
-                
-                user_info = userinfo_response.json()
-                
-                # Create or update user
-                user = await self.user_repo.find_by_email(user_info["email"])
-                if not user:
-                    user = await self.user_repo.create(
-                        email=user_info["email"],
-                        name=user_info.get("name", ""),
-                        picture=user_info.get("picture", "")
-                    )
-                else:
-                    # Update user info if changed
-                    user = await self.user_repo.update(
-                        email=user_info["email"],
-                        name=user_info.get("name", ""),
-                        picture=user_info.get("picture", "")
-                    )
-                
-                # Create tokens
-                access_token, refresh_token = await self.create_tokens(user_info["email"])
-                
-                return {
-                    "access_token": access_token,
-                    "refresh_token": refresh_token,
-                    "token_type": "bearer",
-                    "user": {
-                        "email": user_info["email"],
-                        "name": user_info.get("name", ""),
-                        "picture": user_info.get("picture", "")
-                    }
+            if not user_info:
+                return None
+            
+            # Upsert the user and issue tokens concurrently (one round trip each)
+            _, (access_token, refresh_token) = await asyncio.gather(
+                self.user_repo.upsert(
+                    email=user_info["email"],
+                    name=user_info.get("name", ""),
+                    picture=user_info.get("picture", "")
+                ),
+                self.create_tokens(user_info["email"])
+            )
+            
+            return {
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "token_type": "bearer",
+                "user": {
+                    "email": user_info["email"],
+                    "name": user_info.get("name", ""),
+                    "picture": user_info.get("picture", "")
                 }
+            }
         except Exception as e:
             logger.error(f"Error handling Google callback: {e}")
             return None
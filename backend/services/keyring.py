@@ -0,0 +1,167 @@
+"""
+JWT signing key ring with key ids (kid), rotation and a JWKS export
+"""
+import uuid
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+from core.config import (
+    get_jwt_algorithm, get_jwt_secret_key, get_jwt_keys_dir, get_jwt_active_kid, is_ephemeral_jwt_key_allowed
+)
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {"ES256"}
+SUPPORTED_ALGORITHMS = {"HS256"} | ASYMMETRIC_ALGORITHMS
+
+# kid assumed for tokens issued before key ids were added
+DEFAULT_KID = "default"
+
+
+class KeyRing:
+    """Holds signing keys by kid; signers and verifiers are parsed once and cached"""
+
+    def __init__(self, algorithm: str = "HS256"):
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.active_kid: Optional[str] = None
+        self._signers: Dict[str, Key] = {}
+        self._verifiers: Dict[str, Key] = {}
+
+    def add_key(self, kid: str, key: Any, activate: bool = False) -> str:
+        """Add a private key (PEM) or HMAC secret under `kid`"""
+        signer = jwk.construct(key, self.algorithm)
+        self._signers[kid] = signer
+        if self.algorithm in ASYMMETRIC_ALGORITHMS:
+            self._verifiers[kid] = signer.public_key()
+        else:
+            self._verifiers[kid] = signer
+        if activate or self.active_kid is None:
+            self.active_kid = kid
+        return kid
+
+    def generate_key(self, kid: Optional[str] = None, activate: bool = False) -> str:
+        """Generate a new private key for an asymmetric algorithm"""
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Cannot generate keys for {self.algorithm}")
+        # Key generation is only needed for rotation and ephemeral keys
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        return self.add_key(kid or uuid.uuid4().hex[:16], pem, activate=activate)
+
+    def rotate(self, key: Optional[Any] = None, kid: Optional[str] = None) -> str:
+        """Make a new key active; older keys keep verifying until retired"""
+        if key is None:
+            return self.generate_key(kid, activate=True)
+        return self.add_key(kid or uuid.uuid4().hex[:16], key, activate=True)
+
+    def retire(self, kid: str) -> None:
+        """Remove a key so tokens signed with it no longer verify"""
+        if kid == self.active_kid:
+            raise ValueError("Cannot retire the active signing key")
+        self._signers.pop(kid, None)
+        self._verifiers.pop(kid, None)
+
+    def __contains__(self, kid: str) -> bool:
+        return kid in self._verifiers
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        """Sign claims with the active key, tagging the header with its kid"""
+        if self.active_kid is None:
+            raise RuntimeError("Key ring has no signing key")
+        return jwt.encode(
+            claims,
+            self._signers[self.active_kid],
+            algorithm=self.algorithm,
+            headers={"kid": self.active_kid},
+        )
+
+    def get_kid(self, token: str) -> str:
+        """Get the kid a token was signed with"""
+        return jwt.get_unverified_header(token).get("kid", DEFAULT_KID)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token with the cached verifier for its kid
+
+        Raises:
+            JWTError: If the kid is unknown or the token is invalid or expired
+        """
+        kid = self.get_kid(token)
+        verifier = self._verifiers.get(kid)
+        if verifier is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, verifier, algorithms=[self.algorithm])
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the public keys as a JWK Set (empty for HMAC secrets)"""
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            return {"keys": []}
+        keys = []
+        for kid, verifier in self._verifiers.items():
+            public_jwk = verifier.to_dict()
+            public_jwk.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            keys.append(public_jwk)
+        return {"keys": keys}
+
+
+def load_keyring() -> KeyRing:
+    """
+    Build the key ring from environment settings
+
+    Raises:
+        ValueError: If an asymmetric algorithm has no keys in JWT_KEYS_DIR and
+            JWT_ALLOW_EPHEMERAL_KEYS is not set, or JWT_ACTIVE_KID is unknown
+    """
+    algorithm = get_jwt_algorithm()
+    keyring = KeyRing(algorithm)
+
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        keyring.add_key(DEFAULT_KID, get_jwt_secret_key(), activate=True)
+        return keyring
+
+    keys_dir = get_jwt_keys_dir()
+    if keys_dir and Path(keys_dir).is_dir():
+        for pem_path in sorted(Path(keys_dir).glob("*.pem")):
+            keyring.add_key(pem_path.stem, pem_path.read_bytes(), activate=True)
+        active_kid = get_jwt_active_kid()
+        if active_kid:
+            if active_kid not in keyring:
+                raise ValueError(f"JWT_ACTIVE_KID {active_kid} not found in {keys_dir}")
+            keyring.active_kid = active_kid
+
+    if keyring.active_kid is None:
+        # Each process would sign with its own key, so tokens fail on every other worker
+        if not is_ephemeral_jwt_key_allowed():
+            raise ValueError(
+                f"No {algorithm} keys found in JWT_KEYS_DIR; set JWT_ALLOW_EPHEMERAL_KEYS=true "
+                "to generate a per-process key for development"
+            )
+        logger.warning(
+            f"No {algorithm} keys found in JWT_KEYS_DIR; generated an ephemeral key "
+            "(tokens will not verify across processes or restarts)"
+        )
+        keyring.generate_key(activate=True)
+
+    return keyring
+
+
+_keyring: Optional[KeyRing] = None
+
+
+def get_keyring() -> KeyRing:
+    """Get the process-wide key ring, loading it on first use"""
+    global _keyring
+    if _keyring is None:
+        _keyring = load_keyring()
+    return _keyring
@@ -4,9 +4,21 @@ Unit tests for authentication service
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
+from services import auth_service as auth_module
 from services.auth_service import AuthService
 from models.schemas import TokenType, TokenData
 from db.repositories import UserRepository, RefreshTokenRepository
+from core.http import create_http_client
+
+
+def stub_google_oauth(request: httpx.Request) -> httpx.Response:
+    """Stub Google token and userinfo endpoints"""
+    if request.url.path == "/token":
+        return httpx.Response(200, json={"access_token": "google-access-token"})
+    if request.headers.get("Authorization") != "Bearer google-access-token":
+        return httpx.Response(401, json={"error": "invalid_token"})
+    return httpx.Response(200, json={"email": "test@example.com", "name": "Test User", "picture": ""})
 
 
 @pytest.fixture
@@ -21,6 +33,14 @@ def mock_token_repo():
     return AsyncMock(spec=RefreshTokenRepository)
 
 
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty verified-token cache"""
+    auth_module.get_verified_token_cache().clear()
+    yield
+    auth_module.get_verified_token_cache().clear()
+
+
 @pytest.fixture
 def auth_service(mock_user_repo, mock_token_repo):
     """Create auth service with mocked repositories"""
@@ -69,6 +89,33 @@ class TestAuthService:
         assert token_data.email == "test@example.com"
         assert token_data.token_type == TokenType.REFRESH
     
+    def test_verify_token_cached(self, auth_service):
+        """Test repeat verification skips jwt.decode"""
+        token = auth_service.create_access_token({"sub": "test@example.com"})
+        auth_service.verify_token(token, TokenType.ACCESS)
+        
+        with patch("services.keyring.jwt.decode") as mock_decode:
+            token_data = auth_service.verify_token(token, TokenType.ACCESS)
+        
+        mock_decode.assert_not_called()
+        assert token_data.email == "test@example.com"
+    
+    def test_verify_cached_token_wrong_type(self, auth_service):
+        """Test a cached access token is rejected as a refresh token"""
+        token = auth_service.create_access_token({"sub": "test@example.com"})
+        auth_service.verify_token(token, TokenType.ACCESS)
+        
+        assert auth_service.verify_token(token, TokenType.REFRESH) is None
+    
+    def test_verify_expired_token_not_cached(self, auth_service):
+        """Test expired tokens are rejected and never cached"""
+        token = auth_service.create_access_token(
+            {"sub": "test@example.com"}, expires_delta=timedelta(seconds=-10)
+        )
+        
+        assert auth_service.verify_token(token, TokenType.ACCESS) is None
+        assert len(auth_module._verified_tokens) == 0
+    
     @pytest.mark.asyncio
     async def test_create_tokens(self, auth_service, mock_token_repo):
         """Test creating both access and refresh tokens"""
@@ -113,3 +160,36 @@ class TestAuthService:
         
         assert result is True
         mock_token_repo.revoke_all_for_user.assert_called_once_with("test@example.com")
+    
+    @pytest.mark.asyncio
+    async def test_google_callback_uses_injected_client(self, mock_user_repo, mock_token_repo):
+        """Test the OAuth exchange goes through the shared client"""
+        mock_user_repo.upsert.return_value = {"email": "test@example.com"}
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return stub_google_oauth(request)
+        
+        async with create_http_client(transport=httpx.MockTransport(handler)) as client:
+            service = AuthService(mock_user_repo, mock_token_repo, client)
+            with patch("services.auth_service.httpx.AsyncClient") as new_client:
+                result = await service.handle_google_callback("auth-code")
+        
+        new_client.assert_not_called()
+        assert [request.url.path for request in requests] == ["/token", "/oauth2/v3/userinfo"]
+        assert result["user"]["email"] == "test@example.com"
+        mock_user_repo.upsert.assert_called_once_with(email="test@example.com", name="Test User", picture="")
+        mock_user_repo.find_by_email.assert_not_called()
+        mock_token_repo.create.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_google_callback_exchange_failure(self, mock_user_repo, mock_token_repo):
+        """Test a failed code exchange returns None"""
+        transport = httpx.MockTransport(lambda request: httpx.Response(400, json={"error": "invalid_grant"}))
+        
+        async with create_http_client(transport=transport) as client:
+            result = await AuthService(mock_user_repo, mock_token_repo, client).handle_google_callback("bad")
+        
+        assert result is None
+        mock_user_repo.upsert.assert_not_called()
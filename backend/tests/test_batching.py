@@ -0,0 +1,102 @@
+"""
+Unit tests for the status check insert batcher
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import BulkWriteError
+from db.batching import InsertBatcher
+from db.repositories import StatusCheckRepository
+
+
+@pytest.fixture
+def mock_collection():
+    """Mock collection accepting insert_many"""
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    return collection
+
+
+class TestInsertBatcher:
+    """Test cases for InsertBatcher"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_inserts_share_one_write(self, mock_collection):
+        """Test concurrent inserts are merged into a single insert_many"""
+        batcher = InsertBatcher(mock_collection, max_batch_size=100, max_delay_ms=5)
+
+        ids = await asyncio.gather(*(batcher.insert({"client_name": f"c{i}"}) for i in range(10)))
+
+        mock_collection.insert_many.assert_called_once()
+        documents = mock_collection.insert_many.call_args.args[0]
+        assert len(documents) == 10
+        assert ids == [document["_id"] for document in documents]
+        assert mock_collection.insert_many.call_args.kwargs == {"ordered": False}
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self, mock_collection):
+        """Test reaching max_batch_size flushes without waiting for the timer"""
+        batcher = InsertBatcher(mock_collection, max_batch_size=3, max_delay_ms=60000)
+
+        await asyncio.wait_for(
+            asyncio.gather(*(batcher.insert({"client_name": f"c{i}"}) for i in range(6))),
+            timeout=1
+        )
+
+        assert mock_collection.insert_many.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_document_only_fails_its_caller(self, mock_collection):
+        """Test a write error is reported to the matching insert only"""
+        mock_collection.insert_many.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]}
+        )
+        batcher = InsertBatcher(mock_collection, max_batch_size=100, max_delay_ms=5)
+
+        results = await asyncio.gather(
+            *(batcher.insert({"client_name": f"c{i}"}) for i in range(3)),
+            return_exceptions=True
+        )
+
+        assert isinstance(results[1], BulkWriteError)
+        assert not isinstance(results[0], Exception)
+        assert not isinstance(results[2], Exception)
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending(self, mock_collection):
+        """Test close() writes queued documents immediately"""
+        batcher = InsertBatcher(mock_collection, max_batch_size=100, max_delay_ms=60000)
+        pending = asyncio.ensure_future(batcher.insert({"client_name": "c"}))
+        await asyncio.sleep(0)
+
+        await batcher.close()
+
+        assert pending.done()
+        mock_collection.insert_many.assert_called_once()
+
+
+class TestStatusCheckBatching:
+    """Test cases for batched status check writes"""
+
+    @pytest.mark.asyncio
+    async def test_create_many_single_unordered_write(self, mock_collection):
+        """Test create_many issues one unordered insert_many"""
+        mock_db = MagicMock()
+        mock_db.status_checks = mock_collection
+
+        created = await StatusCheckRepository(mock_db).create_many(["a", "b", "c"])
+
+        assert [check["client_name"] for check in created] == ["a", "b", "c"]
+        mock_collection.insert_many.assert_called_once_with(created, ordered=False)
+
+    @pytest.mark.asyncio
+    async def test_create_uses_batcher(self, mock_collection):
+        """Test create() goes through the batcher when one is configured"""
+        mock_db = MagicMock()
+        mock_db.status_checks = mock_collection
+        batcher = InsertBatcher(mock_collection, max_batch_size=100, max_delay_ms=5)
+
+        check = await StatusCheckRepository(mock_db, batcher=batcher).create("client")
+
+        assert check["_id"] is not None
+        mock_collection.insert_many.assert_called_once()
@@ -0,0 +1,112 @@
+"""
+Unit tests for in-process caches
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.security import HTTPAuthorizationCredentials
+from db.cache import TTLCache, get_user_profile_cache
+from db.repositories import UserRepository
+from core.dependencies import get_current_user
+from models.schemas import TokenData, TokenType
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Start every test with an empty user profile cache"""
+    get_user_profile_cache().clear()
+    yield
+    get_user_profile_cache().clear()
+
+
+class TestTTLCache:
+    """Test cases for TTLCache"""
+
+    def test_get_set(self):
+        """Test storing and reading a value"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expiry(self):
+        """Test entries expire after their TTL"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        with patch("db.cache.time.monotonic", return_value=1000.0):
+            cache.set("a", 1)
+        with patch("db.cache.time.monotonic", return_value=1061.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate(self):
+        """Test dropping a single entry"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.invalidate("a")
+
+        assert cache.get("a") is None
+
+
+class TestCurrentUserCache:
+    """Test cases for the cached get_current_user dependency"""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_skips_database(self):
+        """Test repeated requests are served from the cache"""
+        auth_service = MagicMock()
+        auth_service.verify_token.side_effect = lambda *args: TokenData(
+            email="test@example.com", token_type=TokenType.ACCESS
+        )
+        user_repo = AsyncMock(spec=UserRepository)
+        user_repo.find_by_email.return_value = {
+            "email": "test@example.com",
+            "name": "Test User",
+            "picture": "pic.jpg"
+        }
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+
+        first = await get_current_user(credentials, auth_service, user_repo)
+        second = await get_current_user(credentials, auth_service, user_repo)
+
+        assert first.name == second.name == "Test User"
+        assert second.picture == "pic.jpg"
+        user_repo.find_by_email.assert_called_once_with("test@example.com")
+        assert get_user_profile_cache().stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_profile(self):
+        """Test UserRepository.update drops the cached profile"""
+        mock_db = MagicMock()
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one_and_update.return_value = {"email": "test@example.com"}
+        get_user_profile_cache().set("test@example.com", ("Old Name", ""))
+
+        await UserRepository(mock_db).update(email="test@example.com", name="New Name")
+
+        assert get_user_profile_cache().get("test@example.com") is None
+
+    def test_settings_read_when_cache_is_created(self, monkeypatch):
+        """Test the cache size and TTL come from the environment when the cache is first used"""
+        monkeypatch.setattr("db.cache._user_profile_cache", None)
+        monkeypatch.setenv("USER_CACHE_MAX_SIZE", "3")
+        monkeypatch.setenv("USER_CACHE_TTL_SECONDS", "5")
+
+        cache = get_user_profile_cache()
+
+        assert (cache.maxsize, cache.ttl) == (3, 5.0)
+        assert get_user_profile_cache() is cache
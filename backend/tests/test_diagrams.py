@@ -0,0 +1,307 @@
+"""
+Unit tests for diagram storage and the diagram routes
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from db.json_patch import JsonPatchError
+from db.repositories import DiagramRepository, VersionConflictError
+from core.dependencies import get_current_user, get_diagram_repo
+from models.schemas import TokenData
+from routes import diagrams
+
+DIAGRAM_ID = ObjectId()
+
+
+def stored_diagram(version: int = 3, node_count: int = 5) -> dict:
+    """A diagram as MongoDB returns it"""
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": DIAGRAM_ID,
+        "project_id": "proj-1",
+        "owner": "ada@example.com",
+        "name": "Class Diagram",
+        "type": "class",
+        "nodes": [
+            {"id": f"n{i}", "type": "classNode", "position": {"x": i, "y": i}, "data": {"label": f"N{i}"}}
+            for i in range(node_count)
+        ],
+        "edges": [{"id": "e1", "source": "n0", "target": "n1", "type": "association"}],
+        "viewport": {"x": 0, "y": 0, "zoom": 1},
+        "version": version,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+@pytest.fixture
+def mock_db():
+    """Mock database holding one diagram"""
+    db = MagicMock()
+    db.diagrams.find_one = AsyncMock(return_value=stored_diagram())
+    db.diagrams.update_one = AsyncMock(return_value=MagicMock(matched_count=1))
+    return db
+
+
+@pytest.fixture
+def diagram_repo(mock_db):
+    """Create diagram repository with mocked database"""
+    return DiagramRepository(mock_db)
+
+
+class TestDiagramRepository:
+    """Test cases for DiagramRepository.apply_patch"""
+
+    @pytest.mark.asyncio
+    async def test_sets_only_changed_elements(self, diagram_repo, mock_db):
+        """Test moving a node writes just that node and bumps the version"""
+        result = await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+            {"op": "replace", "path": "/nodes/2/position", "value": {"x": 50, "y": 60}},
+        ], expected_version=3)
+
+        assert result["version"] == 4
+        query, update = mock_db.diagrams.update_one.call_args.args
+        assert query["version"] == 3
+        assert update["$inc"] == {"version": 1}
+        assert set(update["$set"]) == {"nodes.2", "updated_at"}
+        assert update["$set"]["nodes.2"]["position"] == {"x": 50, "y": 60}
+
+    @pytest.mark.asyncio
+    async def test_reads_only_patched_fields(self, diagram_repo, mock_db):
+        """Test the read projection is limited to the fields the patch touches"""
+        await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+            {"op": "replace", "path": "/name", "value": "Renamed"},
+        ], expected_version=3)
+
+        projection = mock_db.diagrams.find_one.call_args.args[1]
+        assert projection == {"version": 1, "name": 1}
+
+    @pytest.mark.asyncio
+    async def test_structural_changes_set_whole_field(self, diagram_repo, mock_db):
+        """Test adding or removing elements rewrites the whole array"""
+        await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+            {"op": "replace", "path": "/nodes/0/data/label", "value": "Book"},
+            {"op": "remove", "path": "/nodes/4"},
+            {"op": "add", "path": "/edges/-", "value": {"id": "e2", "source": "n1", "target": "n2"}},
+        ], expected_version=3)
+
+        update = mock_db.diagrams.update_one.call_args.args[1]
+        assert set(update["$set"]) == {"nodes", "edges", "updated_at"}
+        assert len(update["$set"]["nodes"]) == 4
+        assert update["$set"]["nodes"][0]["data"]["label"] == "Book"
+        assert len(update["$set"]["edges"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_removed_field_is_unset(self, diagram_repo, mock_db):
+        """Test removing a top-level field unsets it"""
+        await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+            {"op": "remove", "path": "/viewport"},
+        ], expected_version=3)
+
+        update = mock_db.diagrams.update_one.call_args.args[1]
+        assert update["$unset"] == {"viewport": ""}
+
+    @pytest.mark.asyncio
+    async def test_stale_version_conflicts(self, diagram_repo, mock_db):
+        """Test a patch based on an old version is refused before writing"""
+        with pytest.raises(VersionConflictError) as exc_info:
+            await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+                {"op": "replace", "path": "/name", "value": "Renamed"},
+            ], expected_version=2)
+
+        assert exc_info.value.current_version == 3
+        mock_db.diagrams.update_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_write_conflicts(self, diagram_repo, mock_db):
+        """Test losing the race between read and write is a conflict"""
+        mock_db.diagrams.update_one.return_value = MagicMock(matched_count=0)
+
+        with pytest.raises(VersionConflictError):
+            await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+                {"op": "replace", "path": "/name", "value": "Renamed"},
+            ], expected_version=3)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/version", "/owner", "/_id", ""])
+    async def test_protected_fields(self, diagram_repo, mock_db, path):
+        """Test patches may not touch bookkeeping fields or the whole document"""
+        with pytest.raises(JsonPatchError):
+            await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+                {"op": "replace", "path": path, "value": 1},
+            ], expected_version=3)
+        mock_db.diagrams.find_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("operation", [
+        {"op": "replace", "path": "/type", "value": "bogus"},
+        {"op": "replace", "path": "/nodes", "value": "x"},
+        {"op": "replace", "path": "/name", "value": ""},
+        {"op": "remove", "path": "/nodes"},
+        {"op": "remove", "path": "/name"},
+        {"op": "replace", "path": "/nodes/0", "value": 5},
+        {"op": "add", "path": "/edges/-", "value": [1]},
+        {"op": "replace", "path": "/viewport", "value": 3},
+    ])
+    async def test_invalid_result_is_rejected(self, diagram_repo, mock_db, operation):
+        """Test a patch leaving the diagram invalid is refused without writing"""
+        with pytest.raises(JsonPatchError):
+            await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [operation], expected_version=3)
+
+        mock_db.diagrams.update_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_viewport_may_be_cleared(self, diagram_repo, mock_db):
+        """Test the optional viewport can be set to null"""
+        await diagram_repo.apply_patch("proj-1", str(DIAGRAM_ID), "ada@example.com", [
+            {"op": "replace", "path": "/viewport", "value": None},
+        ], expected_version=3)
+
+        update = mock_db.diagrams.update_one.call_args.args[1]
+        assert update["$set"]["viewport"] is None
+
+    @pytest.mark.asyncio
+    async def test_malformed_id_is_not_found(self, diagram_repo, mock_db):
+        """Test an id that is not an ObjectId finds nothing"""
+        result = await diagram_repo.apply_patch("proj-1", "nope", "ada@example.com", [], expected_version=3)
+
+        assert result is None
+        mock_db.diagrams.find_one.assert_not_called()
+
+
+def stored_summaries(count: int) -> list:
+    """Diagram listings as MongoDB returns them, most recently updated first"""
+    now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    return [
+        {"_id": ObjectId(), "project_id": "proj-1", "owner": "ada@example.com", "name": f"D{i}", "type": "class",
+         "version": 1, "created_at": now, "updated_at": now - timedelta(seconds=i)}
+        for i in range(count)
+    ]
+
+
+def build_client(mock_db) -> TestClient:
+    """Create a test client for the diagram routes with auth and storage mocked"""
+    app = FastAPI()
+    app.include_router(diagrams.router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: TokenData(email="ada@example.com")
+    app.dependency_overrides[get_diagram_repo] = lambda: DiagramRepository(mock_db)
+    return TestClient(app)
+
+
+class TestDiagramRoutes:
+    """Test cases for the diagram routes"""
+
+    URL = f"/api/projects/proj-1/diagrams/{DIAGRAM_ID}"
+    PATCH = [{"op": "replace", "path": "/nodes/0/position/x", "value": 10}]
+
+    def test_get_returns_etag(self, mock_db):
+        """Test the diagram is served with its version as ETag"""
+        response = build_client(mock_db).get(self.URL)
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"3"'
+        assert response.json()["id"] == str(DIAGRAM_ID)
+        assert len(response.json()["nodes"]) == 5
+
+    def test_patch(self, mock_db):
+        """Test a JSON Patch with a matching If-Match is saved"""
+        response = build_client(mock_db).patch(
+            self.URL, json=self.PATCH,
+            headers={"If-Match": '"3"', "Content-Type": "application/json-patch+json"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["version"] == 4
+        assert response.headers["ETag"] == '"4"'
+
+    def test_patch_requires_if_match(self, mock_db):
+        """Test patching without a base version is refused"""
+        response = build_client(mock_db).patch(self.URL, json=self.PATCH)
+
+        assert response.status_code == 428
+
+    def test_stale_patch_is_rejected(self, mock_db):
+        """Test a stale If-Match returns 412 with the current ETag"""
+        response = build_client(mock_db).patch(self.URL, json=self.PATCH, headers={"If-Match": '"1"'})
+
+        assert response.status_code == 412
+        assert response.headers["ETag"] == '"3"'
+
+    def test_failed_test_operation_conflicts(self, mock_db):
+        """Test a failing test operation returns 409"""
+        response = build_client(mock_db).patch(
+            self.URL, json=[{"op": "test", "path": "/name", "value": "Other"}], headers={"If-Match": '"3"'}
+        )
+
+        assert response.status_code == 409
+
+    def test_invalid_diagram_is_rejected(self, mock_db):
+        """Test a patch producing an invalid diagram returns 422"""
+        response = build_client(mock_db).patch(
+            self.URL, json=[{"op": "replace", "path": "/type", "value": "bogus"}], headers={"If-Match": '"3"'}
+        )
+
+        assert response.status_code == 422
+        mock_db.diagrams.update_one.assert_not_called()
+
+    def test_invalid_patch(self, mock_db):
+        """Test a patch that does not apply returns 422"""
+        response = build_client(mock_db).patch(
+            self.URL, json=[{"op": "remove", "path": "/nodes/99"}], headers={"If-Match": '"3"'}
+        )
+
+        assert response.status_code == 422
+        mock_db.diagrams.update_one.assert_not_called()
+
+
+class TestListDiagrams:
+    """Test cases for GET /api/projects/{project_id}/diagrams"""
+
+    URL = "/api/projects/proj-1/diagrams/"
+
+    @pytest.fixture
+    def mock_db(self):
+        """Mock database whose diagram listing returns three summaries"""
+        db = MagicMock()
+        docs = stored_summaries(3)
+        cursor = db.diagrams.find.return_value.sort.return_value.limit.return_value
+        cursor.to_list = AsyncMock(side_effect=lambda limit: docs[:limit])
+        db.docs = docs
+        return db
+
+    def test_full_page_sets_next_cursor(self, mock_db):
+        """Test a full page carries the cursor after its last diagram"""
+        response = build_client(mock_db).get(self.URL, params={"limit": 2})
+
+        assert response.status_code == 200
+        page = response.json()
+        assert [diagram["name"] for diagram in page] == ["D0", "D1"]
+        after = DiagramRepository.decode_cursor(response.headers["X-Next-Cursor"])
+        assert after == (mock_db.docs[1]["updated_at"], ObjectId(page[1]["id"]))
+
+    def test_last_page_has_no_cursor(self, mock_db):
+        """Test a short page ends pagination"""
+        response = build_client(mock_db).get(self.URL)
+
+        assert len(response.json()) == 3
+        assert "X-Next-Cursor" not in response.headers
+        mock_db.diagrams.find.return_value.sort.return_value.limit.assert_called_once_with(diagrams.MAX_PAGE_SIZE)
+
+    def test_cursor_selects_after_position(self, mock_db):
+        """Test the after cursor becomes a keyset filter within the project"""
+        cursor = DiagramRepository.encode_cursor(mock_db.docs[0])
+        build_client(mock_db).get(self.URL, params={"after": cursor})
+
+        query = mock_db.diagrams.find.call_args.args[0]
+        assert query["project_id"] == "proj-1"
+        assert query["$or"][0] == {"updated_at": {"$lt": mock_db.docs[0]["updated_at"]}}
+
+    def test_bad_cursor_is_rejected(self, mock_db):
+        """Test an undecodable cursor returns 400 without querying"""
+        response = build_client(mock_db).get(self.URL, params={"after": "not-a-cursor"})
+
+        assert response.status_code == 400
+        mock_db.diagrams.find.assert_not_called()
@@ -0,0 +1,148 @@
+"""
+Unit tests for localized error responses and validation log rate limiting
+"""
+import logging
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
+from fastapi.testclient import TestClient
+from jose import JWTError
+from pydantic import BaseModel
+from i18n.error_codes import ErrorCode
+from i18n.middleware import LocaleMiddleware
+from i18n.translator import Translator
+from middleware.error_handler import (
+    ErrorResponses,
+    LogRateLimiter,
+    get_error_responses,
+    jwt_exception_handler,
+    validation_exception_handler,
+)
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+
+
+def build_client() -> TestClient:
+    """Create a test client for an app with the locale middleware and error handlers"""
+    app = FastAPI()
+
+    @app.post("/items")
+    async def create_item(item: Item):
+        return item
+
+    @app.get("/secure")
+    async def secure():
+        raise JWTError("bad signature")
+
+    app.add_middleware(LocaleMiddleware)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(JWTError, jwt_exception_handler)
+    return TestClient(app)
+
+
+class TestErrorResponses:
+    """Test cases for the pre-rendered error table"""
+
+    def test_bodies_rendered_per_locale(self):
+        """Test each (code, locale) has its translated body"""
+        responses = ErrorResponses(Translator(), locales=['en', 'id'])
+        translator = Translator()
+
+        for locale in ('en', 'id'):
+            body, body_locale = responses.body(ErrorCode.RES_NOT_FOUND, locale)
+            assert body_locale == locale
+            assert translator.get_error_message('RES_001', locale).encode() in body
+            assert b'"error_code":"RES_001"' in body
+
+    def test_unknown_locale_uses_default(self):
+        """Test an unsupported locale falls back to the default locale's body"""
+        responses = ErrorResponses(Translator(), locales=['en', 'id'])
+
+        body, locale = responses.body(ErrorCode.RES_NOT_FOUND, 'xx')
+        assert locale == 'en'
+        assert body == responses.body(ErrorCode.RES_NOT_FOUND, 'en')[0]
+
+    def test_table_is_built_once(self):
+        """Test the shared table is reused between calls"""
+        assert get_error_responses() is get_error_responses()
+
+
+class TestExceptionHandlers:
+    """Test cases for the exception handlers"""
+
+    def test_validation_error_is_localized(self):
+        """Test validation errors use the request locale and keep the error list"""
+        response = build_client().post("/items?lang=id", json={"name": "pen", "quantity": "many"})
+
+        assert response.status_code == 422
+        assert response.headers["Content-Language"] == "id"
+        body = response.json()
+        assert body["error_code"] == ErrorCode.VAL_INVALID_FORMAT
+        assert body["detail"] == Translator().get_error_message('VAL_004', 'id')
+        assert body["errors"][0]["loc"] == ["body", "quantity"]
+
+    def test_missing_fields_use_missing_code(self):
+        """Test a body with only missing fields reports VAL_003"""
+        response = build_client().post("/items", json={})
+
+        assert response.json()["error_code"] == ErrorCode.VAL_MISSING_FIELD
+
+    def test_jwt_error(self):
+        """Test JWT errors return 401 with a Bearer challenge"""
+        response = build_client().get("/secure", headers={"Accept-Language": "ja"})
+
+        assert response.status_code == 401
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+        assert response.json()["detail"] == Translator().get_error_message('AUTH_003', 'ja')
+
+    def test_validation_log_omits_inputs(self, caplog):
+        """Test validation logs name fields and types but never echo inputs"""
+        with patch("middleware.error_handler._validation_log_limiter", LogRateLimiter(limit=5, window=60)):
+            with caplog.at_level(logging.WARNING, logger="middleware.error_handler"):
+                build_client().post("/items", json={"name": "pen", "quantity": "hunter2"})
+
+        assert "body.quantity (int_parsing)" in caplog.text
+        assert "hunter2" not in caplog.text
+
+    def test_validation_logging_is_rate_limited(self, caplog):
+        """Test a flood of 422s from one client only logs up to the limit"""
+        client = build_client()
+        with patch("middleware.error_handler._validation_log_limiter", LogRateLimiter(limit=2, window=60)):
+            with caplog.at_level(logging.WARNING, logger="middleware.error_handler"):
+                for _ in range(10):
+                    assert client.post("/items", json={}).status_code == 422
+
+        assert len(caplog.records) == 2
+
+
+class TestLogRateLimiter:
+    """Test cases for LogRateLimiter"""
+
+    def test_reports_suppressed_count_in_next_window(self):
+        """Test records over the limit are counted and reported once the window rolls over"""
+        limiter = LogRateLimiter(limit=1, window=60)
+        with patch("middleware.error_handler.time.monotonic", return_value=0.0):
+            assert limiter.allow("k") == (True, 0)
+            assert limiter.allow("k") == (False, 0)
+            assert limiter.allow("k") == (False, 0)
+        with patch("middleware.error_handler.time.monotonic", return_value=61.0):
+            assert limiter.allow("k") == (True, 2)
+
+    def test_keys_are_independent(self):
+        """Test one noisy key does not silence another"""
+        limiter = LogRateLimiter(limit=1, window=60)
+
+        assert limiter.allow("a")[0]
+        assert not limiter.allow("a")[0]
+        assert limiter.allow("b")[0]
+
+    def test_tracked_keys_are_bounded(self):
+        """Test only the most recent keys are remembered"""
+        limiter = LogRateLimiter(limit=1, window=60, max_keys=2)
+        for key in ("a", "b", "c"):
+            limiter.allow(key)
+
+        assert list(limiter._windows) == ["b", "c"]
@@ -0,0 +1,167 @@
+"""
+Unit tests for health probes
+"""
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from db.health import PoolMonitor, ReadinessProbe
+from routes import health
+from core.dependencies import get_readiness_probe
+
+ADDRESS = ("localhost", 27017)
+
+
+def event(**kwargs):
+    """Fake pool event for ADDRESS"""
+    return SimpleNamespace(address=ADDRESS, **kwargs)
+
+
+def mock_db(side_effect=None):
+    """Database mock whose ping succeeds unless given a side effect"""
+    db = MagicMock()
+    db.command = AsyncMock(return_value={"ok": 1}, side_effect=side_effect)
+    return db
+
+
+class TestPoolMonitor:
+    """Test cases for PoolMonitor"""
+
+    def test_tracks_checkouts(self):
+        """Test connection counts follow pool events"""
+        monitor = PoolMonitor()
+        monitor.pool_created(event(options={"maxPoolSize": 2}))
+        for _ in range(2):
+            monitor.connection_created(event())
+            monitor.connection_check_out_started(event())
+            monitor.connection_checked_out(event())
+
+        assert monitor.stats() == {
+            "open": 2, "in_use": 2, "waiting": 0, "max_pool_size": 2,
+            "utilization": 1.0, "checkout_failures": 0,
+        }
+        assert not monitor.is_saturated()
+
+        monitor.connection_check_out_started(event())
+        assert monitor.is_saturated()
+
+        monitor.connection_check_out_failed(event())
+        monitor.connection_checked_in(event())
+        assert monitor.stats()["in_use"] == 1
+        assert monitor.stats()["checkout_failures"] == 1
+        assert not monitor.is_saturated()
+
+    def test_pool_closed(self):
+        """Test a closed pool no longer counts"""
+        monitor = PoolMonitor()
+        monitor.pool_created(event(options={"maxPoolSize": 5}))
+        monitor.connection_created(event())
+        monitor.pool_closed(event())
+
+        assert monitor.stats()["max_pool_size"] == 0
+        assert monitor.stats()["open"] == 0
+
+
+class TestReadinessProbe:
+    """Test cases for ReadinessProbe"""
+
+    @pytest.mark.asyncio
+    async def test_ping_is_cached(self):
+        """Test probes within the TTL reuse the last ping"""
+        db = mock_db()
+        probe = ReadinessProbe(db, ttl=60)
+
+        first = await probe.check()
+        second = await probe.check()
+
+        assert first["ready"] and second["ready"]
+        assert first["mongo"]["latency_ms"] >= 0
+        db.command.assert_awaited_once_with("ping")
+
+    @pytest.mark.asyncio
+    async def test_ping_refreshed_after_ttl(self):
+        """Test a stale result triggers a new ping"""
+        db = mock_db()
+        probe = ReadinessProbe(db, ttl=5)
+        with patch("db.health.time.monotonic", return_value=100.0):
+            await probe.check()
+        with patch("db.health.time.monotonic", return_value=106.0):
+            await probe.check()
+
+        assert db.command.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_ping(self):
+        """Test simultaneous probes wait on a single in-flight ping"""
+        async def slow_ping(*args):
+            await asyncio.sleep(0.01)
+            return {"ok": 1}
+
+        db = mock_db(side_effect=slow_ping)
+        probe = ReadinessProbe(db, ttl=60)
+
+        results = await asyncio.gather(*(probe.check() for _ in range(10)))
+
+        assert all(result["ready"] for result in results)
+        db.command.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_ping_not_ready(self):
+        """Test a failing ping reports the error instead of raising"""
+        probe = ReadinessProbe(mock_db(side_effect=ConnectionError("down")), ttl=60)
+
+        result = await probe.check()
+
+        assert result["ready"] is False
+        assert result["mongo"]["error"] == "ConnectionError"
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_not_ready(self):
+        """Test an exhausted pool fails readiness even when ping succeeds"""
+        monitor = PoolMonitor()
+        monitor.pool_created(event(options={"maxPoolSize": 1}))
+        monitor.connection_check_out_started(event())
+        monitor.connection_checked_out(event())
+        monitor.connection_check_out_started(event())
+        probe = ReadinessProbe(mock_db(), monitor, ttl=60)
+
+        result = await probe.check()
+
+        assert result["mongo"]["ok"] is True
+        assert result["ready"] is False
+        assert result["pool"]["waiting"] == 1
+
+
+class TestHealthRoutes:
+    """Test cases for health endpoints"""
+
+    def client(self, probe):
+        app = FastAPI()
+        app.include_router(health.router)
+        app.dependency_overrides[get_readiness_probe] = lambda: probe
+        return TestClient(app)
+
+    def test_liveness(self):
+        """Test liveness never consults the probe"""
+        response = self.client(None).get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_ready(self):
+        """Test readiness returns 200 with ping latency"""
+        response = self.client(ReadinessProbe(mock_db())).get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert "latency_ms" in response.json()["mongo"]
+
+    def test_not_ready(self):
+        """Test readiness returns 503 when MongoDB is unreachable"""
+        probe = ReadinessProbe(mock_db(side_effect=TimeoutError()))
+        response = self.client(probe).get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
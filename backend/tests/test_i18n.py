@@ -1,8 +1,24 @@
+import json
+import mmap
+import os
 import pytest
+from contextlib import contextmanager
 from backend.i18n.translator import Translator
+from backend.i18n.catalog import MessageCatalog, compile_catalog, load_catalog
 from backend.i18n.error_codes import ErrorCode
 from backend.i18n.locale_config import SUPPORTED_LOCALES, DEFAULT_LOCALE
 
+@contextmanager
+def use_catalog(translator, translations):
+    """Temporarily serve the given translations from the shared translator"""
+    catalog, formatters = translator.catalog, translator._formatters
+    translator._catalog = MessageCatalog.from_translations(translations, 'en')
+    translator._formatters = {}
+    try:
+        yield translator
+    finally:
+        translator._catalog, translator._formatters = catalog, formatters
+
 class TestTranslator:
     @pytest.fixture
     def translator(self):
@@ -36,6 +52,43 @@ class TestTranslator:
     
     def test_default_locale(self):
         assert DEFAULT_LOCALE == 'en'
+    
+    def test_get_dotted_key(self, translator):
+        assert translator.get('errors.AUTH_001', locale='en') == 'Invalid credentials provided'
+    
+    def test_get_missing_key_returns_key(self, translator):
+        assert translator.get('errors.NOPE', locale='en') == 'errors.NOPE'
+    
+    def test_get_unknown_locale_falls_back(self, translator):
+        assert translator.get('errors.AUTH_001', locale='xx') == 'Invalid credentials provided'
+    
+    def test_fallback_merged_into_catalog(self, translator):
+        with use_catalog(translator, {
+            'en': {'onboarding': {'welcome': 'Welcome, {name}'}},
+            'ja': {'errors': {'AUTH_001': '認証情報が無効です'}},
+        }):
+            assert translator.get('onboarding.welcome', locale='ja', name='Ada') == 'Welcome, Ada'
+    
+    def test_get_with_placeholders(self, translator):
+        with use_catalog(translator, {
+            'en': {'greeting': 'Hello {name}', 'errors': {'AUTH_001': 'Invalid credentials provided'}},
+        }):
+            assert translator.get('greeting', locale='en', name='Ada') == 'Hello Ada'
+            assert translator.get('errors.AUTH_001', locale='en', name='Ada') == 'Invalid credentials provided'
+    
+    def test_formatters_are_bound_once(self, translator):
+        with use_catalog(translator, {'en': {'greeting': 'Hello {name}'}}):
+            translator.get('greeting', locale='xx', name='Ada')
+            formatter = translator._formatters[('en', 'greeting')]
+            
+            assert translator.get('greeting', locale='en', name='Grace') == 'Hello Grace'
+            assert translator._formatters == {('en', 'greeting'): formatter}
+    
+    def test_get_error_message_accepts_error_code(self, translator):
+        assert translator.get_error_message(ErrorCode.AUTH_INVALID_CREDENTIALS, 'en') == 'Invalid credentials provided'
+    
+    def test_get_error_message_unknown_code(self, translator):
+        assert translator.get_error_message('NOPE_001', 'en') == 'Error: NOPE_001'
 
 class TestErrorCodes:
     def test_auth_error_codes(self):
@@ -56,3 +109,84 @@ class TestErrorCodes:
     def test_server_error_codes(self):
         assert ErrorCode.SRV_INTERNAL_ERROR == "SRV_001"
         assert ErrorCode.SRV_DATABASE_ERROR == "SRV_002"
+
+class TestMessageCatalog:
+    @pytest.fixture
+    def locales_dir(self, tmp_path):
+        for locale, errors in {
+            'en': {'AUTH_001': 'Invalid credentials provided', 'AUTH_002': 'Your session has expired'},
+            'id': {'AUTH_001': 'Kredensial tidak valid'},
+            'pt': {'AUTH_001': 'Invalid credentials provided'},
+        }.items():
+            (tmp_path / locale).mkdir()
+            (tmp_path / locale / 'errors.json').write_text(json.dumps({'errors': errors}), encoding='utf-8')
+        return tmp_path
+    
+    def test_compile_and_open(self, locales_dir, tmp_path):
+        output = tmp_path / 'messages.catalog'
+        compile_catalog(locales_dir, output, 'en')
+        catalog = MessageCatalog.open(output)
+        
+        assert catalog.locales == ['en', 'id', 'pt']
+        assert catalog.get('id', 'errors.AUTH_001') == 'Kredensial tidak valid'
+        assert catalog.get('id', 'errors.AUTH_002') == 'Your session has expired'
+        assert catalog.get('id', 'errors.NOPE') is None
+    
+    def test_strings_are_stored_once(self, locales_dir, tmp_path):
+        output = tmp_path / 'messages.catalog'
+        size = compile_catalog(locales_dir, output, 'en')
+        
+        assert output.read_bytes().count(b'Invalid credentials provided') == 1
+        assert output.stat().st_size == size
+    
+    def test_locales_load_lazily(self, locales_dir, tmp_path):
+        output = tmp_path / 'messages.catalog'
+        compile_catalog(locales_dir, output, 'en')
+        catalog = MessageCatalog.open(output)
+        
+        assert catalog._tables == {}
+        catalog.get('pt', 'errors.AUTH_001')
+        assert list(catalog._tables) == ['pt']
+    
+    def test_rejects_other_files(self):
+        with pytest.raises(ValueError):
+            MessageCatalog(b'not a catalog at all!')
+    
+    @pytest.mark.parametrize('length', [4, 20, 40, -1])
+    def test_rejects_truncated_catalog(self, locales_dir, tmp_path, length):
+        output = tmp_path / 'messages.catalog'
+        compile_catalog(locales_dir, output, 'en')
+        
+        with pytest.raises(ValueError):
+            MessageCatalog(output.read_bytes()[:length])
+    
+    def test_rejects_corrupt_value_id(self, locales_dir, tmp_path):
+        output = tmp_path / 'messages.catalog'
+        compile_catalog(locales_dir, output, 'en')
+        catalog = MessageCatalog.open(output)
+        data = bytearray(output.read_bytes())
+        data[catalog._values_start:catalog._values_start + 4] = (0xFFFFFFFE).to_bytes(4, 'little')
+        
+        with pytest.raises(ValueError):
+            MessageCatalog(bytes(data))
+    
+    def test_load_ignores_truncated_catalog(self, locales_dir, tmp_path):
+        output = tmp_path / 'messages.catalog'
+        compile_catalog(locales_dir, output, 'en')
+        output.write_bytes(output.read_bytes()[:10])
+        
+        catalog = load_catalog(output, locales_dir, 'en')
+        assert catalog.get('id', 'errors.AUTH_001') == 'Kredensial tidak valid'
+    
+    def test_load_falls_back_to_json(self, locales_dir, tmp_path):
+        catalog = load_catalog(tmp_path / 'missing.catalog', locales_dir, 'en')
+        assert catalog.get('en', 'errors.AUTH_002') == 'Your session has expired'
+    
+    def test_load_ignores_stale_catalog(self, locales_dir, tmp_path):
+        output = tmp_path / 'messages.catalog'
+        compile_catalog(locales_dir, output, 'en')
+        os.utime(output, (0, 0))
+        
+        catalog = load_catalog(output, locales_dir, 'en')
+        assert not isinstance(catalog._buffer, mmap.mmap)
+        assert catalog.get('id', 'errors.AUTH_001') == 'Kredensial tidak valid'
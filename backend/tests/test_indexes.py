@@ -0,0 +1,200 @@
+"""
+Unit tests for index provisioning and query-plan auditing
+"""
+import os
+import pytest
+from datetime import datetime, timezone
+from bson import ObjectId
+from unittest.mock import AsyncMock, MagicMock
+from db.indexes import (
+    INDEXES, REPOSITORY_QUERIES, ensure_indexes, drop_legacy_indexes,
+    audit_query_plans, find_collection_scans, IndexProvisioningError
+)
+from db.repositories import UserRepository, RefreshTokenRepository, StatusCheckRepository, DiagramRepository
+
+# Collection methods whose first argument is a query filter
+FILTER_METHODS = ("find", "find_one", "find_one_and_update", "update_one", "update_many", "delete_many")
+
+# How to issue each audited query through its repository
+REPOSITORY_CALLS = {
+    "UserRepository.find_by_email": lambda db: UserRepository(db).find_by_email("a@example.com"),
+    "UserRepository.update": lambda db: UserRepository(db).update("a@example.com", name="A"),
+    "UserRepository.upsert": lambda db: UserRepository(db).upsert("a@example.com", "A"),
+    "RefreshTokenRepository.find_by_token": lambda db: RefreshTokenRepository(db).find_by_token("t"),
+    "RefreshTokenRepository.revoke": lambda db: RefreshTokenRepository(db).revoke("t"),
+    "RefreshTokenRepository.revoke_all_for_user": lambda db: RefreshTokenRepository(db).revoke_all_for_user("a@example.com"),
+    "RefreshTokenRepository.purge_revoked": lambda db: RefreshTokenRepository(db).purge_revoked(),
+    "StatusCheckRepository.find_all": lambda db: StatusCheckRepository(db).find_all(),
+    "StatusCheckRepository.find_page": lambda db: StatusCheckRepository(db).find_page(
+        10, StatusCheckRepository.decode_cursor(StatusCheckRepository.encode_cursor(
+            {"timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc), "_id": ObjectId()}
+        ))
+    ),
+    "DiagramRepository.find_by_project": lambda db: DiagramRepository(db).find_by_project(
+        "proj-1", "a@example.com", 10, DiagramRepository.decode_cursor(DiagramRepository.encode_cursor(
+            {"updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc), "_id": ObjectId()}
+        ))
+    ),
+}
+
+
+@pytest.fixture
+def mock_db():
+    """Mock database whose collections are created on first access"""
+    collections = {}
+
+    def get_collection(name):
+        if name not in collections:
+            collections[name] = MagicMock()
+            collections[name].create_indexes = AsyncMock(return_value=[])
+            collections[name].index_information = AsyncMock(return_value={"_id_": {}})
+            collections[name].drop_index = AsyncMock()
+        return collections[name]
+
+    db = MagicMock()
+    db.__getitem__.side_effect = get_collection
+    return db
+
+
+def explain_result(*stages):
+    """Build a nested explain() result from outermost to innermost stage"""
+    plan = {}
+    for stage in reversed(stages):
+        plan = {"stage": stage, "inputStage": plan} if plan else {"stage": stage}
+    return {"queryPlanner": {"winningPlan": plan}}
+
+
+class TestEnsureIndexes:
+    """Test cases for ensure_indexes"""
+
+    @pytest.mark.asyncio
+    async def test_creates_indexes_for_every_collection(self, mock_db):
+        """Test every configured collection gets its indexes"""
+        await ensure_indexes(mock_db)
+
+        for collection_name, indexes in INDEXES.items():
+            mock_db[collection_name].create_indexes.assert_called_once_with(indexes)
+
+    @pytest.mark.asyncio
+    async def test_drops_legacy_token_index(self, mock_db):
+        """Test the raw-token unique index is dropped when present"""
+        mock_db["refresh_tokens"].index_information.return_value = {"_id_": {}, "token_unique": {}}
+
+        dropped = await drop_legacy_indexes(mock_db)
+
+        assert dropped == ["token_unique"]
+        mock_db["refresh_tokens"].drop_index.assert_called_once_with("token_unique")
+
+    @pytest.mark.asyncio
+    async def test_failing_collection_does_not_stop_others(self, mock_db):
+        """Test every collection is attempted and failures are reported together"""
+        mock_db["refresh_tokens"].create_indexes.side_effect = RuntimeError("duplicate key")
+
+        with pytest.raises(IndexProvisioningError) as exc_info:
+            await ensure_indexes(mock_db)
+
+        assert list(exc_info.value.failures) == ["refresh_tokens"]
+        for collection_name, indexes in INDEXES.items():
+            mock_db[collection_name].create_indexes.assert_called_once_with(indexes)
+        assert "refresh_tokens" not in exc_info.value.created
+
+    def test_token_hash_index_skips_unmigrated_documents(self):
+        """Test the token_hash unique index ignores legacy documents without a hash"""
+        index = next(
+            index.document for index in INDEXES["refresh_tokens"]
+            if index.document["key"] == {"token_hash": 1}
+        )
+
+        assert index["unique"]
+        assert index["partialFilterExpression"] == {"token_hash": {"$exists": True}}
+
+
+class TestAuditQueryPlans:
+    """Test cases for audit_query_plans"""
+
+    @pytest.mark.asyncio
+    async def test_reports_collection_scans(self, mock_db):
+        """Test a COLLSCAN winning plan is reported"""
+        for collection_name in {query[0] for query in REPOSITORY_QUERIES.values()}:
+            cursor = MagicMock()
+            cursor.sort.return_value = cursor
+            stages = ("COLLSCAN",) if collection_name == "status_checks" else ("FETCH", "IXSCAN")
+            cursor.explain = AsyncMock(return_value=explain_result(*stages))
+            mock_db[collection_name].find.return_value = cursor
+
+        plans = await audit_query_plans(mock_db)
+
+        assert plans["UserRepository.find_by_email"] == ["FETCH", "IXSCAN"]
+        assert find_collection_scans(plans) == [
+            "StatusCheckRepository.find_all",
+            "StatusCheckRepository.find_page",
+        ]
+
+
+def query_shape(value):
+    """Reduce a query to its field names, operators and value types"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [query_shape(item) for item in value]
+    return type(value).__name__
+
+
+def recording_db():
+    """Mock database whose collections record the queries issued on them"""
+    collection = MagicMock()
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[])
+    collection.find.return_value = cursor
+    for method in FILTER_METHODS[1:]:
+        setattr(collection, method, AsyncMock(return_value=MagicMock(modified_count=0, deleted_count=0)))
+    db = MagicMock()
+    for collection_name in INDEXES:
+        setattr(db, collection_name, collection)
+    return db, collection, cursor
+
+
+class TestRepositoryQueries:
+    """Test REPOSITORY_QUERIES stays in step with the queries the repositories issue"""
+
+    def test_every_audited_query_is_checked(self):
+        """Test each audited query has a repository call below"""
+        assert set(REPOSITORY_CALLS) == set(REPOSITORY_QUERIES)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", sorted(REPOSITORY_QUERIES))
+    async def test_matches_repository(self, name):
+        """Test the audited filter and sort match what the repository sends"""
+        collection_name, query, sort = REPOSITORY_QUERIES[name]
+        db, collection, cursor = recording_db()
+
+        await REPOSITORY_CALLS[name](db)
+
+        called = [getattr(collection, method) for method in FILTER_METHODS if getattr(collection, method).called]
+        assert len(called) == 1
+        assert query_shape(called[0].call_args.args[0]) == query_shape(query)
+        assert (cursor.sort.call_args.args[0] if cursor.sort.called else None) == sort
+
+
+@pytest.mark.integration
+class TestQueryPlansIntegration:
+    """Run the query-plan audit against a live MongoDB (set MONGO_URL)"""
+
+    @pytest.mark.asyncio
+    async def test_no_collection_scans(self):
+        """Test no repository query falls back to a COLLSCAN"""
+        if "MONGO_URL" not in os.environ:
+            pytest.skip("MONGO_URL not set")
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=2000)
+        db = client["zenuml_index_audit"]
+        try:
+            await ensure_indexes(db)
+            plans = await audit_query_plans(db)
+            assert find_collection_scans(plans) == []
+        finally:
+            await client.drop_database("zenuml_index_audit")
+            client.close()
@@ -0,0 +1,140 @@
+"""
+Unit tests for the RFC 6902 JSON Patch implementation
+"""
+import copy
+import pytest
+from db.json_patch import (
+    JsonPatchError, JsonPatchTestFailed, apply_patch, json_equal, parse_patch, parse_pointer
+)
+
+
+class TestParsing:
+    """Test cases for pointer and operation parsing"""
+
+    def test_pointer_unescapes_tokens(self):
+        """Test ~1 and ~0 decode to / and ~, in that order"""
+        assert parse_pointer("") == ()
+        assert parse_pointer("/a~1b/m~0n/~01") == ("a/b", "m~n", "~1")
+
+    def test_pointer_must_start_with_slash(self):
+        """Test relative pointers are rejected"""
+        with pytest.raises(JsonPatchError):
+            parse_pointer("nodes/0")
+
+    @pytest.mark.parametrize("operation", [
+        {"op": "add", "path": "/a"},
+        {"op": "move", "path": "/a"},
+        {"op": "replace", "value": 1},
+        {"op": "frobnicate", "path": "/a"},
+        {"op": "add", "path": 3, "value": 1},
+        "not an object",
+    ])
+    def test_malformed_operations(self, operation):
+        """Test operations missing members or with unknown ops are rejected"""
+        with pytest.raises(JsonPatchError):
+            parse_patch([operation])
+
+    def test_patch_must_be_array(self):
+        """Test a bare operation object is not a patch"""
+        with pytest.raises(JsonPatchError):
+            parse_patch({"op": "remove", "path": "/a"})
+
+
+class TestApplyPatch:
+    """Test cases for apply_patch, following the examples in RFC 6902 appendix A"""
+
+    @pytest.mark.parametrize("document,patch,expected", [
+        ({"foo": "bar"}, [{"op": "add", "path": "/baz", "value": "qux"}], {"baz": "qux", "foo": "bar"}),
+        ({"foo": ["bar", "baz"]}, [{"op": "add", "path": "/foo/1", "value": "qux"}], {"foo": ["bar", "qux", "baz"]}),
+        ({"baz": "qux", "foo": "bar"}, [{"op": "remove", "path": "/baz"}], {"foo": "bar"}),
+        ({"foo": ["bar", "qux", "baz"]}, [{"op": "remove", "path": "/foo/1"}], {"foo": ["bar", "baz"]}),
+        ({"baz": "qux", "foo": "bar"}, [{"op": "replace", "path": "/baz", "value": "boo"}], {"baz": "boo", "foo": "bar"}),
+        (
+            {"foo": {"bar": "baz", "waldo": "fred"}, "qux": {"corge": "grault"}},
+            [{"op": "move", "from": "/foo/waldo", "path": "/qux/thud"}],
+            {"foo": {"bar": "baz"}, "qux": {"corge": "grault", "thud": "fred"}},
+        ),
+        (
+            {"foo": ["all", "grass", "cows", "eat"]},
+            [{"op": "move", "from": "/foo/1", "path": "/foo/3"}],
+            {"foo": ["all", "cows", "eat", "grass"]},
+        ),
+        ({"foo": "bar"}, [{"op": "add", "path": "/child", "value": {"grandchild": {}}}], {"foo": "bar", "child": {"grandchild": {}}}),
+        ({"foo": ["bar"]}, [{"op": "add", "path": "/foo/-", "value": ["abc", "def"]}], {"foo": ["bar", ["abc", "def"]]}),
+        ({"foo": None}, [{"op": "add", "path": "/foo", "value": 1}], {"foo": 1}),
+        ({"/": 9, "~1": 10}, [{"op": "test", "path": "/~01", "value": 10}], {"/": 9, "~1": 10}),
+        ({"a": {"b": [1, 2]}}, [{"op": "copy", "from": "/a/b", "path": "/c"}], {"a": {"b": [1, 2]}, "c": [1, 2]}),
+        ({"a": 1}, [{"op": "replace", "path": "", "value": [1]}], [1]),
+    ])
+    def test_rfc_examples(self, document, patch, expected):
+        """Test each operation against the RFC's worked examples"""
+        assert apply_patch(document, patch) == expected
+
+    @pytest.mark.parametrize("document,patch", [
+        ({"foo": "bar"}, [{"op": "add", "path": "/baz/bat", "value": "qux"}]),
+        ({"foo": ["bar"]}, [{"op": "add", "path": "/foo/2", "value": 1}]),
+        ({"foo": ["bar"]}, [{"op": "replace", "path": "/foo/-", "value": 1}]),
+        ({"foo": ["bar"]}, [{"op": "remove", "path": "/foo/01"}]),
+        ({"foo": "bar"}, [{"op": "remove", "path": "/missing"}]),
+        ({"foo": "bar"}, [{"op": "replace", "path": "/missing", "value": 1}]),
+        ({"a": {"b": {}}}, [{"op": "move", "from": "/a", "path": "/a/b/c"}]),
+        ({"foo": "bar"}, [{"op": "remove", "path": ""}]),
+    ])
+    def test_invalid_targets(self, document, patch):
+        """Test operations on missing or invalid locations fail"""
+        with pytest.raises(JsonPatchError):
+            apply_patch(document, patch)
+
+    def test_failed_test_operation(self):
+        """Test a mismatching test raises JsonPatchTestFailed"""
+        with pytest.raises(JsonPatchTestFailed):
+            apply_patch({"baz": "qux"}, [{"op": "test", "path": "/baz", "value": "bar"}])
+
+    def test_test_compares_json_types(self):
+        """Test true and 1 differ while 1 and 1.0 are equal"""
+        assert json_equal(1, 1.0)
+        assert not json_equal(True, 1)
+        assert not json_equal({"a": [1]}, {"a": [True]})
+        assert json_equal({"a": [1, {"b": None}]}, {"a": [1.0, {"b": None}]})
+
+    def test_input_is_not_modified(self):
+        """Test the document is left untouched, even when a later operation fails"""
+        document = {"nodes": [{"id": "a", "position": {"x": 0, "y": 0}}], "edges": []}
+        snapshot = copy.deepcopy(document)
+
+        patched = apply_patch(document, [
+            {"op": "replace", "path": "/nodes/0/position/x", "value": 5},
+            {"op": "add", "path": "/edges/-", "value": {"id": "e1"}},
+        ])
+        with pytest.raises(JsonPatchError):
+            apply_patch(document, [
+                {"op": "remove", "path": "/nodes/0"},
+                {"op": "remove", "path": "/nodes/0"},
+            ])
+
+        assert document == snapshot
+        assert patched["nodes"][0]["position"] == {"x": 5, "y": 0}
+        assert patched["edges"] == [{"id": "e1"}]
+
+    def test_unchanged_subtrees_are_shared(self):
+        """Test only containers on changed paths are copied"""
+        nodes = [{"id": str(i), "position": {"x": i, "y": i}} for i in range(1000)]
+        document = {"nodes": nodes, "edges": []}
+
+        patched = apply_patch(document, [
+            {"op": "replace", "path": "/nodes/3/position/x", "value": -1},
+            {"op": "replace", "path": "/nodes/3/position/y", "value": -1},
+        ])
+
+        assert patched["edges"] is document["edges"]
+        assert patched["nodes"] is not nodes
+        assert patched["nodes"][4] is nodes[4]
+        assert patched["nodes"][3] is not nodes[3]
+        assert patched["nodes"][3]["position"] == {"x": -1, "y": -1}
+        assert nodes[3]["position"] == {"x": 3, "y": 3}
+
+    def test_accepts_parsed_patch(self):
+        """Test operations from parse_patch can be applied directly"""
+        operations = parse_patch([{"op": "add", "path": "/a", "value": 1}])
+
+        assert apply_patch({}, operations) == {"a": 1}
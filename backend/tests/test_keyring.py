@@ -0,0 +1,168 @@
+"""
+Unit tests for the JWT signing key ring
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from jose import JWTError, jwt
+from services.keyring import KeyRing, DEFAULT_KID, load_keyring
+from services import auth_service as auth_module
+from services.auth_service import AuthService
+from models.schemas import TokenType
+
+
+def claims(minutes: int = 5) -> dict:
+    """Token claims expiring in `minutes`"""
+    return {"sub": "test@example.com", "exp": datetime.now(timezone.utc) + timedelta(minutes=minutes)}
+
+
+class TestKeyRing:
+    """Test cases for KeyRing"""
+
+    def test_hs256_round_trip(self):
+        """Test HS256 tokens carry the kid and verify"""
+        keyring = KeyRing("HS256")
+        keyring.add_key(DEFAULT_KID, "secret")
+
+        token = keyring.sign(claims())
+
+        assert jwt.get_unverified_header(token)["kid"] == DEFAULT_KID
+        assert keyring.verify(token)["sub"] == "test@example.com"
+
+    def test_hs256_token_without_kid(self):
+        """Test tokens issued before kids existed use the default key"""
+        keyring = KeyRing("HS256")
+        keyring.add_key(DEFAULT_KID, "secret")
+
+        legacy_token = jwt.encode(claims(), "secret", algorithm="HS256")
+
+        assert keyring.verify(legacy_token)["sub"] == "test@example.com"
+
+    def test_es256_round_trip(self):
+        """Test ES256 tokens verify with the cached public key"""
+        keyring = KeyRing("ES256")
+        keyring.generate_key("k1")
+
+        token = keyring.sign(claims())
+
+        assert jwt.get_unverified_header(token) == {"alg": "ES256", "kid": "k1", "typ": "JWT"}
+        assert keyring.verify(token)["sub"] == "test@example.com"
+
+    def test_rotation_keeps_old_keys_until_retired(self):
+        """Test rotated-out keys still verify until retired"""
+        keyring = KeyRing("ES256")
+        keyring.generate_key("k1")
+        old_token = keyring.sign(claims())
+
+        assert keyring.rotate(kid="k2") == "k2"
+        new_token = keyring.sign(claims())
+
+        assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+        assert keyring.verify(old_token)["sub"] == "test@example.com"
+
+        keyring.retire("k1")
+        with pytest.raises(JWTError):
+            keyring.verify(old_token)
+        with pytest.raises(ValueError):
+            keyring.retire("k2")
+
+    def test_jwks_exports_public_keys_only(self):
+        """Test the JWK Set holds one public key per kid"""
+        keyring = KeyRing("ES256")
+        keyring.generate_key("k1")
+        keyring.rotate(kid="k2")
+
+        keys = keyring.jwks()["keys"]
+
+        assert [key["kid"] for key in keys] == ["k1", "k2"]
+        assert all(key["kty"] == "EC" and key["alg"] == "ES256" for key in keys)
+        assert all("d" not in key for key in keys)
+
+    def test_jwks_empty_for_hmac(self):
+        """Test HMAC secrets are never published"""
+        keyring = KeyRing("HS256")
+        keyring.add_key(DEFAULT_KID, "secret")
+
+        assert keyring.jwks() == {"keys": []}
+
+    def test_unsupported_algorithm(self):
+        """Test unknown algorithms are rejected"""
+        with pytest.raises(ValueError):
+            KeyRing("none")
+
+
+class TestLoadKeyring:
+    """Test cases for load_keyring"""
+
+    @pytest.fixture(autouse=True)
+    def clean_env(self, monkeypatch):
+        """Start every test without key ring settings"""
+        for name in ("JWT_ALGORITHM", "JWT_KEYS_DIR", "JWT_ACTIVE_KID", "JWT_ALLOW_EPHEMERAL_KEYS"):
+            monkeypatch.delenv(name, raising=False)
+
+    def test_hs256_uses_secret(self, monkeypatch):
+        """Test HS256 signs with JWT_SECRET_KEY under the default kid"""
+        monkeypatch.setenv("JWT_SECRET_KEY", "s3cret")
+
+        keyring = load_keyring()
+
+        assert keyring.algorithm == "HS256"
+        assert keyring.active_kid == DEFAULT_KID
+        assert jwt.decode(keyring.sign(claims()), "s3cret", algorithms=["HS256"])["sub"] == "test@example.com"
+
+    def test_es256_loads_keys_dir(self, monkeypatch, tmp_path):
+        """Test ES256 loads <kid>.pem files and honours JWT_ACTIVE_KID"""
+        source = KeyRing("ES256")
+        for kid in ("k1", "k2"):
+            source.generate_key(kid)
+            (tmp_path / f"{kid}.pem").write_bytes(source._signers[kid].to_pem())
+        monkeypatch.setenv("JWT_ALGORITHM", "ES256")
+        monkeypatch.setenv("JWT_KEYS_DIR", str(tmp_path))
+        monkeypatch.setenv("JWT_ACTIVE_KID", "k1")
+
+        keyring = load_keyring()
+
+        assert keyring.active_kid == "k1"
+        assert "k2" in keyring
+        assert source.verify(keyring.sign(claims()))["sub"] == "test@example.com"
+
+    @pytest.mark.parametrize("keys_dir", [None, "missing", "empty"])
+    def test_es256_without_keys_fails(self, monkeypatch, tmp_path, keys_dir):
+        """Test ES256 refuses to start without keys unless ephemeral keys are allowed"""
+        monkeypatch.setenv("JWT_ALGORITHM", "ES256")
+        if keys_dir:
+            (tmp_path / "empty").mkdir()
+            monkeypatch.setenv("JWT_KEYS_DIR", str(tmp_path / keys_dir))
+
+        with pytest.raises(ValueError, match="JWT_ALLOW_EPHEMERAL_KEYS"):
+            load_keyring()
+
+    def test_es256_ephemeral_key_when_allowed(self, monkeypatch):
+        """Test the development flag allows a generated per-process key"""
+        monkeypatch.setenv("JWT_ALGORITHM", "ES256")
+        monkeypatch.setenv("JWT_ALLOW_EPHEMERAL_KEYS", "true")
+
+        keyring = load_keyring()
+
+        assert keyring.active_kid is not None
+        assert keyring.verify(keyring.sign(claims()))["sub"] == "test@example.com"
+
+
+class TestAuthServiceKeyRotation:
+    """Test cases for AuthService with key rotation"""
+
+    def test_cached_token_rejected_after_retire(self):
+        """Test a cached verification is dropped once its key is retired"""
+        keyring = KeyRing("ES256")
+        keyring.generate_key("k1")
+        auth_module.get_verified_token_cache().clear()
+        with patch("services.auth_service.get_keyring", return_value=keyring):
+            service = AuthService(MagicMock(), MagicMock())
+            token = service.create_access_token({"sub": "test@example.com"})
+            assert service.verify_token(token, TokenType.ACCESS) is not None
+
+            keyring.rotate(kid="k2")
+            keyring.retire("k1")
+
+            assert service.verify_token(token, TokenType.ACCESS) is None
+        auth_module.get_verified_token_cache().clear()
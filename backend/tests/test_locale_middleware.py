@@ -0,0 +1,121 @@
+"""
+Unit tests for locale negotiation and the locale middleware
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from i18n.middleware import LocaleMiddleware, negotiate_locale, parse_accept_language
+
+SUPPORTED = ['en', 'id', 'zh', 'ja', 'pt', 'es']
+
+
+def build_app(**kwargs) -> FastAPI:
+    """Create an app wrapped in LocaleMiddleware that echoes the resolved locale"""
+    app = FastAPI()
+
+    @app.get("/locale")
+    async def locale(request: Request):
+        return {"locale": request.state.locale}
+
+    app.add_middleware(LocaleMiddleware, **kwargs)
+    return app
+
+
+class TestNegotiateLocale:
+    """Test cases for Accept-Language parsing and negotiation"""
+
+    def test_parse_orders_by_q(self):
+        """Test ranges are sorted by q, keeping header order on ties"""
+        ranges = parse_accept_language("fr;q=0.5, ja, EN-us;q=0.8, es")
+
+        assert ranges == [("ja", 1.0), ("es", 1.0), ("en-us", 0.8), ("fr", 0.5)]
+
+    def test_parse_malformed_q_is_not_acceptable(self):
+        """Test a malformed q-value counts as zero"""
+        assert parse_accept_language("ja;q=abc") == [("ja", 0.0)]
+
+    @pytest.mark.parametrize("q", ["nan", "inf", "1e0", "1.5", "0.1234", "-0", ".5", "1.001"])
+    def test_parse_q_outside_rfc_grammar_is_not_acceptable(self, q):
+        """Test q-values outside the RFC 9110 qvalue grammar count as zero"""
+        assert parse_accept_language(f"ja;q={q}") == [("ja", 0.0)]
+
+    def test_parse_q_within_rfc_grammar(self):
+        """Test valid q-values are read as given"""
+        ranges = parse_accept_language("a;q=1.000, b;Q=0.125, c;q=0., d;q=1")
+
+        assert ranges == [("a", 1.0), ("d", 1.0), ("b", 0.125), ("c", 0.0)]
+
+    def test_highest_q_wins(self):
+        """Test the most preferred supported range is chosen"""
+        assert negotiate_locale("en;q=0.3, ja;q=0.9, zh;q=0.5", SUPPORTED, "en") == "ja"
+
+    def test_subtag_fallback(self):
+        """Test region and script subtags are dropped until a locale matches"""
+        assert negotiate_locale("zh-Hant-TW", SUPPORTED, "en") == "zh"
+        assert negotiate_locale("pt-BR,pt;q=0.9", SUPPORTED, "en") == "pt"
+
+    def test_unsupported_falls_back_to_default(self):
+        """Test the default is used when nothing acceptable is supported"""
+        assert negotiate_locale("fr-FR, de;q=0.8", SUPPORTED, "en") == "en"
+        assert negotiate_locale("", SUPPORTED, "en") == "en"
+
+    def test_q_zero_excludes(self):
+        """Test q=0 ranges are never chosen, including through the wildcard"""
+        assert negotiate_locale("ja;q=0, *;q=0.5", ["ja", "es"], "en") == "es"
+
+
+class TestLocaleMiddleware:
+    """Test cases for LocaleMiddleware"""
+
+    def test_negotiates_accept_language(self):
+        """Test the locale comes from Accept-Language and is remembered in a cookie"""
+        client = TestClient(build_app())
+        response = client.get("/locale", headers={"Accept-Language": "fr, ja;q=0.9"})
+
+        assert response.json() == {"locale": "ja"}
+        assert "ascend_locale=ja" in response.headers["set-cookie"]
+
+    def test_query_overrides_cookie(self):
+        """Test ?lang= wins over the cookie and updates it"""
+        client = TestClient(build_app(), cookies={"ascend_locale": "es"})
+        response = client.get("/locale?lang=id")
+
+        assert response.json() == {"locale": "id"}
+        assert "ascend_locale=id" in response.headers["set-cookie"]
+
+    def test_unsupported_query_is_ignored(self):
+        """Test an unsupported ?lang= falls through to negotiation"""
+        client = TestClient(build_app())
+        response = client.get("/locale?lang=xx", headers={"Accept-Language": "es"})
+
+        assert response.json() == {"locale": "es"}
+
+    def test_no_cookie_when_unchanged(self):
+        """Test the cookie is not re-sent when it already holds the locale"""
+        client = TestClient(build_app(), cookies={"ascend_locale": "zh"})
+        response = client.get("/locale", headers={"Accept-Language": "ja"})
+
+        assert response.json() == {"locale": "zh"}
+        assert "set-cookie" not in response.headers
+
+    def test_cookie_read_past_malformed_cookies(self):
+        """Test the locale cookie is found next to cookies SimpleCookie would reject"""
+        client = TestClient(build_app())
+        response = client.get("/locale", headers={"Cookie": "foo=bar baz; ascend_locale=ja", "Accept-Language": "es"})
+
+        assert response.json() == {"locale": "ja"}
+        assert "set-cookie" not in response.headers
+
+    def test_caches_negotiation(self):
+        """Test repeated Accept-Language headers are negotiated once"""
+        app = build_app(cache_size=8)
+        for _ in range(3):
+            # A fresh client each time, so no locale cookie short-circuits negotiation
+            TestClient(app).get("/locale", headers={"Accept-Language": "pt-BR,pt;q=0.9"})
+
+        middleware = app.middleware_stack
+        while not isinstance(middleware, LocaleMiddleware):
+            middleware = middleware.app
+        info = middleware._negotiate.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
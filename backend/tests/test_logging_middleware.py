@@ -0,0 +1,68 @@
+"""
+Unit tests for the request logging middleware
+"""
+import logging
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from middleware.logging_middleware import LoggingMiddleware
+
+
+def build_client(sample_rate: int = 1) -> TestClient:
+    """Create a test client for an app wrapped in LoggingMiddleware"""
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @app.get("/missing")
+    async def missing():
+        return StreamingResponse(iter([b"gone"]), status_code=404)
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse((f"{i}\n".encode() for i in range(3)), media_type="text/plain")
+
+    app.add_middleware(LoggingMiddleware, sample_rate=sample_rate)
+    return TestClient(app)
+
+
+class TestLoggingMiddleware:
+    """Test cases for LoggingMiddleware"""
+
+    def test_adds_response_headers(self):
+        """Test request id and process time headers are added"""
+        response = build_client().get("/ok", headers={"X-Request-ID": "abc"})
+
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "abc"
+        assert float(response.headers["X-Process-Time"]) >= 0
+
+    def test_streaming_response_passes_through(self):
+        """Test streamed bodies are forwarded intact"""
+        response = build_client().get("/stream")
+
+        assert response.text == "0\n1\n2\n"
+        assert "X-Process-Time" in response.headers
+
+    def test_samples_successful_requests(self, caplog):
+        """Test only 1 in N successful requests is logged"""
+        client = build_client(sample_rate=3)
+
+        with caplog.at_level(logging.INFO, logger="middleware.logging_middleware"):
+            for _ in range(6):
+                client.get("/ok")
+
+        assert len(caplog.records) == 2
+
+    def test_errors_always_logged(self, caplog):
+        """Test failed requests bypass sampling"""
+        client = build_client(sample_rate=100)
+
+        with caplog.at_level(logging.INFO, logger="middleware.logging_middleware"):
+            for _ in range(3):
+                client.get("/missing")
+
+        assert len(caplog.records) == 3
+        assert "Status: 404" in caplog.records[0].getMessage()
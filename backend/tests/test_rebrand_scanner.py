@@ -0,0 +1,197 @@
+"""
+Unit tests for RebrandScanner, file scanning and the scan manifest
+"""
+import os
+import mmap
+import pytest
+from utils.file_scan import is_scannable, iter_matches
+from utils import rebrand_scanner
+from utils.rebrand_scanner import RebrandScanner
+from utils.scan_manifest import ScanManifest
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Small tree with identifiers in a few files"""
+    (tmp_path / "app.py").write_text("import zenuml\n\nname = 'ZenUML'  # Zen UML\n", encoding="utf-8")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "README.md").write_text("# zen-uml\nZENUML_KEY\n", encoding="utf-8")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("zenuml\n", encoding="utf-8")
+    (tmp_path / "clean.txt").write_text("nothing here\n", encoding="utf-8")
+    return tmp_path
+
+
+class TestRebrandScanner:
+    """Test cases for RebrandScanner"""
+
+    def test_scan_finds_every_identifier(self, tree):
+        """Test matches carry the identifier, replacement and line number"""
+        results = RebrandScanner(str(tree), workers=1).scan()
+
+        found = sorted((r['file'], r['line'], r['old'], r['new']) for r in results)
+        assert found == [
+            ('app.py', 1, 'zenuml', 'ascend'),
+            ('app.py', 3, 'Zen UML', 'Ascend'),
+            ('app.py', 3, 'ZenUML', 'Ascend'),
+            ('docs/README.md', 1, 'zen-uml', 'ascend'),
+            ('docs/README.md', 2, 'ZENUML', 'ASCEND'),
+        ]
+
+    def test_matches_grouped_by_file_in_order(self, tree):
+        """Test each file's matches stream out together, in position order"""
+        results = list(RebrandScanner(str(tree), workers=1).iter_scan())
+        app = [r for r in results if r['file'] == 'app.py']
+
+        assert [r['old'] for r in app] == ['zenuml', 'ZenUML', 'Zen UML']
+
+    def test_process_pool_matches_serial(self, tree):
+        """Test the worker pool produces the same results as scanning in-process"""
+        serial = RebrandScanner(str(tree), workers=1).scan()
+        parallel = RebrandScanner(str(tree), workers=2).scan()
+
+        assert parallel == serial
+
+    def test_report(self, tree):
+        """Test the report lists occurrences per file"""
+        scanner = RebrandScanner(str(tree), workers=1)
+        assert scanner.report() == "✓ No old identifiers found!"
+
+        scanner.scan()
+        report = scanner.report()
+
+        assert report.startswith("Found 5 occurrences")
+        assert "Line 2: ZENUML → ASCEND" in report
+    def test_skips_binary_and_oversized_files(self, tree):
+        """Test files with NUL bytes or over the size cap are not scanned"""
+        (tree / "logo.bin").write_bytes(b"\0\1ZenUML")
+        (tree / "bundle.js").write_text("zenuml;" * 100, encoding="utf-8")
+
+        results = RebrandScanner(str(tree), workers=1, max_file_size=200).scan()
+        files = {r['file'] for r in results}
+
+        assert "logo.bin" not in files
+        assert "bundle.js" not in files
+        assert "app.py" in files
+
+
+class TestIterMatches:
+    """Test cases for chunked file matching"""
+
+    def test_matches_across_chunk_boundaries(self, tmp_path):
+        """Test matches split by a window boundary are found exactly once"""
+        page = mmap.PAGESIZE
+        content = bytearray(b"x" * (page * 3))
+        for offset in (page - 3, 2 * page - 1, 2 * page + 10):
+            content[offset:offset + 6] = b"ZenUML"
+        content[10:11] = b"\n"
+        path = tmp_path / "big.txt"
+        path.write_bytes(bytes(content))
+
+        matches = list(iter_matches(path, RebrandScanner.PATTERN, RebrandScanner.MAX_MATCH_LENGTH, context=4, chunk_size=page))
+
+        assert [m.offset for m in matches] == [page - 3, 2 * page - 1, 2 * page + 10]
+        assert all(m.line == 2 and m.text == b"ZenUML" for m in matches)
+        assert matches[0].context == b"xxxxZenUMLxxxx"
+
+    def test_line_numbers(self, tmp_path):
+        """Test line numbers are counted incrementally across chunks"""
+        path = tmp_path / "lines.txt"
+        path.write_bytes(b"".join(b"zen_uml\n" if i % 1000 == 0 else b"plain line\n" for i in range(5000)))
+
+        matches = list(iter_matches(path, RebrandScanner.PATTERN, RebrandScanner.MAX_MATCH_LENGTH, chunk_size=mmap.PAGESIZE))
+
+        assert [m.line for m in matches] == [1, 1001, 2001, 3001, 4001]
+
+    def test_is_scannable(self, tmp_path):
+        """Test empty, binary and oversized files are rejected"""
+        (tmp_path / "empty").write_bytes(b"")
+        (tmp_path / "binary").write_bytes(b"abc\0def")
+        (tmp_path / "text").write_bytes(b"abcdef")
+
+        assert not is_scannable(tmp_path / "empty")
+        assert not is_scannable(tmp_path / "binary")
+        assert is_scannable(tmp_path / "text")
+        assert not is_scannable(tmp_path / "text", max_file_size=3)
+        assert not is_scannable(tmp_path / "missing")
+
+
+class TestScanManifest:
+    """Test cases for incremental scans"""
+
+    def scan(self, tree, manifest_path, **kwargs):
+        """Scan with a manifest, returning the scanner and sorted results"""
+        scanner = RebrandScanner(str(tree), workers=1)
+        with ScanManifest(str(manifest_path), scanner.fingerprint()) as manifest:
+            results = scanner.scan(manifest=manifest, **kwargs)
+        return scanner, sorted((r['file'], r['line'], r['old']) for r in results)
+
+    def test_unchanged_files_are_not_reread(self, tree, tmp_path):
+        """Test a repeat scan serves every file from the manifest"""
+        manifest_path = tmp_path / "manifest.sqlite"
+        first, first_results = self.scan(tree, manifest_path)
+        second, second_results = self.scan(tree, manifest_path)
+
+        assert first.stats['cached'] == 0
+        assert second.stats == {'cached': 3, 'rehashed': 0, 'scanned': 0}
+        assert second_results == first_results
+
+    def test_changed_and_touched_files(self, tree, tmp_path):
+        """Test edited files are rescanned and touched ones only rehashed"""
+        manifest_path = tmp_path / "manifest.sqlite"
+        self.scan(tree, manifest_path)
+
+        (tree / "clean.txt").write_text("now mentions zen_uml\n", encoding="utf-8")
+        readme = tree / "docs" / "README.md"
+        stat = readme.stat()
+        os.utime(readme, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        scanner, results = self.scan(tree, manifest_path)
+
+        assert scanner.stats == {'cached': 1, 'rehashed': 1, 'scanned': 1}
+        assert ('clean.txt', 1, 'zen_uml') in results
+        assert ('docs/README.md', 2, 'ZENUML') in results
+
+    def test_unscannable_files_are_not_hashed(self, tree, tmp_path, monkeypatch):
+        """Test binary and oversized files are recorded without being hashed"""
+        (tree / "logo.bin").write_bytes(b"\0\1ZenUML")
+        (tree / "bundle.js").write_text("zenuml;" * 100, encoding="utf-8")
+        hashed = []
+        file_sha256 = rebrand_scanner.file_sha256
+        monkeypatch.setattr(rebrand_scanner, "file_sha256", lambda path: hashed.append(path.name) or file_sha256(path))
+        manifest_path = tmp_path / "manifest.sqlite"
+        scanner = RebrandScanner(str(tree), workers=1, max_file_size=200)
+
+        with ScanManifest(str(manifest_path), scanner.fingerprint()) as manifest:
+            scanner.scan(manifest=manifest)
+            entry = manifest.get("bundle.js")
+
+        assert sorted(hashed) == ["README.md", "app.py", "clean.txt"]
+        assert (entry.sha256, entry.results) == ('', [])
+
+    def test_deleted_files_are_pruned(self, tree, tmp_path):
+        """Test a full scan drops entries for files that no longer exist"""
+        manifest_path = tmp_path / "manifest.sqlite"
+        scanner = RebrandScanner(str(tree), workers=1)
+        self.scan(tree, manifest_path)
+        (tree / "app.py").unlink()
+        self.scan(tree, manifest_path)
+
+        with ScanManifest(str(manifest_path), scanner.fingerprint()) as manifest:
+            assert manifest.get("app.py") is None
+            assert manifest.get("clean.txt") is not None
+
+    def test_settings_change_invalidates(self, tree, tmp_path):
+        """Test a different fingerprint discards stored results"""
+        manifest_path = tmp_path / "manifest.sqlite"
+        self.scan(tree, manifest_path)
+
+        with ScanManifest(str(manifest_path), "other-settings") as manifest:
+            assert manifest.get("app.py") is None
+
+    def test_scan_selected_paths(self, tree, tmp_path):
+        """Test only the given paths are scanned, skipping excluded and missing ones"""
+        scanner = RebrandScanner(str(tree), workers=1)
+        results = scanner.scan(paths=["docs/README.md", "node_modules/dep.js", "gone.py"])
+
+        assert {r['file'] for r in results} == {"docs/README.md"}
@@ -0,0 +1,84 @@
+"""
+Unit tests for streaming rebrand report writers
+"""
+import io
+import json
+import pytest
+from utils.report_writers import create_report_writer
+from utils.string_replacer import StringReplacer
+
+MATCH = {'file': 'app.py', 'line': 3, 'old': 'ZenUML', 'new': 'Ascend', 'context': "name = 'ZenUML'"}
+CHANGE = {'file': 'app.py', 'status': 'dry_run', 'counts': {'ZenUML': 2, 'zen_uml': 1}}
+
+
+def write(format: str, matches=(MATCH,), changes=(CHANGE,)) -> str:
+    """Write a report and return its text"""
+    stream = io.StringIO()
+    writer = create_report_writer(format, stream, StringReplacer.REPLACEMENTS)
+    for match in matches:
+        writer.write_match(match)
+    for change in changes:
+        writer.write_change(change)
+    writer.summary.files = 10
+    writer.close()
+    return stream.getvalue()
+
+
+class TestReportWriters:
+    """Test cases for report writers"""
+
+    def test_results_written_before_close(self):
+        """Test each result reaches the stream as soon as it is written"""
+        stream = io.StringIO()
+        writer = create_report_writer('jsonl', stream, StringReplacer.REPLACEMENTS)
+        writer.write_match(MATCH)
+
+        assert json.loads(stream.getvalue()) == {'type': 'match', **MATCH}
+
+    def test_jsonl(self):
+        """Test JSON Lines output ends with a summary record"""
+        records = [json.loads(line) for line in write('jsonl').splitlines()]
+
+        assert [r['type'] for r in records] == ['match', 'change', 'summary']
+        summary = records[-1]
+        assert summary['occurrences'] == {'ZenUML → Ascend': 1}
+        assert summary['replacements'] == {'ZenUML → Ascend': 2, 'zen_uml → ascend': 1}
+        assert summary['files'] == 10
+        assert summary['files_per_second'] > 0
+
+    def test_sarif(self):
+        """Test the SARIF log is a complete document with one result per item"""
+        log = json.loads(write('sarif', matches=[MATCH, {**MATCH, 'line': 9}]))
+
+        run = log['runs'][0]
+        assert log['version'] == '2.1.0'
+        assert [r['ruleId'] for r in run['results']] == [
+            'rebrand/old-identifier', 'rebrand/old-identifier', 'rebrand/replaced'
+        ]
+        assert run['results'][1]['locations'][0]['physicalLocation']['region'] == {'startLine': 9}
+        assert run['properties']['summary']['files_with_occurrences'] == 1
+
+    def test_sarif_without_results(self):
+        """Test an empty SARIF log is still valid JSON"""
+        log = json.loads(write('sarif', matches=(), changes=()))
+
+        assert log['runs'][0]['results'] == []
+
+    def test_text(self):
+        """Test the text report groups matches by file and ends with counts"""
+        report = write('text')
+
+        assert "\napp.py:\n  Line 3: ZenUML → Ascend\n" in report
+        assert "  app.py (3)\n" in report
+        assert "Found 1 occurrences in 1 files:\n  ZenUML → Ascend: 1\n" in report
+        assert "  zen_uml → ascend: 1\n" in report
+        assert "Processed 10 files in" in report
+
+    def test_text_without_results(self):
+        """Test the text footer when nothing was found"""
+        assert "✓ No old identifiers found!" in write('text', matches=(), changes=())
+
+    def test_unknown_format(self):
+        """Test unknown formats are rejected"""
+        with pytest.raises(ValueError):
+            create_report_writer('xml', io.StringIO(), StringReplacer.REPLACEMENTS)
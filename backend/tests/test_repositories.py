@@ -4,7 +4,9 @@ Unit tests for database repositories
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock
-from db.repositories import UserRepository, RefreshTokenRepository, StatusCheckRepository
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from db.repositories import UserRepository, RefreshTokenRepository, StatusCheckRepository, hash_token
 
 
 @pytest.fixture
@@ -99,6 +101,37 @@ class TestUserRepository:
         mock_collection.find_one_and_update.assert_called_once()
 
 
+    @pytest.mark.asyncio
+    async def test_upsert_user(self, mock_db):
+        """Test upsert creates or updates the user in one call"""
+        mock_collection = AsyncMock()
+        mock_collection.find_one_and_update.return_value = {"email": "test@example.com", "name": "Test User"}
+        mock_db.users = mock_collection
+        
+        user = await UserRepository(mock_db).upsert("test@example.com", "Test User")
+        
+        assert user["name"] == "Test User"
+        query, update = mock_collection.find_one_and_update.call_args.args
+        assert query == {"email": "test@example.com"}
+        assert update["$set"]["name"] == "Test User"
+        assert "created_at" in update["$setOnInsert"]
+        assert mock_collection.find_one_and_update.call_args.kwargs["upsert"] is True
+    
+    @pytest.mark.asyncio
+    async def test_upsert_retries_duplicate_key(self, mock_db):
+        """Test a concurrent first-login race is retried once"""
+        mock_collection = AsyncMock()
+        mock_collection.find_one_and_update.side_effect = [
+            DuplicateKeyError("E11000"), {"email": "test@example.com"}
+        ]
+        mock_db.users = mock_collection
+        
+        user = await UserRepository(mock_db).upsert("test@example.com", "Test User")
+        
+        assert user["email"] == "test@example.com"
+        assert mock_collection.find_one_and_update.call_count == 2
+
+
 class TestRefreshTokenRepository:
     """Test cases for RefreshTokenRepository"""
     
@@ -158,6 +191,51 @@ class TestRefreshTokenRepository:
         
         assert count == 3
         mock_collection.update_many.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_create_token_stores_native_expiry(self, mock_db):
+        """Test expires_at is stored as a datetime so the TTL index applies"""
+        mock_collection = AsyncMock()
+        mock_collection.insert_one.return_value = MagicMock(inserted_id="token_id")
+        mock_db.refresh_tokens = mock_collection
+        
+        expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+        await RefreshTokenRepository(mock_db).create("test@example.com", "refresh_token_value", expires_at)
+        
+        stored = mock_collection.insert_one.call_args.args[0]
+        assert stored["expires_at"] == expires_at
+    
+    @pytest.mark.asyncio
+    async def test_token_stored_as_digest(self, mock_db):
+        """Test only the SHA-256 digest of the token reaches the database"""
+        mock_collection = AsyncMock()
+        mock_collection.insert_one.return_value = MagicMock(inserted_id="token_id")
+        mock_collection.find_one.return_value = None
+        mock_db.refresh_tokens = mock_collection
+        repo = RefreshTokenRepository(mock_db)
+        
+        await repo.create("test@example.com", "refresh_token_value", datetime.now(timezone.utc))
+        await repo.find_by_token("refresh_token_value")
+        
+        stored = mock_collection.insert_one.call_args.args[0]
+        assert "token" not in stored
+        assert stored["token_hash"] == hash_token("refresh_token_value")
+        assert len(stored["token_hash"]) == 64
+        mock_collection.find_one.assert_called_once_with(
+            {"token_hash": hash_token("refresh_token_value"), "is_revoked": False}
+        )
+    
+    @pytest.mark.asyncio
+    async def test_purge_revoked(self, mock_db):
+        """Test purging revoked tokens"""
+        mock_collection = AsyncMock()
+        mock_collection.delete_many.return_value = MagicMock(deleted_count=4)
+        mock_db.refresh_tokens = mock_collection
+        
+        count = await RefreshTokenRepository(mock_db).purge_revoked()
+        
+        assert count == 4
+        mock_collection.delete_many.assert_called_once_with({"is_revoked": True})
 
 
 class TestStatusCheckRepository:
@@ -192,3 +270,37 @@ class TestStatusCheckRepository:
         
         assert len(checks) == 2
         assert checks[0]["client_name"] == "client1"
+    
+    @pytest.mark.asyncio
+    async def test_find_page_after_cursor(self, mock_db):
+        """Test keyset pagination continues strictly after the cursor position"""
+        mock_cursor = MagicMock()
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.limit.return_value = mock_cursor
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mock_db.status_checks = MagicMock()
+        mock_db.status_checks.find.return_value = mock_cursor
+        repo = StatusCheckRepository(mock_db)
+        last = {"_id": ObjectId(), "timestamp": datetime(2024, 1, 2, tzinfo=timezone.utc)}
+        
+        await repo.find_page(50, repo.decode_cursor(repo.encode_cursor(last)))
+        
+        mock_db.status_checks.find.assert_called_once_with({"$or": [
+            {"timestamp": {"$lt": last["timestamp"]}},
+            {"timestamp": last["timestamp"], "_id": {"$lt": last["_id"]}},
+        ]})
+        mock_cursor.sort.assert_called_once_with(StatusCheckRepository.PAGE_SORT)
+        mock_cursor.limit.assert_called_once_with(50)
+    
+    def test_cursor_for_legacy_string_timestamp(self):
+        """Test a legacy ISO string timestamp round-trips as a string"""
+        last = {"_id": ObjectId(), "timestamp": "2024-01-01T00:00:00"}
+        
+        position = StatusCheckRepository.decode_cursor(StatusCheckRepository.encode_cursor(last))
+        
+        assert position == ("2024-01-01T00:00:00", last["_id"])
+    
+    def test_decode_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        with pytest.raises(ValueError):
+            StatusCheckRepository.decode_cursor("not-a-cursor")
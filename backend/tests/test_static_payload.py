@@ -0,0 +1,134 @@
+"""
+Unit tests for pre-serialized static payloads
+"""
+import gzip
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from core import static_payload
+from core.static_payload import StaticPayload, parse_accept_encoding
+from core.branding import get_branding
+from routes import branding, i18n
+from i18n.locale_config import SUPPORTED_LOCALES
+from i18n.middleware import LocaleMiddleware
+from core.dependencies import get_current_user
+from models.schemas import TokenData
+
+
+@pytest.fixture
+def client():
+    """Client for the branding and i18n routers"""
+    app = FastAPI()
+    app.include_router(branding.router)
+    app.include_router(i18n.router)
+    app.add_middleware(LocaleMiddleware)
+    app.dependency_overrides[get_current_user] = lambda: TokenData(email="ada@example.com")
+    return TestClient(app)
+
+
+class TestStaticPayload:
+    """Test cases for StaticPayload"""
+
+    def test_parse_accept_encoding(self):
+        """Test q-values are parsed and default to 1"""
+        assert parse_accept_encoding("gzip, br;q=0.5, identity;q=0") == {"gzip": 1.0, "br": 0.5, "identity": 0.0}
+        assert parse_accept_encoding("gzip;Q=0.25") == {"gzip": 0.25}
+
+    @pytest.mark.parametrize("q", ["nan", "inf", "1e0", "2", "0.1234", "abc"])
+    def test_parse_accept_encoding_invalid_q(self, q):
+        """Test q-values outside the RFC 9110 qvalue grammar count as zero"""
+        assert parse_accept_encoding(f"br;q={q}, gzip") == {"br": 0.0, "gzip": 1.0}
+
+    def test_select_encoding(self):
+        """Test the best accepted variant is chosen"""
+        payload = StaticPayload({"a": 1})
+
+        assert payload.select_encoding("") == "identity"
+        assert payload.select_encoding("gzip, deflate") == "gzip"
+        assert payload.select_encoding("gzip;q=0") == "identity"
+        assert payload.select_encoding("deflate") == "identity"
+
+    def test_brotli_preferred_when_available(self):
+        """Test br wins over gzip when the optional brotli package is installed"""
+        payload = StaticPayload({"a": 1})
+        expected = "br" if static_payload.brotli is not None else "gzip"
+
+        assert payload.select_encoding("gzip, br") == expected
+
+    def test_etags_are_strong_and_per_encoding(self):
+        """Test each variant has its own stable strong ETag"""
+        first = StaticPayload({"a": 1})
+        second = StaticPayload({"a": 1})
+
+        assert first.etags == second.etags
+        assert first.etags["identity"].startswith('"')
+        assert len(set(first.etags.values())) == len(first.variants)
+        assert StaticPayload({"a": 2}).etags["identity"] != first.etags["identity"]
+
+    def test_not_modified(self):
+        """Test If-None-Match uses weak comparison against the served variant's ETag"""
+        payload = StaticPayload({"a": 1})
+        etag = payload.etags["gzip"]
+
+        assert payload.not_modified(etag, "gzip")
+        assert payload.not_modified(f'"other", W/{etag}', "gzip")
+        assert payload.not_modified("*", "gzip")
+        assert not payload.not_modified('"other"', "gzip")
+        assert not payload.not_modified("", "gzip")
+        assert not payload.not_modified(etag, "identity")
+
+
+class TestStaticRoutes:
+    """Test cases for branding and locale metadata routes"""
+
+    def test_branding_config(self, client):
+        """Test the config body matches get_branding() with caching headers"""
+        response = client.get("/api/branding/config", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert response.json() == get_branding()
+        assert response.headers["cache-control"] == "public, max-age=300"
+        assert response.headers["etag"] == branding.BRANDING_PAYLOADS["config"].etags["identity"]
+        assert "content-encoding" not in response.headers
+
+    def test_gzip_variant(self, client):
+        """Test gzip clients get the precompressed body"""
+        response = client.get("/api/branding/colors", headers={"Accept-Encoding": "gzip"})
+        raw = branding.BRANDING_PAYLOADS["colors"].variants["gzip"]
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert json.loads(gzip.decompress(raw)) == {"colors": get_branding()["colors"]}
+        assert response.json() == {"colors": get_branding()["colors"]}
+
+    def test_revalidation_returns_304(self, client):
+        """Test a matching If-None-Match gets an empty 304"""
+        etag = client.get("/api/branding/links").headers["etag"]
+        response = client.get("/api/branding/links", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_other_variant_etag_is_not_revalidated(self, client):
+        """Test an ETag for another encoding gets the full body of the served one"""
+        etag = client.get("/api/branding/links", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+        response = client.get("/api/branding/links", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == branding.BRANDING_PAYLOADS["links"].etags["identity"]
+
+    def test_supported_languages(self, client):
+        """Test supported languages are served from the static payload"""
+        response = client.get("/api/i18n/supported-languages")
+
+        assert response.json() == {"languages": SUPPORTED_LOCALES}
+        assert "etag" in response.headers
+
+    def test_user_language_is_negotiated_locale(self, client):
+        """Test the user's language is the locale negotiated for the request"""
+        response = client.get("/api/i18n/language", headers={"Accept-Language": "ja"})
+
+        assert response.status_code == 200
+        assert response.json() == {"language": "ja"}
@@ -0,0 +1,181 @@
+"""
+Unit tests for the status check routes
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from db.repositories import StatusCheckRepository
+from core.dependencies import get_status_repo
+from routes import status as status_routes
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def stored_checks(count: int) -> list:
+    """Status checks as MongoDB returns them, newest first"""
+    return [
+        {"_id": ObjectId(), "client_name": f"client-{i}", "timestamp": NOW - timedelta(seconds=i)}
+        for i in range(count)
+    ]
+
+
+class AsyncCursor:
+    """Motor cursor stand-in that yields the given documents"""
+
+    def __init__(self, docs: list):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+@pytest.fixture
+def mock_db():
+    """Mock database whose status_checks queries return three records"""
+    db = MagicMock()
+    docs = stored_checks(3)
+    cursor = db.status_checks.find.return_value.sort.return_value.limit.return_value
+    cursor.to_list = AsyncMock(side_effect=lambda limit: docs[:limit])
+    cursor.batch_size.return_value = AsyncCursor(docs)
+    return db
+
+
+def build_client(mock_db) -> TestClient:
+    """Create a test client for the status routes with storage mocked"""
+    app = FastAPI()
+    app.include_router(status_routes.router, prefix="/api")
+    app.dependency_overrides[get_status_repo] = lambda: StatusCheckRepository(mock_db)
+    return TestClient(app)
+
+
+class TestGetStatusChecks:
+    """Test cases for GET /api/status"""
+
+    def test_full_page_sets_next_cursor(self, mock_db):
+        """Test a full page carries the cursor after its last record"""
+        response = build_client(mock_db).get("/api/status/?limit=2")
+
+        assert response.status_code == 200
+        page = response.json()
+        assert [check["client_name"] for check in page] == ["client-0", "client-1"]
+        after = StatusCheckRepository.decode_cursor(response.headers["X-Next-Cursor"])
+        assert after == (NOW - timedelta(seconds=1), ObjectId(page[1]["id"]))
+
+    def test_last_page_has_no_cursor(self, mock_db):
+        """Test a short page ends pagination"""
+        response = build_client(mock_db).get("/api/status/?limit=5")
+
+        assert len(response.json()) == 3
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_cursor_selects_after_position(self, mock_db):
+        """Test the after cursor becomes a keyset filter"""
+        cursor = StatusCheckRepository.encode_cursor(stored_checks(1)[0])
+        build_client(mock_db).get("/api/status/", params={"after": cursor})
+
+        query = mock_db.status_checks.find.call_args.args[0]
+        assert query["$or"][0] == {"timestamp": {"$lt": NOW}}
+
+    @pytest.mark.parametrize("after", ["not-a-cursor", "WyIyMDI0Il0="])
+    def test_bad_cursor_is_rejected(self, mock_db, after):
+        """Test an undecodable cursor returns 400 without querying"""
+        response = build_client(mock_db).get("/api/status/", params={"after": after})
+
+        assert response.status_code == 400
+        mock_db.status_checks.find.assert_not_called()
+
+    def test_ndjson_streams_one_record_per_line(self, mock_db):
+        """Test format=ndjson streams every record as a JSON line"""
+        response = build_client(mock_db).get("/api/status/?format=ndjson")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == status_routes.NDJSON_MEDIA_TYPE
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["client_name"] for line in lines] == ["client-0", "client-1", "client-2"]
+        assert lines[0]["timestamp"] == NOW.isoformat()
+        mock_db.status_checks.find.return_value.sort.return_value.limit.assert_called_once_with(0)
+
+
+class TestCreateStatusChecksBulk:
+    """Test cases for POST /api/status/bulk"""
+
+    URL = "/api/status/bulk"
+
+    def test_json_array(self, mock_db):
+        """Test a JSON array is inserted in one write"""
+        mock_db.status_checks.insert_many = AsyncMock()
+        response = build_client(mock_db).post(self.URL, json=[{"client_name": "a"}, {"client_name": " b "}])
+
+        assert response.status_code == 201
+        assert response.json() == {"inserted": 2}
+        documents = mock_db.status_checks.insert_many.call_args.args[0]
+        assert [doc["client_name"] for doc in documents] == ["a", "b"]
+
+    def test_ndjson(self, mock_db):
+        """Test one object per line is accepted with the NDJSON content type, skipping blank lines"""
+        mock_db.status_checks.insert_many = AsyncMock()
+        response = build_client(mock_db).post(
+            self.URL, content=b'{"client_name": "a"}\n\n{"client_name": "b"}\n',
+            headers={"Content-Type": status_routes.NDJSON_MEDIA_TYPE}
+        )
+
+        assert response.status_code == 201
+        assert response.json() == {"inserted": 2}
+
+    @pytest.mark.parametrize("body,content_type", [
+        (b'{"client_name": "a"}', "application/json"),
+        (b'[{"client_name": "a"},', "application/json"),
+        (b'[{"client_name": ""}]', "application/json"),
+        (b'[{"name": "a"}]', "application/json"),
+        (b'["a"]', "application/json"),
+        (b'{"client_name": "a"}\nnot json\n', status_routes.NDJSON_MEDIA_TYPE),
+    ])
+    def test_invalid_batches(self, mock_db, body, content_type):
+        """Test malformed bodies and invalid records return 422 without writing"""
+        mock_db.status_checks.insert_many = AsyncMock()
+        response = build_client(mock_db).post(self.URL, content=body, headers={"Content-Type": content_type})
+
+        assert response.status_code == 422
+        mock_db.status_checks.insert_many.assert_not_awaited()
+
+    @pytest.mark.parametrize("content_type", ["application/json", status_routes.NDJSON_MEDIA_TYPE])
+    def test_batch_size_is_capped(self, mock_db, monkeypatch, content_type):
+        """Test batches over MAX_BULK_SIZE are refused"""
+        monkeypatch.setattr(status_routes, "MAX_BULK_SIZE", 2)
+        items = [{"client_name": str(i)} for i in range(3)]
+        if content_type == status_routes.NDJSON_MEDIA_TYPE:
+            body = "\n".join(json.dumps(item) for item in items).encode()
+        else:
+            body = json.dumps(items).encode()
+
+        response = build_client(mock_db).post(self.URL, content=body, headers={"Content-Type": content_type})
+
+        assert response.status_code == 422
+        assert "At most 2" in response.json()["detail"]
+
+    def test_ndjson_lines_counted_before_decoding(self, mock_db, monkeypatch):
+        """Test an oversized NDJSON batch is refused before any line is decoded"""
+        monkeypatch.setattr(status_routes, "MAX_BULK_SIZE", 2)
+        loads = MagicMock(side_effect=json.loads)
+        monkeypatch.setattr(status_routes.json, "loads", loads)
+
+        with pytest.raises(ValueError):
+            status_routes._parse_bulk_body(b"{}\n{}\n{}\n", status_routes.NDJSON_MEDIA_TYPE)
+        loads.assert_not_called()
+
+    def test_oversized_body_is_refused(self, mock_db, monkeypatch):
+        """Test bodies over MAX_BULK_BODY_BYTES return 413, whether declared or streamed"""
+        monkeypatch.setattr(status_routes, "MAX_BULK_BODY_BYTES", 64)
+        client = build_client(mock_db)
+        body = json.dumps([{"client_name": "x" * 10}] * 5).encode()
+
+        assert client.post(self.URL, content=body).status_code == 413
+        assert client.post(self.URL, content=iter([body[:40], body[40:]])).status_code == 413
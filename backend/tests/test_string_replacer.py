@@ -0,0 +1,92 @@
+"""
+Unit tests for StringReplacer
+"""
+import os
+import stat
+import pytest
+from utils.string_replacer import StringReplacer
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Small tree with identifiers in a few files"""
+    (tmp_path / "app.py").write_text("import zenuml\nname = 'ZenUML'  # Zen UML, zen-uml, zen_uml, ZENUML\n", encoding="utf-8")
+    (tmp_path / "run.sh").write_text("#!/bin/sh\necho zenuml\n", encoding="utf-8")
+    os.chmod(tmp_path / "run.sh", 0o755)
+    (tmp_path / "clean.txt").write_text("nothing here\n", encoding="utf-8")
+    (tmp_path / "logo.bin").write_bytes(b"\0ZenUML")
+    return tmp_path
+
+
+class TestStringReplacer:
+    """Test cases for StringReplacer"""
+
+    def test_dry_run_reports_without_writing(self, tree):
+        """Test a dry run counts replacements and leaves files untouched"""
+        replacer = StringReplacer(str(tree), workers=1)
+        changes = {c['file']: c for c in replacer.replace_all()}
+
+        assert set(changes) == {"app.py", "run.sh"}
+        assert changes["app.py"]['status'] == 'dry_run'
+        assert sum(changes["app.py"]['counts'].values()) == 6
+        assert "zenuml" in (tree / "app.py").read_text(encoding="utf-8")
+
+    def test_replaces_in_single_pass(self, tree):
+        """Test every identifier is rewritten once, binaries untouched"""
+        replacer = StringReplacer(str(tree), dry_run=False, workers=1)
+        replacer.replace_all()
+
+        assert (tree / "app.py").read_text(encoding="utf-8") == (
+            "import ascend\nname = 'Ascend'  # Ascend, ascend, ascend, ASCEND\n"
+        )
+        assert (tree / "logo.bin").read_bytes() == b"\0ZenUML"
+        assert sorted(p.name for p in tree.iterdir()) == ["app.py", "clean.txt", "logo.bin", "run.sh"]
+
+    def test_preserves_file_mode(self, tree):
+        """Test the atomically swapped-in file keeps its permissions"""
+        StringReplacer(str(tree), dry_run=False, workers=1).replace_all()
+
+        assert stat.S_IMODE((tree / "run.sh").stat().st_mode) == 0o755
+        assert (tree / "run.sh").read_text(encoding="utf-8") == "#!/bin/sh\necho ascend\n"
+
+    def test_process_pool_matches_serial(self, tree):
+        """Test the worker pool produces the same changes as replacing in-process"""
+        serial = StringReplacer(str(tree), workers=1).replace_all()
+        parallel = StringReplacer(str(tree), workers=2).replace_all()
+
+        assert sorted(parallel, key=lambda c: c['file']) == sorted(serial, key=lambda c: c['file'])
+
+    def test_large_file_across_chunks(self, tmp_path):
+        """Test files larger than one scan window are rewritten completely"""
+        content = b"".join(b"zen_uml %d ZenUML\n" % i for i in range(200000))
+        (tmp_path / "big.txt").write_bytes(content)
+
+        StringReplacer(str(tmp_path), dry_run=False, workers=1).replace_all()
+
+        assert (tmp_path / "big.txt").read_bytes() == content.replace(b"zen_uml", b"ascend").replace(b"ZenUML", b"Ascend")
+
+    def test_symlinks_are_not_replaced(self, tree, tmp_path_factory):
+        """Test symlinks stay links and files outside the tree are left alone"""
+        outside = tmp_path_factory.mktemp("outside") / "shared.txt"
+        outside.write_text("zenuml\n", encoding="utf-8")
+        (tree / "shared.txt").symlink_to(outside)
+        (tree / "alias.py").symlink_to(tree / "app.py")
+
+        changes = StringReplacer(str(tree), dry_run=False, workers=1).replace_all()
+
+        assert sorted(c['file'] for c in changes) == ["app.py", "run.sh"]
+        assert (tree / "shared.txt").is_symlink()
+        assert (tree / "alias.py").is_symlink()
+        assert outside.read_text(encoding="utf-8") == "zenuml\n"
+        assert (tree / "alias.py").read_text(encoding="utf-8").startswith("import ascend")
+
+    def test_hard_links_stay_linked(self, tree):
+        """Test a hard-linked file is rewritten once, in place, for every link"""
+        os.link(tree / "app.py", tree / "app_link.py")
+
+        changes = StringReplacer(str(tree), dry_run=False, workers=1).replace_all()
+
+        assert len(changes) == 2
+        assert os.path.samefile(tree / "app.py", tree / "app_link.py")
+        assert (tree / "app_link.py").read_text(encoding="utf-8").startswith("import ascend")
+        assert sorted(p.name for p in tree.iterdir()) == ["app.py", "app_link.py", "clean.txt", "logo.bin", "run.sh"]
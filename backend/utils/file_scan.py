@@ -0,0 +1,139 @@
+"""
+Memory-mapped, binary-safe pattern matching over files of any size
+"""
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+# Bytes inspected when deciding whether a file is binary
+SNIFF_SIZE = 8192
+
+# Files larger than this are skipped
+DEFAULT_MAX_FILE_SIZE = 512 * 1024 * 1024
+
+# Bytes matched per window; a multiple of the page size so spent pages can be released
+CHUNK_SIZE = 256 * mmap.PAGESIZE
+
+# madvise is unavailable on Windows
+_CAN_RELEASE = hasattr(mmap.mmap, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')
+
+
+class FileMatch(NamedTuple):
+    """A pattern match located in a file"""
+    offset: int
+    line: int
+    text: bytes
+    context: bytes
+
+
+def is_binary(path: Path) -> bool:
+    """Check the first block of a file for NUL bytes"""
+    with open(path, 'rb') as f:
+        return b'\0' in f.read(SNIFF_SIZE)
+
+
+def is_scannable(path: Path, max_file_size: int = DEFAULT_MAX_FILE_SIZE) -> bool:
+    """Check a file is non-empty text no larger than max_file_size"""
+    try:
+        size = path.stat().st_size
+        return 0 < size <= max_file_size and not is_binary(path)
+    except OSError:
+        return False
+
+
+def may_contain(data: bytes, literals: Iterable[bytes]) -> bool:
+    """Check whether any literal occurs in data; a cheap filter before running a regex"""
+    return any(literal in data for literal in literals)
+
+
+def iter_matches(
+    path: Path,
+    pattern: re.Pattern,
+    max_match_length: int,
+    context: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+    prefilter: Iterable[bytes] = (),
+) -> Iterator[FileMatch]:
+    """
+    Yield every match of a bytes pattern in a file, in order
+
+    The file is memory-mapped and matched one window at a time; each window
+    overlaps the next by the longest possible match so matches that cross a
+    boundary are found once. Pages behind the current window are released,
+    keeping resident memory flat regardless of file size.
+
+    Args:
+        path: File to scan
+        pattern: Compiled bytes pattern
+        max_match_length: Longest text the pattern can match
+        context: Bytes of surrounding text to return with each match
+        chunk_size: Window size, rounded up to a whole number of pages
+        prefilter: Literals every match contains (e.g. prefixes); windows without
+            any of them are skipped without running the pattern
+    """
+    prefilter = tuple(prefilter)
+    chunk_size = max(mmap.PAGESIZE, -(-chunk_size // mmap.PAGESIZE) * mmap.PAGESIZE)
+    overlap = max_match_length
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= chunk_size:
+            # Small files fit in one window; reading them is cheaper than mapping
+            data = f.read()
+            if not prefilter or may_contain(data, prefilter):
+                yield from _iter_buffer_matches(data, pattern, context)
+            return
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        line = 1
+        cursor = 0
+        released = 0
+
+        for chunk_start in range(0, size, chunk_size):
+            chunk_end = min(size, chunk_start + chunk_size)
+            window_start = max(0, chunk_start - context)
+            window = mm[window_start:min(size, chunk_end + overlap + context)]
+
+            search_start = chunk_start - window_start
+            search_end = min(len(window), chunk_end - window_start + overlap)
+            candidates = pattern.finditer(window, search_start, search_end)
+            if prefilter and not may_contain(window, prefilter):
+                candidates = ()
+            for match in candidates:
+                start = window_start + match.start()
+                if start >= chunk_end:
+                    break
+                line += window.count(b'\n', cursor - window_start, match.start())
+                cursor = start
+                yield FileMatch(
+                    offset=start,
+                    line=line,
+                    text=match.group(),
+                    context=window[max(0, match.start() - context):match.end() + context],
+                )
+
+            line += window.count(b'\n', cursor - window_start, chunk_end - window_start)
+            cursor = chunk_end
+
+            # Release pages the next window no longer needs
+            release_end = (chunk_end - context) // mmap.PAGESIZE * mmap.PAGESIZE
+            if _CAN_RELEASE and release_end > released:
+                mm.madvise(mmap.MADV_DONTNEED, released, release_end - released)
+                released = release_end
+
+
+def _iter_buffer_matches(data: bytes, pattern: re.Pattern, context: int) -> Iterator[FileMatch]:
+    """Yield every match of a bytes pattern in an in-memory buffer"""
+    line = 1
+    cursor = 0
+    for match in pattern.finditer(data):
+        line += data.count(b'\n', cursor, match.start())
+        cursor = match.start()
+        yield FileMatch(
+            offset=match.start(),
+            line=line,
+            text=match.group(),
+            context=data[max(0, match.start() - context):match.end() + context],
+        )
@@ -1,11 +1,17 @@
 import os
 import re
+import json
+import hashlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from .file_scan import DEFAULT_MAX_FILE_SIZE, is_scannable, iter_matches
+from .scan_manifest import ScanManifest, file_sha256
 
 class RebrandScanner:
     """Scans codebase for old ZenUML identifiers"""
-    
+
     OLD_IDENTIFIERS = {
         'ZenUML': 'Ascend',
         'zenuml': 'ascend',
@@ -14,74 +20,204 @@ class RebrandScanner:
         'zen-uml': 'ascend',
         'zen_uml': 'ascend'
     }
-    
+
+    # All identifiers in one alternation, longest first so overlapping names match greedily
+    PATTERN = re.compile(b'|'.join(
+        re.escape(old_id.encode()) for old_id in sorted(OLD_IDENTIFIERS, key=len, reverse=True)
+    ))
+    MAX_MATCH_LENGTH = max(len(old_id.encode()) for old_id in OLD_IDENTIFIERS)
+    # Three-byte prefixes found with a C-level substring search before the regex runs
+    PREFIXES = frozenset(old_id.encode()[:3] for old_id in OLD_IDENTIFIERS)
+
+    # Characters of surrounding text kept with each match
+    CONTEXT_CHARS = 50
+
     EXCLUDE_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', '.env'}
     EXCLUDE_FILES = {'.pyc', '.pyo', '.pyd', '.so', '.dll', '.exe'}
-    
-    def __init__(self, root_path: str):
+
+    # Files handed to each worker at a time
+    CHUNK_SIZE = 32
+
+    def __init__(self, root_path: str, workers: Optional[int] = None, max_file_size: int = DEFAULT_MAX_FILE_SIZE):
         self.root_path = Path(root_path)
+        # Worker processes; 1 scans in-process
+        self.workers = workers or os.cpu_count() or 1
+        # Larger files are skipped, as are binaries
+        self.max_file_size = max_file_size
         self.results: List[Dict] = []
-    
-    def scan(self) -> List[Dict]:
+        # Files reused from the manifest, reused after rehashing, and scanned
+        self.stats = {'cached': 0, 'rehashed': 0, 'scanned': 0}
+
+    def scan(self, paths: Optional[Iterable[str]] = None, manifest: Optional[ScanManifest] = None) -> List[Dict]:
         """Scan all files for old identifiers"""
-        for file_path in self._get_files():
-            self._scan_file(file_path)
+        self.results = list(self.iter_scan(paths, manifest))
         return self.results
-    
+
+    def iter_scan(self, paths: Optional[Iterable[str]] = None, manifest: Optional[ScanManifest] = None) -> Iterator[Dict]:
+        """
+        Yield matches as files are scanned, grouped by file
+
+        Args:
+            paths: Scan only these files (relative to the root) instead of the whole tree
+            manifest: Reuse results for files whose size, mtime or content hash is unchanged
+        """
+        files = self._get_files() if paths is None else self._select_files(paths)
+        self.stats = {'cached': 0, 'rehashed': 0, 'scanned': 0}
+        seen = set()
+        # The manifest (and its journal) may live inside the tree being scanned
+        manifest_file = Path(manifest.path).resolve() if manifest else None
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        pending = deque()
+        batch = []
+
+        try:
+            for file_path in files:
+                if manifest_file and file_path.name.startswith(manifest_file.name) \
+                        and file_path.resolve().parent == manifest_file.parent:
+                    continue
+                relative_path = str(file_path.relative_to(self.root_path))
+                seen.add(relative_path)
+                entry = manifest.get(relative_path) if manifest else None
+                if entry is not None:
+                    try:
+                        stat = file_path.stat()
+                    except OSError:
+                        continue
+                    if (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                        self.stats['cached'] += 1
+                        yield from entry.results
+                        continue
+
+                batch.append((file_path, entry.sha256 if entry else None))
+                if len(batch) >= self.CHUNK_SIZE:
+                    pending.append(self._submit(executor, batch, manifest is not None))
+                    batch = []
+                # Stream finished batches, keeping a bounded number in flight
+                while pending and (pending[0].done() or len(pending) > 2 * self.workers):
+                    yield from self._collect(pending.popleft().result(), manifest)
+
+            if batch:
+                pending.append(self._submit(executor, batch, manifest is not None))
+            while pending:
+                yield from self._collect(pending.popleft().result(), manifest)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if manifest is not None and paths is None:
+            manifest.prune(seen)
+
+    def _submit(self, executor: Optional[ProcessPoolExecutor], batch: List[Tuple[Path, Optional[str]]], with_hash: bool) -> Future:
+        """Scan a batch of files in the pool, or in-process when there is no pool"""
+        if executor is not None:
+            return executor.submit(self._scan_batch, batch, with_hash)
+        future = Future()
+        future.set_result(self._scan_batch(batch, with_hash))
+        return future
+
+    def _scan_batch(self, batch: List[Tuple[Path, Optional[str]]], with_hash: bool) -> List[Tuple]:
+        """
+        Scan files, skipping the regex for those whose hash matches the manifest
+
+        Binary and oversized files are neither hashed nor scanned; they are
+        recorded by size and mtime alone.
+
+        Returns:
+            list: (relative path, size, mtime_ns, sha256, results or None if unchanged) per file
+        """
+        scanned = []
+        for file_path, known_sha256 in batch:
+            relative_path = str(file_path.relative_to(self.root_path))
+            try:
+                stat = file_path.stat()
+                if not is_scannable(file_path, self.max_file_size):
+                    scanned.append((relative_path, stat.st_size, stat.st_mtime_ns, '', []))
+                    continue
+                sha256 = file_sha256(file_path) if with_hash else ''
+            except OSError:
+                continue
+            results = None if sha256 and sha256 == known_sha256 else self._scan_file(file_path)
+            scanned.append((relative_path, stat.st_size, stat.st_mtime_ns, sha256, results))
+        return scanned
+
+    def _collect(self, scanned: List[Tuple], manifest: Optional[ScanManifest]) -> Iterator[Dict]:
+        """Yield a finished batch's matches and record them in the manifest"""
+        for relative_path, size, mtime_ns, sha256, results in scanned:
+            if results is None:
+                # Touched but unchanged: reuse what was found last time
+                self.stats['rehashed'] += 1
+                results = manifest.get(relative_path).results
+            else:
+                self.stats['scanned'] += 1
+            if manifest is not None:
+                manifest.put(relative_path, size, mtime_ns, sha256, results)
+            yield from results
+
+    def fingerprint(self) -> str:
+        """Identify the settings scan results depend on, for invalidating a manifest"""
+        settings = json.dumps([self.OLD_IDENTIFIERS, self.max_file_size, self.CONTEXT_CHARS], sort_keys=True)
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    def _select_files(self, paths: Iterable[str]) -> Iterator[Path]:
+        """Get the given files that exist and are not excluded"""
+        for path in paths:
+            file_path = self.root_path / path
+            parts = Path(path).parts
+            if any(part in self.EXCLUDE_DIRS for part in parts[:-1]):
+                continue
+            if any(file_path.name.endswith(ext) for ext in self.EXCLUDE_FILES):
+                continue
+            if file_path.is_file():
+                yield file_path
+
     def _get_files(self):
         """Get all files to scan"""
         for root, dirs, files in os.walk(self.root_path):
             dirs[:] = [d for d in dirs if d not in self.EXCLUDE_DIRS]
-            
+
             for file in files:
                 if not any(file.endswith(ext) for ext in self.EXCLUDE_FILES):
                     yield Path(root) / file
-    
-    def _scan_file(self, file_path: Path):
-        """Scan a single file for old identifiers"""
+
+    def _scan_file(self, file_path: Path) -> List[Dict]:
+        """Scan a single file for old identifiers (callers check it is scannable)"""
+        relative_path = str(file_path.relative_to(self.root_path))
+        results = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (UnicodeDecodeError, PermissionError):
-            return
-        
-        for old_id, new_id in self.OLD_IDENTIFIERS.items():
-            matches = list(re.finditer(re.escape(old_id), content))
-            
-            for match in matches:
-                line_num = content[:match.start()].count('\n') + 1
-                self.results.append({
-                    'file': str(file_path.relative_to(self.root_path)),
-                    'line': line_num,
+            for match in iter_matches(file_path, self.PATTERN, self.MAX_MATCH_LENGTH,
+                                      context=self.CONTEXT_CHARS, prefilter=self.PREFIXES):
+                old_id = match.text.decode()
+                results.append({
+                    'file': relative_path,
+                    'line': match.line,
                     'old': old_id,
-                    'new': new_id,
-                    'context': self._get_context(content, match.start(), match.end())
+                    'new': self.OLD_IDENTIFIERS[old_id],
+                    'context': match.context.decode('utf-8', errors='replace').replace('\n', ' ')
                 })
-    
-    def _get_context(self, content: str, start: int, end: int, chars: int = 50) -> str:
-        """Get context around match"""
-        ctx_start = max(0, start - chars)
-        ctx_end = min(len(content), end + chars)
-        return content[ctx_start:ctx_end].replace('\n', ' ')
-    
+        except OSError:
+            return []
+        return results
+
+    @staticmethod
+    def format_match(match: Dict) -> str:
+        """Format one match as report lines"""
+        return (
+            f"  Line {match['line']}: {match['old']} → {match['new']}\n"
+            f"    Context: ...{match['context']}...\n"
+        )
+
     def report(self) -> str:
         """Generate scan report"""
         if not self.results:
             return "✓ No old identifiers found!"
-        
-        report = f"Found {len(self.results)} occurrences:\n\n"
-        
+
         by_file = {}
         for result in self.results:
-            file = result['file']
-            if file not in by_file:
-                by_file[file] = []
-            by_file[file].append(result)
-        
+            by_file.setdefault(result['file'], []).append(result)
+
+        lines = [f"Found {len(self.results)} occurrences:\n\n"]
         for file, matches in sorted(by_file.items()):
-            report += f"\n{file}:\n"
-            for match in matches:
-                report += f"  Line {match['line']}: {match['old']} → {match['new']}\n"
-                report += f"    Context: ...{match['context']}...\n"
-        
-        return report
+            lines.append(f"\n{file}:\n")
+            lines.extend(self.format_match(match) for match in matches)
+
+        return ''.join(lines)
@@ -0,0 +1,222 @@
+"""
+Streaming report writers for rebrand scans and replacements
+"""
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, TextIO
+from .rebrand_scanner import RebrandScanner
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_VERSION = '2.1.0'
+
+# Rule ids used in SARIF results
+RULE_OLD_IDENTIFIER = 'rebrand/old-identifier'
+RULE_REPLACED = 'rebrand/replaced'
+
+
+class ReportSummary:
+    """Running totals for the summary footer"""
+
+    def __init__(self):
+        self.occurrences: Counter = Counter()
+        self.replacements: Counter = Counter()
+        self.matched_files = set()
+        self.changed_files = 0
+        self.files = 0
+        self.started = time.perf_counter()
+
+    def add_match(self, match: Dict):
+        """Count a scan match"""
+        self.occurrences[f"{match['old']} → {match['new']}"] += 1
+        self.matched_files.add(match['file'])
+
+    def add_change(self, change: Dict, replacements: Dict[str, str]):
+        """Count a replaced (or would-be replaced) file"""
+        self.changed_files += 1
+        for old, count in change.get('counts', {}).items():
+            self.replacements[f"{old} → {replacements[old]}"] += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the summary as plain data"""
+        elapsed = time.perf_counter() - self.started
+        return {
+            'occurrences': dict(self.occurrences),
+            'files_with_occurrences': len(self.matched_files),
+            'replacements': dict(self.replacements),
+            'files_changed': self.changed_files,
+            'files': self.files,
+            'elapsed_seconds': round(elapsed, 3),
+            'files_per_second': round(self.files / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+class ReportWriter:
+    """Writes each result as soon as it is produced, then a summary footer"""
+
+    def __init__(self, stream: TextIO, replacements: Dict[str, str]):
+        self.stream = stream
+        self.replacements = replacements
+        self.summary = ReportSummary()
+
+    def write_match(self, match: Dict):
+        """Write one scan match"""
+        self.summary.add_match(match)
+
+    def write_change(self, change: Dict):
+        """Write one replaced file"""
+        self.summary.add_change(change, self.replacements)
+
+    def close(self):
+        """Write the summary footer"""
+        self.stream.flush()
+
+
+class TextReportWriter(ReportWriter):
+    """Human-readable report, grouped by file"""
+
+    def __init__(self, stream: TextIO, replacements: Dict[str, str]):
+        super().__init__(stream, replacements)
+        self._current_file = None
+        self._changes_started = False
+
+    def write_match(self, match: Dict):
+        super().write_match(match)
+        if match['file'] != self._current_file:
+            self._current_file = match['file']
+            self.stream.write(f"\n{match['file']}:\n")
+        self.stream.write(RebrandScanner.format_match(match))
+
+    def write_change(self, change: Dict):
+        super().write_change(change)
+        if not self._changes_started:
+            self._changes_started = True
+            mode = "DRY RUN - Would replace" if change['status'] == 'dry_run' else "Replaced"
+            self.stream.write(f"{mode} in:\n\n")
+        total = sum(change.get('counts', {}).values())
+        self.stream.write(f"  {change['file']} ({total})\n")
+
+    def close(self):
+        summary = self.summary.to_dict()
+        lines = ["\n"]
+        if summary['occurrences']:
+            lines.append(
+                f"Found {sum(summary['occurrences'].values())} occurrences "
+                f"in {summary['files_with_occurrences']} files:\n"
+            )
+            lines.extend(f"  {name}: {count}\n" for name, count in summary['occurrences'].items())
+        if summary['replacements']:
+            lines.append(
+                f"{sum(summary['replacements'].values())} replacements "
+                f"in {summary['files_changed']} files:\n"
+            )
+            lines.extend(f"  {name}: {count}\n" for name, count in summary['replacements'].items())
+        if not summary['occurrences'] and not summary['replacements']:
+            lines.append("✓ No old identifiers found!\n")
+        lines.append(
+            f"Processed {summary['files']} files in {summary['elapsed_seconds']:.2f}s "
+            f"({summary['files_per_second']:.0f} files/s)\n"
+        )
+        self.stream.write(''.join(lines))
+        super().close()
+
+
+class JsonlReportWriter(ReportWriter):
+    """One JSON object per line; the last line is the summary"""
+
+    def _write(self, record: Dict):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def write_match(self, match: Dict):
+        super().write_match(match)
+        self._write({'type': 'match', **match})
+
+    def write_change(self, change: Dict):
+        super().write_change(change)
+        self._write({'type': 'change', **change})
+
+    def close(self):
+        self._write({'type': 'summary', **self.summary.to_dict()})
+        super().close()
+
+
+class SarifReportWriter(ReportWriter):
+    """SARIF 2.1.0 log with a single run, streamed result by result"""
+
+    def __init__(self, stream: TextIO, replacements: Dict[str, str]):
+        super().__init__(stream, replacements)
+        self._results = 0
+        tool = {
+            'driver': {
+                'name': 'migrate_rebrand',
+                'rules': [
+                    {
+                        'id': RULE_OLD_IDENTIFIER,
+                        'shortDescription': {'text': 'Old ZenUML identifier'},
+                        'defaultConfiguration': {'level': 'warning'},
+                    },
+                    {
+                        'id': RULE_REPLACED,
+                        'shortDescription': {'text': 'Old identifiers replaced'},
+                        'defaultConfiguration': {'level': 'note'},
+                    },
+                ],
+            }
+        }
+        # Open the log up to the results array; close() completes the document
+        self.stream.write(
+            f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": {json.dumps(SARIF_VERSION)}, '
+            f'"runs": [{{"tool": {json.dumps(tool)}, "results": [\n'
+        )
+
+    def _write(self, result: Dict):
+        separator = ',\n' if self._results else ''
+        self.stream.write(separator + json.dumps(result, ensure_ascii=False))
+        self._results += 1
+
+    @staticmethod
+    def _location(file: str, line: int = None) -> Dict:
+        location = {'physicalLocation': {'artifactLocation': {'uri': file}}}
+        if line is not None:
+            location['physicalLocation']['region'] = {'startLine': line}
+        return location
+
+    def write_match(self, match: Dict):
+        super().write_match(match)
+        self._write({
+            'ruleId': RULE_OLD_IDENTIFIER,
+            'level': 'warning',
+            'message': {'text': f"{match['old']} → {match['new']}"},
+            'locations': [self._location(match['file'], match['line'])],
+        })
+
+    def write_change(self, change: Dict):
+        super().write_change(change)
+        counts = ', '.join(f"{old} × {count}" for old, count in change.get('counts', {}).items())
+        self._write({
+            'ruleId': RULE_REPLACED,
+            'level': 'note',
+            'message': {'text': f"{change['status']}: {counts}"},
+            'locations': [self._location(change['file'])],
+        })
+
+    def close(self):
+        properties = json.dumps({'summary': self.summary.to_dict()}, ensure_ascii=False)
+        self.stream.write('\n], "properties": ' + properties + '}]}\n')
+        super().close()
+
+
+REPORT_WRITERS = {
+    'text': TextReportWriter,
+    'jsonl': JsonlReportWriter,
+    'sarif': SarifReportWriter,
+}
+
+
+def create_report_writer(format: str, stream: TextIO, replacements: Dict[str, str]) -> ReportWriter:
+    """Get a report writer for an output format"""
+    try:
+        writer_class = REPORT_WRITERS[format]
+    except KeyError:
+        raise ValueError(f"Unknown report format: {format}")
+    return writer_class(stream, replacements)
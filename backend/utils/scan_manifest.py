@@ -0,0 +1,85 @@
+"""
+Persistent per-file cache of rebrand scan results
+"""
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Bytes read at a time when hashing
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ManifestEntry(NamedTuple):
+    """What a file looked like when it was last scanned, and what was found"""
+    size: int
+    mtime_ns: int
+    sha256: str
+    results: List[Dict]
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file's content without reading it whole"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ScanManifest:
+    """
+    SQLite file of scan results keyed by relative path
+
+    The fingerprint identifies the scan settings (identifiers, size cap);
+    stored results are discarded when it changes.
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT, results TEXT);"
+        )
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != fingerprint:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+            self.conn.commit()
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """Get the recorded entry for a file"""
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, sha256, results FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        return ManifestEntry(row[0], row[1], row[2], json.loads(row[3]))
+
+    def put(self, path: str, size: int, mtime_ns: int, sha256: str, results: List[Dict]) -> None:
+        """Record a file's state and scan results"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, sha256, json.dumps(results, ensure_ascii=False)),
+        )
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Remove entries for files not in `keep`; returns the number removed"""
+        keep = set(keep)
+        stale = [(path,) for (path,) in self.conn.execute("SELECT path FROM files") if path not in keep]
+        self.conn.executemany("DELETE FROM files WHERE path = ?", stale)
+        return len(stale)
+
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self) -> 'ScanManifest':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,10 +1,25 @@
 import os
+import re
+import stat
+import shutil
+import logging
+import tempfile
+import contextlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict
+from typing import BinaryIO, Callable, List, Dict, Iterator, Optional
+from .file_scan import DEFAULT_MAX_FILE_SIZE, SNIFF_SIZE, FileMatch, iter_matches, may_contain
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied at a time between replacements
+COPY_BLOCK_SIZE = 1024 * 1024
 
 class StringReplacer:
     """Replaces old identifiers with new ones"""
-    
+
     REPLACEMENTS = {
         'ZenUML': 'Ascend',
         'zenuml': 'ascend',
@@ -13,62 +28,210 @@ class StringReplacer:
         'zen-uml': 'ascend',
         'zen_uml': 'ascend'
     }
-    
+
+    # All identifiers in one alternation, longest first, so each file is rewritten in a single pass
+    PATTERN = re.compile(b'|'.join(
+        re.escape(old.encode()) for old in sorted(REPLACEMENTS, key=len, reverse=True)
+    ))
+    MAX_MATCH_LENGTH = max(len(old.encode()) for old in REPLACEMENTS)
+    # Three-byte prefixes found with a C-level substring search before the regex runs
+    PREFIXES = frozenset(old.encode()[:3] for old in REPLACEMENTS)
+    BYTE_REPLACEMENTS = {old.encode(): new.encode() for old, new in REPLACEMENTS.items()}
+
     EXCLUDE_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', '.env'}
     EXCLUDE_FILES = {'.pyc', '.pyo', '.pyd', '.so', '.dll', '.exe'}
-    
-    def __init__(self, root_path: str, dry_run: bool = True):
+    EXCLUDE_SUFFIXES = tuple(EXCLUDE_FILES)
+
+    # Files handed to each worker at a time
+    CHUNK_SIZE = 32
+
+    def __init__(self, root_path: str, dry_run: bool = True, max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+                 workers: Optional[int] = None):
         self.root_path = Path(root_path)
         self.dry_run = dry_run
+        # Larger files are skipped, as are binaries
+        self.max_file_size = max_file_size
+        # Worker processes; 1 replaces in-process
+        self.workers = workers or os.cpu_count() or 1
         self.changes: List[Dict] = []
-    
+        self.files_processed = 0
+
     def replace_all(self) -> List[Dict]:
         """Replace all old identifiers"""
-        for file_path in self._get_files():
-            self._replace_in_file(file_path)
+        self.changes = list(self.iter_replace())
         return self.changes
-    
-    def _get_files(self):
-        """Get all files to process"""
-        for root, dirs, files in os.walk(self.root_path):
-            dirs[:] = [d for d in dirs if d not in self.EXCLUDE_DIRS]
-            
-            for file in files:
-                if not any(file.endswith(ext) for ext in self.EXCLUDE_FILES):
-                    yield Path(root) / file
-    
-    def _replace_in_file(self, file_path: Path):
+
+    def iter_replace(self) -> Iterator[Dict]:
+        """Yield each changed file as soon as it has been processed"""
+        # List the tree up front so temp files created by rewrites are never walked
+        files = self._get_files() if self.dry_run else list(self._get_files())
+        self.files_processed = 0
+
+        if self.workers == 1:
+            for change in map(self._replace_in_file, files):
+                self.files_processed += 1
+                if change:
+                    yield change
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for change in executor.map(self._replace_in_file, files, chunksize=self.CHUNK_SIZE):
+                self.files_processed += 1
+                if change:
+                    yield change
+
+    def _get_files(self) -> Iterator[str]:
+        """
+        Get all files to process
+
+        Symlinks are not followed, since swapping in a rewritten file would replace
+        the link itself, and a file with several hard links in the tree is listed once.
+        """
+        seen = set()
+        pending = [str(self.root_path)]
+        while pending:
+            directory = pending.pop()
+            try:
+                device = os.stat(directory).st_dev
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.EXCLUDE_DIRS:
+                        pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and not entry.name.endswith(self.EXCLUDE_SUFFIXES):
+                    inode = (device, entry.inode())
+                    if inode not in seen:
+                        seen.add(inode)
+                        yield entry.path
+
+    def _replace_in_file(self, file_path: str) -> Optional[Dict]:
         """Replace identifiers in a single file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (UnicodeDecodeError, PermissionError):
-            return
-        
-        original_content = content
-        
-        for old, new in self.REPLACEMENTS.items():
-            content = content.replace(old, new)
-        
-        if content != original_content:
-            self.changes.append({
-                'file': str(file_path.relative_to(self.root_path)),
-                'status': 'dry_run' if self.dry_run else 'replaced'
-            })
-            
-            if not self.dry_run:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-    
+            with open(file_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                size = st.st_size
+                if not 0 < size <= self.max_file_size:
+                    return None
+                data = f.read(SNIFF_SIZE)
+                if b'\0' in data:
+                    return None
+                # Files that fit in one buffer are rewritten in memory; larger ones are streamed
+                if size <= COPY_BLOCK_SIZE:
+                    data += f.read()
+                else:
+                    data = None
+
+            if data is None:
+                counts = self._replace_streaming(file_path, st)
+            else:
+                counts = self._replace_buffer(file_path, st, data)
+        except OSError as e:
+            logger.error(f"Error replacing identifiers in {file_path}: {e}")
+            return None
+
+        if not counts:
+            return None
+        return {
+            'file': os.path.relpath(file_path, self.root_path),
+            'status': 'dry_run' if self.dry_run else 'replaced',
+            'counts': dict(counts)
+        }
+
+    def _replace_buffer(self, file_path: str, st: os.stat_result, data: bytes) -> Counter:
+        """Replace identifiers in a file already read into memory"""
+        counts = Counter()
+        if not may_contain(data, self.PREFIXES):
+            return counts
+
+        def substitute(match: re.Match) -> bytes:
+            counts[match.group().decode()] += 1
+            return self.BYTE_REPLACEMENTS[match.group()]
+
+        content = self.PATTERN.sub(substitute, data)
+        if counts and not self.dry_run:
+            self._write_atomic(file_path, st, lambda dst: dst.write(content))
+        return counts
+
+    def _replace_streaming(self, file_path: str, st: os.stat_result) -> Counter:
+        """Replace identifiers in a large file without loading it whole"""
+        matches = iter_matches(file_path, self.PATTERN, self.MAX_MATCH_LENGTH, prefilter=self.PREFIXES)
+        if self.dry_run:
+            return Counter(match.text.decode() for match in matches)
+
+        first = next(matches, None)
+        if first is None:
+            return Counter()
+        return self._rewrite(file_path, st, chain([first], matches))
+
+    def _rewrite(self, file_path: str, st: os.stat_result, matches: Iterator[FileMatch]) -> Counter:
+        """Copy the file with each match replaced, reading it sequentially"""
+        counts = Counter()
+
+        def write(dst: BinaryIO):
+            with open(file_path, 'rb') as src:
+                position = 0
+                for match in matches:
+                    _copy_bytes(src, dst, match.offset - position)
+                    dst.write(self.BYTE_REPLACEMENTS[match.text])
+                    src.seek(len(match.text), os.SEEK_CUR)
+                    position = match.offset + len(match.text)
+                    counts[match.text.decode()] += 1
+                shutil.copyfileobj(src, dst, COPY_BLOCK_SIZE)
+
+        self._write_atomic(file_path, st, write)
+        return counts
+
+    @staticmethod
+    def _write_atomic(file_path: str, st: os.stat_result, write: Callable[[BinaryIO], object]):
+        """
+        Write through a temp file in the same directory, then swap it in with os.replace
+
+        A file with other hard links is copied back over in place instead, so every
+        link sees the new content; that copy is not atomic.
+        """
+        directory, name = os.path.split(file_path)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.')
+        swap = st.st_nlink == 1
+        try:
+            with os.fdopen(fd, 'w+b') as dst:
+                write(dst)
+                if swap:
+                    os.fchmod(dst.fileno(), stat.S_IMODE(st.st_mode))
+                else:
+                    dst.seek(0)
+                    with open(file_path, 'r+b') as original:
+                        shutil.copyfileobj(dst, original, COPY_BLOCK_SIZE)
+                        original.truncate()
+            if swap:
+                os.replace(temp_path, file_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+        if not swap:
+            os.unlink(temp_path)
+
     def report(self) -> str:
         """Generate replacement report"""
         if not self.changes:
             return "No changes needed."
-        
+
         mode = "DRY RUN - " if self.dry_run else ""
-        report = f"{mode}Would replace in {len(self.changes)} files:\n\n"
-        
-        for change in self.changes:
-            report += f"  {change['file']}\n"
-        
-        return report
+        lines = [f"{mode}Would replace in {len(self.changes)} files:\n\n"]
+        lines.extend(f"  {change['file']}\n" for change in self.changes)
+
+        return ''.join(lines)
+
+
+def _copy_bytes(src: BinaryIO, dst: BinaryIO, length: int):
+    """Copy exactly `length` bytes from src to dst"""
+    while length > 0:
+        block = src.read(min(length, COPY_BLOCK_SIZE))
+        if not block:
+            break
+        dst.write(block)
+        length -= len(block)